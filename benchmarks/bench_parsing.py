@@ -0,0 +1,60 @@
+"""Benchmarks parsing of long argument lists."""
+
+import timeit
+
+from ppi import parsing
+
+SIZE: int = 100000
+NUMBER: int = 10
+
+
+def make_argv(size: int=SIZE) -> dict:
+    """
+    Makes argument lists of size entries, like ones that xargs passes on.
+
+    Returns a dict that maps the name of each kind of list to the list.
+
+    Parameters:
+        size...... How many arguments each list has.
+    """
+    return {
+        "positional": ["ppi", *(f"project{i}" for i in range(size))],
+        "flags": ["ppi", *(("-qi", "--annotate")[i % 2] for i in range(size))],
+        "values": ["ppi", *(
+            ("--threads", "4", "--durability=each")[i % 3] for i in range(size)
+        )],
+        "end of options": ["ppi", "--", *(f"-{i}" for i in range(size))],
+    }
+
+
+def bench_parsing(size: int=SIZE, number: int=NUMBER) -> dict:
+    """
+    Times parsing of argument lists of size entries.
+
+    Returns a dict that maps the name of each kind of list to the average
+    time in milliseconds, and to the time per argument in nanoseconds.
+
+    Parameters:
+        size...... How many arguments each list has.
+        number.... How many times to parse each list.
+    """
+    results: dict = {}
+    for name, argv in make_argv(size).items():
+        def parse() -> None:
+            # _sort_args() doesn't exit on the errors that the lists cause
+            parsing.ArgParser(argv, "ppi", "en_US.UTF-8")._sort_args()
+
+        total: float = timeit.timeit(parse, number=number) / number
+        results[name] = {"total": total * 1e3, "per_arg": total / size * 1e9}
+    return results
+
+
+def main() -> None:
+    """Prints the results as a table."""
+    print(f"{'argv':<20} {'total (ms)':>12} {'per arg (ns)':>12}")
+    for name, result in bench_parsing().items():
+        print(f"{name:<20} {result['total']:>12.2f} {result['per_arg']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
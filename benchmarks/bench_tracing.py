@@ -0,0 +1,90 @@
+"""Benchmarks the cost of the tracing instrumentation when tracing is off."""
+
+import os
+import tempfile
+import time
+import timeit
+
+from ppi import filesystem
+from ppi import scaffolding
+from ppi import tracing
+
+NUMBER: int = 1000000
+PROJECTS: int = 200
+
+
+def bench_checks(number: int=NUMBER) -> dict:
+    """
+    Times the instrumentation itself, with tracing off.
+
+    Returns a dict that maps each form of instrumentation to its cost per
+    use in nanoseconds, on top of an empty loop.
+
+    Parameters:
+        number.... How many times to time each form.
+    """
+    tracing.stop()
+    setup: str = "from ppi import tracing"
+    statements: dict = {
+        "baseline": "pass",
+        "check": (
+            "tracer = tracing.tracer\n"
+            "start = tracer.now() if tracer is not None else 0\n"
+            "if tracer is not None:\n"
+            "    tracer.complete('write', 'file', start)"
+        ),
+        "span()": "with tracing.span('write', 'file', path='x'):\n    pass",
+    }
+    costs: dict = {
+        name: timeit.timeit(statement, setup, number=number) / number * 1e9
+        for name, statement in statements.items()
+    }
+    return {
+        name: cost - costs["baseline"]
+        for name, cost in costs.items() if name != "baseline"
+    }
+
+
+def bench_write_tree(projects: int=PROJECTS) -> dict:
+    """
+    Times writing projects with filesystem.write_tree(), with tracing off
+    and on.
+
+    Returns a dict that maps "off" and "on" to the average time per
+    project in microseconds.
+
+    Parameters:
+        projects.. How many projects to write each way.
+    """
+    mapping: dict = scaffolding.generate("benchmark", git=True, lock=True)
+    totals: dict = {"off": 0, "on": 0}
+    with tempfile.TemporaryDirectory() as tmp:
+        # The modes take turns, so that neither gets a warmer cache
+        for number in range(projects):
+            for mode in ("off", "on"):
+                root: str = os.path.join(tmp, f"{mode}{number}")
+                os.mkdir(root)
+                if mode == "on":
+                    tracing.start()
+                try:
+                    start: int = time.perf_counter_ns()
+                    filesystem.write_tree(root, mapping)
+                    totals[mode] += time.perf_counter_ns() - start
+                finally:
+                    tracing.stop()
+    return {mode: total / projects / 1000 for mode, total in totals.items()}
+
+
+def main() -> None:
+    """Prints the results as a table."""
+    print(f"{'instrumentation (off)':<24} {'cost (ns)':>12}")
+    for name, cost in bench_checks().items():
+        print(f"{name:<24} {cost:>12.1f}")
+    print()
+    print(f"{'write_tree()':<24} {'time (us)':>12}")
+    for mode, average in bench_write_tree().items():
+        print(f"{'tracing ' + mode:<24} {average:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
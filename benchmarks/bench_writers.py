@@ -0,0 +1,57 @@
+"""Benchmarks rendering and writing of every writer."""
+
+import os
+import tempfile
+import timeit
+
+from ppi import scaffolding
+
+PROJECT: str = "benchmark"
+NUMBER: int = 2000
+
+
+def bench_writers(number: int=NUMBER) -> dict:
+    """
+    Times rendering and writing of every file writer.
+
+    Returns a dict that maps each writer's class name to a dict with the
+    average "render" and "write" times in microseconds.
+
+    Parameters:
+        number.... How many times to render/write each file.
+    """
+    results: dict = {}
+    files: dict = scaffolding.create_writers()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, PROJECT))
+        for name, writer in files.items():
+            if name == "directory":
+                continue
+            # Writers extract the project's name from the path
+            cwd: str = os.getcwd()
+            os.chdir(tmp)
+            try:
+                render: float = timeit.timeit(
+                    lambda: writer.render(PROJECT), number=number
+                )
+                write: float = timeit.timeit(
+                    lambda: writer.write(f"{PROJECT}/file"), number=number
+                )
+            finally:
+                os.chdir(cwd)
+            results[type(writer).__name__] = {
+                "render": render / number * 1e6,
+                "write": write / number * 1e6
+            }
+    return results
+
+
+def main() -> None:
+    """Prints the results as a table."""
+    print(f"{'writer':<20} {'render (us)':>12} {'write (us)':>12}")
+    for name, result in bench_writers().items():
+        print(f"{name:<20} {result['render']:>12.2f} {result['write']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
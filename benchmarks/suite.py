@@ -0,0 +1,254 @@
+"""
+Runs the benchmark suite and compares the results with a stored baseline.
+
+Every result is a time in microseconds, so lower is better. The suite
+fails (exits with 1) if any result is slower than its baseline by more
+than the threshold. Baselines are only comparable on the machine they were
+recorded on, so there is none until the first run (or --update) records
+one.
+
+Usage: python3 -m benchmarks.suite [--baseline FILE] [--threshold RATIO]
+                                   [--projects N] [--disk DIR] [--update]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from ppi import constants
+from ppi import main as ppi_main
+from ppi import scaffolding
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE: str = os.path.join(ROOT, "benchmarks", "baseline.json")
+THRESHOLD: float = 0.25
+PROJECTS: int = 10000
+STARTS: int = 20
+SCAFFOLDS: int = 50
+RENDERS: int = 2000
+REPEAT: int = 5
+PROJECT: str = "benchmark"
+TMPFS: str = "/dev/shm"
+
+
+def bench_cold_start(number: int=STARTS) -> float:
+    """
+    Times starting a fresh interpreter that runs ppi -V.
+
+    Returns the fastest time in microseconds, as the slower ones only
+    tell about whatever else the machine was doing.
+
+    Parameters:
+        number.... How many times to start ppi.
+    """
+    env: dict = dict(os.environ, PYTHONPATH=ROOT)
+    times: list = []
+    for _ in range(number):
+        start: int = time.perf_counter_ns()
+        subprocess.run([sys.executable, "-m", "ppi.main", "-V"],
+                       stdout=subprocess.DEVNULL, env=env, check=True)
+        times.append((time.perf_counter_ns() - start) / 1000)
+    return min(times)
+
+
+def bench_render(number: int=RENDERS, repeat: int=REPEAT) -> dict:
+    """
+    Times rendering the file of every writer.
+
+    Returns a dict that maps each writer's class name to its fastest
+    average time in microseconds.
+
+    Parameters:
+        number.... How many times to render each file in a row.
+        repeat.... How many times to repeat that.
+    """
+    results: dict = {}
+    for name, writer in scaffolding.create_writers().items():
+        if name == "directory":
+            continue
+        times: list = timeit.repeat(lambda: writer.render(PROJECT),
+                                    number=number, repeat=repeat)
+        results[type(writer).__name__] = min(times) / number * 1e6
+    return results
+
+
+def bench_main(directory: str, number: int=SCAFFOLDS) -> float:
+    """
+    Times creating a project with main(), as ppi -q does.
+
+    Returns the fastest time in microseconds.
+
+    Parameters:
+        directory. Directory where to create the projects.
+        number.... How many projects to create.
+    """
+    times: list = []
+    cwd: str = os.getcwd()
+    os.chdir(directory)
+    try:
+        # The first project only warms up the deferred imports
+        for number_ in range(number + 1):
+            argv: list = ["ppi", "-q", f"project{number_}"]
+            start: int = time.perf_counter_ns()
+            with contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.suppress(SystemExit):
+                ppi_main.main(len(argv), argv)
+            if number_:
+                times.append((time.perf_counter_ns() - start) / 1000)
+    finally:
+        os.chdir(cwd)
+    return min(times)
+
+
+def bench_sequential(directory: str, projects: int=PROJECTS) -> float:
+    """
+    Times creating projects one after another with the same writers, as a
+    long-running caller of ppi does.
+
+    Returns the average time per project in microseconds.
+
+    Parameters:
+        directory. Directory where to create the projects.
+        projects.. How many projects to create.
+    """
+    files: dict = scaffolding.create_writers()
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        start: int = time.perf_counter_ns()
+        for number in range(projects):
+            scaffolding.scaffold(f"project{number}", files, directory=tmp)
+        total: int = time.perf_counter_ns() - start
+    return total / projects / 1000
+
+
+def run(projects: int=PROJECTS, disk: str=None) -> dict:
+    """
+    Runs every benchmark.
+
+    Returns a dict that maps the name of each benchmark to its result in
+    microseconds. The tmpfs benchmark is left out if there's no tmpfs, and
+    the projects are then created one after another on the disk instead.
+
+    Parameters:
+        projects.. How many projects bench_sequential() creates.
+        disk...... Directory on a disk for bench_main(). Defaults to
+                   a temporary directory in the repo.
+    """
+    results: dict = {"cold start (-V)": bench_cold_start()}
+    for name, result in bench_render().items():
+        results[f"render {name}"] = result
+    disk = disk or ROOT
+    tmpfs: str = TMPFS if os.access(TMPFS, os.W_OK) else ""
+    if tmpfs:
+        with tempfile.TemporaryDirectory(dir=tmpfs) as tmp:
+            results["main() scaffold (tmpfs)"] = bench_main(tmp)
+    with tempfile.TemporaryDirectory(dir=disk) as tmp:
+        results["main() scaffold (disk)"] = bench_main(tmp)
+    results["sequential scaffold"] = bench_sequential(tmpfs or disk, projects)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float=THRESHOLD) -> list:
+    """
+    Finds the results that are slower than their baseline by more than
+    threshold.
+
+    Returns the names of those benchmarks, in the order of results.
+
+    Parameters:
+        results... Results, as returned by run().
+        baseline.. Results to compare with.
+        threshold. Allowed slowdown, e.g. 0.25 for 25 %.
+    """
+    return [
+        name for name, result in results.items()
+        if name in baseline and result > baseline[name] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: str) -> dict:
+    """
+    Loads the results of a baseline, or an empty dict if there is none.
+
+    Parameters:
+        path...... Path to the baseline.
+    """
+    try:
+        with open(path, "r", encoding=constants.ENCODING) as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: dict) -> None:
+    """
+    Stores results as the baseline, along with where they were recorded.
+
+    Parameters:
+        path...... Path to the baseline.
+        results... Results, as returned by run().
+    """
+    baseline: dict = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "recorded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+    with open(path, "w", encoding=constants.ENCODING) as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def report(results: dict, baseline: dict, regressions: list) -> None:
+    """Prints the results and their change from the baseline as a table."""
+    print(f"{'benchmark':<32} {'baseline (us)':>14} {'result (us)':>14} "
+          f"{'change':>8}")
+    for name, result in results.items():
+        if name in baseline:
+            change: str = f"{(result / baseline[name] - 1) * 100:+.1f}%"
+            base: str = f"{baseline[name]:.1f}"
+        else:
+            change, base = "new", "-"
+        mark: str = "  <- regression" if name in regressions else ""
+        print(f"{name:<32} {base:>14} {result:>14.1f} {change:>8}{mark}")
+
+
+def main(argv: list=None) -> int:
+    """Runs the suite and returns the exit status."""
+    parser: object = argparse.ArgumentParser(prog="benchmarks.suite")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="JSON file of the baseline results")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown, e.g. 0.25 for 25 %%")
+    parser.add_argument("--projects", type=int, default=PROJECTS,
+                        help="projects to create one after another")
+    parser.add_argument("--disk", help="directory on a disk to scaffold in")
+    parser.add_argument("--update", action="store_true",
+                        help="store the results as the new baseline")
+    args: object = parser.parse_args(argv)
+
+    results: dict = run(args.projects, args.disk)
+    baseline: dict = load_baseline(args.baseline)
+    regressions: list = compare(results, baseline, args.threshold)
+    report(results, baseline, regressions)
+    if args.update or not baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline stored in {args.baseline}")
+        return constants.EXIT_SUCCESS
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline "
+              f"by more than {args.threshold:.0%}")
+        return constants.EXIT_ERROR
+    return constants.EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
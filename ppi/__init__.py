@@ -0,0 +1,16 @@
+"""Simple utility for starting new Python projects quickly."""
+
+__version__: str = "1.2.3b2"
+
+# The library API is imported lazily (PEP 562), so that importing ppi.main
+# for running the command line program doesn't import all the writers.
+__all__: list = ["generate", "materialize"]
+
+
+def __getattr__(name: str) -> object:
+    """Imports the library API when it's first used."""
+    if name in __all__:
+        from ppi import scaffolding
+
+        return getattr(scaffolding, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,190 @@
+"""Streaming rendered projects into tar and zip archives."""
+
+import contextlib
+import gzip
+import io
+import os
+import posixpath
+import stat
+import sys
+import tarfile
+import time
+import zipfile
+
+# Supported archive formats, and the file extensions they are guessed from.
+FORMATS: dict = {
+    "tar.gz": (".tar.gz", ".tgz"),
+    "tar": (".tar",),
+    "zip": (".zip",)
+}
+
+# Timestamp of every entry, unless SOURCE_DATE_EPOCH says otherwise. Zip
+# can't represent anything before 1980, so that's where the default is.
+DEFAULT_MTIME: int = 315532800  # 1980-01-01 00:00:00 UTC
+
+DIRECTORY_MODE: int = 0o755
+FILE_MODE: int = 0o644
+EXECUTABLE_MODE: int = 0o755
+
+
+def guess_format(path: str) -> str:
+    """
+    Guesses the archive format from path's extension.
+
+    Returns an empty string if the extension isn't known.
+
+    Parameters:
+        path...... Path of the archive.
+    """
+    for fmt, extensions in FORMATS.items():
+        if path.endswith(extensions):
+            return fmt
+    return ""
+
+
+def file_mode(content: bytes) -> int:
+    """
+    Gets the permissions of a file in an archive.
+
+    Files that start with a shebang are executable, others aren't.
+
+    Parameters:
+        content... Contents of the file.
+    """
+    return EXECUTABLE_MODE if content.startswith(b"#!") else FILE_MODE
+
+
+def source_date_epoch() -> int:
+    """Gets the timestamp for the entries, from SOURCE_DATE_EPOCH if set."""
+    value: str = os.getenv("SOURCE_DATE_EPOCH", "")
+    return int(value) if value.isdigit() else DEFAULT_MTIME
+
+
+@contextlib.contextmanager
+def open_output(path: str) -> object:
+    """
+    Opens a binary stream for writing the archive to; "-" means stdout.
+
+    Parameters:
+        path...... Path of the archive, or "-".
+    """
+    if path == "-":
+        sys.stdout.flush()
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    else:
+        with open(path, "wb") as f:
+            yield f
+
+
+class Archive:
+    """
+    Class for streaming projects into an archive.
+
+    Entries are written as soon as they are added, and nothing but the
+    project being added is kept in memory, so the output stream doesn't
+    need to be seekable and memory use doesn't grow with the amount of
+    projects. Owners, permissions and timestamps are always the same, so
+    the same projects always produce the same archive.
+    """
+
+    def __init__(self, stream: object, fmt: str, mtime: int=None) -> None:
+        """
+        Initializes Archive.
+
+        Parameters:
+            stream.... Binary stream to write the archive to.
+            fmt....... One of FORMATS.
+            mtime..... Timestamp of the entries. Defaults to
+                       source_date_epoch().
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"invalid archive format: {fmt!r}")
+        self.fmt: str = fmt
+        self.stream: object = stream
+        self.mtime: int = source_date_epoch() if mtime is None else mtime
+        self._gzip: object = None
+        self._tar: object = None
+        self._zip: object = None
+
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED)
+            return
+        if fmt == "tar.gz":
+            # tarfile's own gzip stream would stamp the current time into
+            # the gzip header, so the compression is done here instead.
+            stream = self._gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=stream, mtime=self.mtime
+            )
+        self._tar = tarfile.open(fileobj=stream, mode="w|",
+                                 format=tarfile.PAX_FORMAT)
+
+    def _add_tar(self, name: str, content: object, mode: int) -> None:
+        """Adds an entry to a tar archive; content None means a directory."""
+        info: object = tarfile.TarInfo(name)
+        info.mtime = self.mtime
+        info.mode = mode
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        if content is None:
+            info.type = tarfile.DIRTYPE
+            self._tar.addfile(info)
+        else:
+            info.size = len(content)
+            self._tar.addfile(info, io.BytesIO(content))
+
+    def _add_zip(self, name: str, content: object, mode: int) -> None:
+        """Adds an entry to a zip archive; content None means a directory."""
+        file_type: int = stat.S_IFREG
+        if content is None:
+            name, file_type, content = f"{name}/", stat.S_IFDIR, b""
+        mtime: int = max(self.mtime, DEFAULT_MTIME)
+        info: object = zipfile.ZipInfo(name, time.gmtime(mtime)[:6])
+        info.create_system = 3  # Unix, so that the permissions are kept
+        info.external_attr = (file_type | mode) << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self._zip.writestr(info, content)
+
+    def add(self, prefix: str, mapping: dict) -> None:
+        """
+        Adds a rendered project to the archive.
+
+        Parameters:
+            prefix.... Directory of the project in the archive, e.g. its
+                       name.
+            mapping... Relative paths mapped to the contents of the files,
+                       as returned by ppi.generate(). Paths that end with
+                       "/" are empty directories.
+        """
+        add: object = self._add_tar if self._zip is None else self._add_zip
+        prefix = posixpath.normpath(prefix).lstrip("/")
+        if prefix == "." or prefix.split("/")[0] == "..":
+            raise ValueError(f"invalid directory in archive: {prefix!r}")
+        directories: set = {""}
+        add(prefix, None, DIRECTORY_MODE)
+        for path, content in mapping.items():
+            parts: list = path.split("/")
+            for depth in range(1, len(parts)):
+                directory: str = "/".join(parts[:depth])
+                if directory not in directories:
+                    directories.add(directory)
+                    add(f"{prefix}/{directory}", None, DIRECTORY_MODE)
+            if parts[-1]:
+                add(f"{prefix}/{path}", content, file_mode(content))
+
+    def close(self) -> None:
+        """Finishes the archive. The stream itself is left open."""
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+        if self._gzip is not None:
+            self._gzip.close()
+
+    def __enter__(self) -> object:
+        """Returns the archive itself."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Closes the archive."""
+        self.close()
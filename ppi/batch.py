@@ -0,0 +1,310 @@
+"""Creating many projects at once from a manifest of project specs."""
+
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+
+from ppi import scaffolding
+from ppi import tracing
+
+# Keys a project spec may have. Both "git_init" and "git-init" are accepted.
+SPEC_KEYS: tuple = ("name", "annotate", "git_init", "initial_commit",
+                    "setup_py", "perf", "large_repo", "target")
+
+# Values that are considered true in CSV manifests.
+TRUTHY: set = {"1", "true", "yes", "y", "on"}
+
+# Writers of the current (worker) process, created once per process.
+_files: dict = {}
+
+
+class SpecError(ValueError):
+    """Raised when a line in the manifest isn't a valid project spec."""
+
+
+def _to_bool(value: object) -> bool:
+    """Converts a JSON or CSV field to bool."""
+    if isinstance(value, str):
+        return value.strip().lower() in TRUTHY
+    return bool(value)
+
+
+def read_specs(stream: object, fmt: str="") -> object:
+    """
+    Lazily reads raw project specs from stream, one line at a time.
+
+    Yields (line number, spec) pairs, where spec is either a dict or
+    a SpecError, so that a single bad line doesn't stop the whole batch.
+
+    Parameters:
+        stream.... Text stream to read from.
+        fmt....... Either "jsonl" or "csv". Detected from the first
+                   line if not given.
+    """
+    lines: object = iter(stream)
+    first: str = next(lines, "")
+    if not fmt:
+        fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+    lines = itertools.chain([first], lines)
+
+    if fmt == "csv":
+        reader: object = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            spec: object = json.loads(line)
+        except ValueError as error:
+            yield number, SpecError(f"line {number}: {error}")
+            continue
+        if not isinstance(spec, dict):
+            spec = SpecError(f"line {number}: spec is not an object")
+        yield number, spec
+
+
+def normalize(spec: dict, defaults: dict) -> dict:
+    """
+    Validates a raw spec and fills in the missing values from defaults.
+
+    Parameters:
+        spec...... Raw spec as read by read_specs().
+        defaults.. Values to use for the keys that spec doesn't have.
+    """
+    spec = {
+        key.strip().replace("-", "_"): value
+        for key, value in spec.items() if key is not None
+    }
+    unknown: set = set(spec) - set(SPEC_KEYS)
+    if unknown:
+        raise SpecError(f"unknown keys: {', '.join(sorted(unknown))}")
+
+    name: object = spec.get("name")
+    if not isinstance(name, str) or not name or "/" in name:
+        raise SpecError(f"invalid project name: {name!r}")
+
+    target: object = spec.get("target") or defaults.get("target", ".")
+    if not isinstance(target, str):
+        raise SpecError(f"invalid target: {target!r}")
+
+    flags: dict = {}
+    for key in ("annotate", "git_init", "initial_commit", "setup_py", "perf",
+                "large_repo"):
+        value: object = spec.get(key)
+        if value is None or value == "":
+            value = defaults.get(key, False)
+        flags[key] = _to_bool(value)
+
+    return {"name": name, "target": target, **flags,
+            "threads": defaults.get("threads", 1),
+            "durability": defaults.get("durability", "none"),
+            "branch": defaults.get("branch"),
+            "system_git": defaults.get("system_git", False),
+            "update": defaults.get("update", False),
+            "dedupe": defaults.get("dedupe", "")}
+
+
+def _init_worker() -> None:
+    """Creates the writers, once for each worker process."""
+    _files.update(scaffolding.create_writers())
+
+
+def _init_process() -> None:
+    """Initializes a worker process of run()."""
+    tracing.stop()  # The spans of a worker would never reach the trace
+    _init_worker()
+
+
+def create(spec: dict) -> dict:
+    """
+    Creates a single project and returns a record of how it went.
+
+    Parameters:
+        spec...... Normalized spec, as returned by normalize().
+    """
+    if not _files:
+        _init_worker()
+
+    record: dict = {"name": spec["name"], "target": spec["target"]}
+    try:
+        kept: list = scaffolding.scaffold(
+            spec["name"],
+            _files,
+            annotate=spec["annotate"],
+            git=spec["git_init"],
+            directory=spec["target"],
+            width=spec["threads"],
+            durability=spec["durability"],
+            branch=spec["branch"],
+            system_git=spec["system_git"],
+            commit=spec["initial_commit"],
+            update=spec["update"],
+            dedupe=spec["dedupe"],
+            setup_py=spec["setup_py"],
+            perf=spec["perf"],
+            large_repo=spec["large_repo"]
+        )
+    except scaffolding.MaterializeError as error:
+        record["status"] = "error"
+        record["error"] = str(error)
+        record["errors"] = {
+            path: str(reason) for path, reason in error.errors.items()
+        }
+    except (OSError, ValueError) as error:
+        record["status"] = "error"
+        record["error"] = str(error)
+    else:
+        record["status"] = "ok"
+        if kept:
+            record["kept"] = kept
+    return record
+
+
+def render(spec: dict) -> dict:
+    """
+    Renders a single project in memory and returns a record with its
+    files in "files", for adding it to an archive.
+
+    Parameters:
+        spec...... Normalized spec, as returned by normalize().
+    """
+    if not _files:
+        _init_worker()
+
+    record: dict = {"name": spec["name"], "target": spec["target"]}
+    try:
+        record["files"] = scaffolding.generate(
+            spec["name"],
+            annotate=spec["annotate"],
+            files=_files,
+            git=spec["git_init"],
+            branch=spec["branch"],
+            commit=spec["initial_commit"],
+            lock=True,
+            setup_py=spec["setup_py"],
+            perf=spec["perf"],
+            large_repo=spec["large_repo"]
+        )
+    except ValueError as error:
+        record["status"] = "error"
+        record["error"] = str(error)
+    else:
+        record["status"] = "ok"
+    return record
+
+
+def run(specs: object, defaults: dict, jobs: int=0,
+        function: object=create) -> object:
+    """
+    Creates a project for each spec and yields a record for each of them,
+    in the same order as the specs.
+
+    At most a few specs per worker are read ahead, so memory use stays
+    flat no matter how long the manifest is.
+
+    Parameters:
+        specs..... (line number, raw spec) pairs, as from read_specs().
+        defaults.. Values for the keys that the specs don't have.
+        jobs...... Amount of worker processes; 0 means one per CPU.
+        function.. Function to call with each spec: create() for writing
+                   the projects, or render() for only rendering them.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    pending: collections.deque = collections.deque()
+    executor: object = None
+    if jobs > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_process
+        )
+
+    def submit(number: int, spec: object) -> None:
+        try:
+            if isinstance(spec, Exception):
+                raise spec
+            spec = normalize(spec, defaults)
+        except SpecError as error:
+            pending.append({"line": number, "status": "error",
+                            "error": str(error)})
+            return
+        if executor is None:
+            pending.append(function(spec))
+        else:
+            pending.append(executor.submit(function, spec))
+
+    try:
+        for number, spec in specs:
+            submit(number, spec)
+            while len(pending) > jobs * 4:
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+    finally:
+        if executor is not None:
+            for item in pending:
+                if isinstance(item, concurrent.futures.Future):
+                    item.cancel()
+            executor.shutdown()
+
+
+def _result(item: object) -> dict:
+    """Gets the record out of a pending item."""
+    if isinstance(item, concurrent.futures.Future):
+        return item.result()
+    return item
+
+
+def main(path: str, defaults: dict, jobs: int=0, quiet: bool=False,
+         archive: object=None) -> int:
+    """
+    Runs a whole batch and prints a JSON record for each project to stdout
+    (or to stderr, if the archive is written to stdout).
+
+    Returns the amount of projects that couldn't be created.
+
+    Parameters:
+        path...... Path to the manifest, or "-" for stdin.
+        defaults.. Values for the keys that the specs don't have.
+        jobs...... Amount of worker processes; 0 means one per CPU.
+        quiet..... Print only the records of failed projects, to stderr.
+        archive... An archiving.Archive to add the projects to, instead
+                   of writing them to the disk. Projects are added in the
+                   same order as they are in the manifest.
+    """
+    failures: int = 0
+    function: object = create
+    output: object = sys.stdout
+    if archive is not None:
+        function = render
+        if archive.stream is sys.stdout.buffer:
+            output = sys.stderr
+    fmt: str = "csv" if path.endswith(".csv") else ""
+    with contextlib.ExitStack() as stack:
+        stream: object = sys.stdin
+        if path != "-":
+            stream = stack.enter_context(
+                open(path, "r", encoding="utf-8", newline="")
+            )
+        specs: object = read_specs(stream, fmt)
+        for record in run(specs, defaults, jobs, function):
+            files: dict = record.pop("files", None)
+            if files is not None:
+                archive.add(
+                    os.path.join(record["target"], record["name"]),
+                    files
+                )
+            if record["status"] != "ok":
+                failures += 1
+                if quiet:
+                    print(json.dumps(record), file=sys.stderr, flush=True)
+            if not quiet:
+                print(json.dumps(record), file=output, flush=True)
+    return failures
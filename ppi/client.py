@@ -0,0 +1,95 @@
+"""Thin client for forwarding command lines to a ppi daemon (see serving)."""
+
+import json
+import os
+import socket
+import sys
+
+from ppi import constants
+from ppi import errors
+
+
+def encode(text: str) -> bytes:
+    """Encodes text that was decoded with decode()."""
+    return text.encode(constants.ENCODING, "surrogateescape")
+
+
+def decode(data: bytes) -> str:
+    """Decodes arbitrary bytes losslessly, so that they can be sent as JSON."""
+    return data.decode(constants.ENCODING, "surrogateescape")
+
+
+def request(path: str, argv: list, stdin: str=None) -> dict:
+    """
+    Sends a command line to the daemon and returns its response.
+
+    The request is a single JSON object on one line, with the command
+    line, the working directory, the environment and the umask of the
+    client. The response is a JSON object with the exit status and the
+    output of the command:
+    {"status": int, "stdout": str, "stderr": str}.
+
+    Parameters:
+        path...... Path of the daemon's socket.
+        argv...... Command line to run, including the program's name.
+        stdin..... Input for the command, if it reads stdin.
+    """
+    umask: int = os.umask(0)
+    os.umask(umask)
+    message: dict = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "umask": umask
+    }
+    if stdin is not None:
+        message["stdin"] = stdin
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode(constants.ENCODING) + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as f:
+            response: bytes = f.read()
+    return json.loads(response)
+
+
+def _reads_stdin(args: list) -> bool:
+    """Checks if the command line reads a manifest from stdin."""
+    if "--batch=-" in args:
+        return True
+    return any(a == "--batch" and b == "-" for a, b in zip(args, args[1:]))
+
+
+def main(argv: list, program: str, language: str) -> int:
+    """
+    Runs "ppi --client <socket> [arguments]" and returns the exit status.
+
+    Parameters:
+        argv...... Command line of the client.
+        program... Program's name.
+        language.. Language in which to display error messages.
+    """
+    path: str = argv[1].partition("=")[2]
+    args: list = argv[2:]
+    if not path:
+        if not args:
+            errors.MissingValueError(program, language).throw_error("--client")
+            return constants.EXIT_ERROR
+        path, args = args[0], args[1:]
+
+    stdin: str = None
+    if _reads_stdin(args):
+        stdin = decode(sys.stdin.buffer.read())
+
+    try:
+        response: dict = request(path, [program] + args, stdin)
+    except (OSError, ValueError) as error:
+        errors.ServerError(program, language).throw_error(f"{path}: {error}")
+        return constants.EXIT_ERROR
+
+    sys.stdout.buffer.write(encode(response["stdout"]))
+    sys.stdout.buffer.flush()
+    sys.stderr.buffer.write(encode(response["stderr"]))
+    sys.stderr.buffer.flush()
+    return response["status"]
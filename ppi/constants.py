@@ -6,3 +6,18 @@ ENCODING: str = "utf-8"
 LANG_CODES: dict = {
     "FINNISH": "fi_FI.UTF-8"
 }
+
+# How hard to try to get the files to the disk before a project is published:
+#   none.... Never fsync; fastest, for tmpfs and CI.
+#   batch... Sync the whole project once, after all files are written.
+#   each.... Fsync every file right after it's written.
+DURABILITY: tuple = ("none", "batch", "each")
+
+# Formats that projects can be archived in with --archive.
+ARCHIVE_FORMATS: tuple = ("tar", "tar.gz", "zip")
+
+# Ways of sharing files with the store of --dedupe:
+#   reflink.... Copy-on-write clone of the stored file, or a copy if the
+#               file system can't clone; the default.
+#   hardlink... Hard link to the stored file, which makes the file read-only.
+DEDUPE: tuple = ("reflink", "hardlink")
@@ -2,7 +2,7 @@
 
 import abc
 import sys
-from ppi import constants
+from ppi import messages
 
 
 class Error(abc.ABC):
@@ -40,14 +40,9 @@ class InvalidArgumentError(Error):
         Parameters:
             arg.... The argument that is invalid.
         """
-        msg: str
-        if self.language == constants.LANG_CODES["FINNISH"]:
-            msg = f"{self.program}: virhe: virheellinen argumentti '{arg}'"
-            print(msg, file=sys.stderr)
-
-        else:
-            msg = f"{self.program}: error: invalid argument '{arg}'"
-            print(msg, file=sys.stderr)
+        msg: str = messages.get(self.language, "error.invalid_argument",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
 
 
 class ExtraArgumentError(Error):
@@ -71,11 +66,136 @@ class ExtraArgumentError(Error):
         Parameters:
             arg.... The argument that is extra.
         """
-        msg: str
-        if self.language == constants.LANG_CODES["FINNISH"]:
-            msg = f"{self.program}: virhe: ylimääräinen argumentti '{arg}'"
-            print(msg, file=sys.stderr)
+        msg: str = messages.get(self.language, "error.extra_argument",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
+
+
+class MissingValueError(Error):
+    """Class for handling options that are missing their value."""
+
+    def __init__(self, program: str, language: str) -> None:
+        """
+        Initializes MissingValueError class.
+
+        Parameters:
+            program... Program's name for displaying it in the error message.
+            language.. Language in which to display error message.
+        """
+        self.program: str = program
+        self.language: str = language
+
+    def throw_error(self, arg: str) -> None:
+        """
+        Throws error when an option is missing its value on cl.
+
+        Parameters:
+            arg.... The option that is missing its value.
+        """
+        msg: str = messages.get(self.language, "error.missing_value",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
+
+
+class ScaffoldError(Error):
+    """Class for handling errors that occur while creating a project."""
+
+    def __init__(self, program: str, language: str) -> None:
+        """
+        Initializes ScaffoldError class.
+
+        Parameters:
+            program... Program's name for displaying it in the error message.
+            language.. Language in which to display error message.
+        """
+        self.program: str = program
+        self.language: str = language
+
+    def throw_error(self, arg: str) -> None:
+        """
+        Throws error when creating a project fails.
+
+        Parameters:
+            arg.... Description of what went wrong.
+        """
+        msg: str = messages.get(self.language, "error.scaffold",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
+
+
+class ServerError(Error):
+    """Class for handling errors in connecting to a ppi daemon."""
+
+    def __init__(self, program: str, language: str) -> None:
+        """
+        Initializes ServerError class.
+
+        Parameters:
+            program... Program's name for displaying it in the error message.
+            language.. Language in which to display error message.
+        """
+        self.program: str = program
+        self.language: str = language
+
+    def throw_error(self, arg: str) -> None:
+        """
+        Throws error when the daemon can't be served or reached.
+
+        Parameters:
+            arg.... Description of what went wrong.
+        """
+        msg: str = messages.get(self.language, "error.server",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
+
+
+class TraceError(Error):
+    """Class for handling errors in writing the trace of --trace."""
 
-        else:
-            msg = f"{self.program}: error: extra argument '{arg}'"
-            print(msg, file=sys.stderr)
+    def __init__(self, program: str, language: str) -> None:
+        """
+        Initializes TraceError class.
+
+        Parameters:
+            program... Program's name for displaying it in the error message.
+            language.. Language in which to display error message.
+        """
+        self.program: str = program
+        self.language: str = language
+
+    def throw_error(self, arg: str) -> None:
+        """
+        Throws error when the trace can't be written.
+
+        Parameters:
+            arg.... Description of what went wrong.
+        """
+        msg: str = messages.get(self.language, "error.trace",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
+
+
+class ManPageError(Error):
+    """Class for handling errors in converting man-pages with ppi --man."""
+
+    def __init__(self, program: str, language: str) -> None:
+        """
+        Initializes ManPageError class.
+
+        Parameters:
+            program... Program's name for displaying it in the error message.
+            language.. Language in which to display error message.
+        """
+        self.program: str = program
+        self.language: str = language
+
+    def throw_error(self, arg: str) -> None:
+        """
+        Throws error when a man-page can't be converted.
+
+        Parameters:
+            arg.... Description of what went wrong.
+        """
+        msg: str = messages.get(self.language, "error.manpage",
+                                program=self.program, arg=arg)
+        print(msg, file=sys.stderr)
@@ -0,0 +1,276 @@
+"""Writing projects to the disk safely: staging, publishing and fsyncing."""
+
+import os
+import shutil
+
+from ppi import scheduling
+from ppi import tracing
+
+# Flags for creating the files of a project. The files are always new (they
+# are written to a fresh staging directory), so O_EXCL costs nothing, and
+# catches paths that have been written twice.
+CREATE_FLAGS: int = (os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                     | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0))
+
+
+def file_mode(content: bytes) -> int:
+    """
+    Gets the mode to create a file with (before the umask is applied).
+
+    Files that start with a shebang are executable, others aren't.
+
+    Parameters:
+        content... Contents of the file.
+    """
+    return 0o777 if content.startswith(b"#!") else 0o666
+
+
+def make_staging(root: str) -> str:
+    """
+    Creates an empty staging directory next to root and returns its path.
+
+    The staging directory is on the same file system as root, so that it
+    can be renamed to root when it's ready.
+
+    Parameters:
+        root...... Directory that the project will be published to.
+    """
+    parent, name = os.path.split(os.path.normpath(root))
+    parent = parent or "."
+    os.makedirs(parent, exist_ok=True)
+    while True:
+        staging: str = os.path.join(parent, f".{name}.ppi-{os.urandom(4).hex()}")
+        try:
+            os.mkdir(staging)
+        except FileExistsError:
+            continue
+        return staging
+
+
+def discard(staging: str) -> None:
+    """
+    Removes a staging directory and everything in it.
+
+    Parameters:
+        staging... Staging directory, as created by make_staging().
+    """
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+def fsync_path(path: str) -> None:
+    """
+    Fsyncs a file or a directory.
+
+    Parameters:
+        path...... Path of the file or directory.
+    """
+    fd: int = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_file(path: str, content: bytes, durability: str="none",
+               dir_fd: int=None, store: object=None) -> None:
+    """
+    Creates a new file at path and writes content to it with a single write.
+
+    Parameters:
+        path...... Path of the file.
+        content... Contents of the file.
+        durability One of constants.DURABILITY; the file is fsynced with "each".
+        dir_fd.... Directory that path is relative to, if not the current one.
+        store..... store.Store to share the file's storage with, if any.
+    """
+    if store is not None:
+        store.create(path, content, durability, dir_fd)
+        return
+    write_fd(os.open(path, CREATE_FLAGS, file_mode(content), dir_fd=dir_fd),
+             content, durability)
+
+
+def write_fd(fd: int, content: bytes, durability: str) -> None:
+    """
+    Writes content to a file, normally with one write(2), and closes it.
+
+    Parameters:
+        fd........ File descriptor of the file.
+        content... Contents of the file.
+        durability One of constants.DURABILITY; the file is fsynced with "each".
+    """
+    try:
+        view: object = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+        if durability == "each":
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_tree(root: str, mapping: dict, durability: str="none",
+               store: object=None, labels: dict=None) -> dict:
+    """
+    Writes files under an existing directory with as few syscalls as
+    possible.
+
+    root is opened once, and the directories and files are created
+    relative to it (where the platform supports dir_fd), so the kernel
+    doesn't resolve root again for each of them. Every directory is
+    created once, when the first file that goes to it is written, and
+    every file takes one open(2), one write(2) and one close(2). Paths
+    that end with "/" are empty directories.
+
+    Returns a dict that maps every path to the exception writing it
+    raised, or None, like scheduling.Scheduler.run() does. Directories
+    that couldn't be created are included, and the files that go to them
+    get a scheduling.PrerequisiteError.
+
+    Parameters:
+        root...... Directory where to write the files.
+        mapping... Relative paths mapped to the contents of the files.
+        durability One of constants.DURABILITY; the files are fsynced with
+                   "each".
+        store..... store.Store to share the files' storage with, if any.
+        labels.... Paths mapped to the names of the writers that rendered
+                   them, for tracing.
+    """
+    tracer: object = tracing.tracer
+    labels = labels or {}
+    results: dict = {}
+    root_fd: object = None
+    if os.open in os.supports_dir_fd and os.mkdir in os.supports_dir_fd:
+        root_fd = os.open(root, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+                          | getattr(os, "O_CLOEXEC", 0))
+    try:
+        for path, content in mapping.items():
+            parts: list = path.split("/")
+            if path.startswith("/") or ".." in parts:
+                raise ValueError(f"path outside of the project: {path!r}")
+            error: object = None
+            for depth in range(1, len(parts)):
+                parent: str = "/".join(parts[:depth])
+                if parent not in results:
+                    start: int = tracer.now() if tracer is not None else 0
+                    try:
+                        if root_fd is None:
+                            os.mkdir(os.path.join(root, parent))
+                        else:
+                            os.mkdir(parent, dir_fd=root_fd)
+                        results[parent] = None
+                    except OSError as exception:
+                        results[parent] = exception
+                    if tracer is not None:
+                        tracer.complete("mkdir", "file", start, path=parent,
+                                        **_error(results[parent]))
+                if results[parent] is not None:
+                    error = scheduling.PrerequisiteError(
+                        f"{parent}: prerequisite failed"
+                    )
+                    break
+            if error is None and not parts[-1]:
+                continue  # An empty directory, which exists now
+            if error is None:
+                start = tracer.now() if tracer is not None else 0
+                try:
+                    write_file(
+                        path if root_fd is not None else os.path.join(root, path),
+                        content, durability, root_fd, store
+                    )
+                except OSError as exception:
+                    error = exception
+                if tracer is not None:
+                    tracer.complete("write", "file", start, path=path,
+                                    bytes=len(content),
+                                    writer=labels.get(path, ""),
+                                    **_error(error))
+            results[path] = error
+    finally:
+        if root_fd is not None:
+            os.close(root_fd)
+    return results
+
+
+def _error(error: object) -> dict:
+    """Gets the details of a traced span that failed with error."""
+    return {} if error is None else {"error": str(error)}
+
+
+def _syncfs(path: str) -> bool:
+    """
+    Flushes the whole file system that path is on with one syncfs(2).
+
+    Returns False if syncfs(2) isn't available (it's Linux only).
+    """
+    try:
+        import ctypes
+
+        syncfs: object = ctypes.CDLL(None, use_errno=True).syncfs
+    except (ImportError, OSError, AttributeError):
+        return False
+    fd: int = os.open(path, os.O_RDONLY)
+    try:
+        return syncfs(fd) == 0
+    finally:
+        os.close(fd)
+
+
+def sync_tree(staging: str, durability: str) -> None:
+    """
+    Gets everything in staging to the disk, as durability requires.
+
+    With "batch", the file system is flushed once with syncfs(2), or if
+    that isn't available, every file is fsynced in one pass. With "each"
+    the files are already fsynced, so only the directories are.
+
+    Parameters:
+        staging... Staging directory, as created by make_staging().
+        durability One of constants.DURABILITY.
+    """
+    if durability == "none":
+        return
+    if durability == "batch" and _syncfs(staging):
+        return
+    for directory, _, filenames in os.walk(staging, topdown=False):
+        if durability == "batch":
+            for filename in filenames:
+                fsync_path(os.path.join(directory, filename))
+        fsync_path(directory)
+
+
+def publish(staging: str, root: str, durability: str="none") -> None:
+    """
+    Moves the contents of staging to root.
+
+    If root doesn't exist yet, the whole staging directory is renamed to
+    it, so the project appears at once and completely. Otherwise, every
+    file is renamed over the one in root separately.
+
+    Parameters:
+        staging... Staging directory, as created by make_staging().
+        root...... Directory to publish the project to.
+        durability One of constants.DURABILITY; with anything but "none", the
+                   renames are fsynced too.
+    """
+    try:
+        os.rename(staging, root)
+    except OSError:
+        if not os.path.isdir(root):
+            raise
+        _merge(staging, root, durability)
+        discard(staging)
+    if durability != "none":
+        fsync_path(os.path.dirname(os.path.normpath(root)) or ".")
+
+
+def _merge(staging: str, root: str, durability: str) -> None:
+    """Renames every file in staging over the same file in root."""
+    for directory, _, filenames in os.walk(staging):
+        target: str = os.path.join(root, os.path.relpath(directory, staging))
+        os.makedirs(target, exist_ok=True)
+        for filename in filenames:
+            os.replace(os.path.join(directory, filename),
+                       os.path.join(target, filename))
+        if durability != "none":
+            fsync_path(target)
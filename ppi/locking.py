@@ -0,0 +1,133 @@
+"""Lock files that record what was generated, for updating projects later."""
+
+import hashlib
+import json
+import os
+
+from ppi import __version__
+from ppi import constants
+
+# Name of the lock file, in the project's root.
+LOCK_NAME: str = ".ppi-lock"
+
+# Version of the lock file's format.
+LOCK_VERSION: int = 1
+
+
+def digest(content: bytes) -> str:
+    """Gets the hash that the lock file records of content."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _locked(mapping: dict) -> object:
+    """Gets the (path, content) pairs of mapping that the lock records."""
+    return (
+        (path, content) for path, content in mapping.items()
+        if not path.endswith("/") and not path.startswith(".git/")
+        and path != LOCK_NAME
+    )
+
+
+def render(mapping: dict) -> bytes:
+    """
+    Renders the lock file of a project.
+
+    The lock file is JSON, and records the version of ppi, and the hash
+    and size of every file (except for the git-repo's), so that --update
+    can tell which files have been edited since they were generated.
+
+    Parameters:
+        mapping... The project's files, as returned by
+                   scaffolding.generate().
+    """
+    lock: dict = {
+        "version": LOCK_VERSION,
+        "ppi": __version__,
+        "files": {
+            path: {"sha256": digest(content), "size": len(content)}
+            for path, content in _locked(mapping)
+        }
+    }
+    return (json.dumps(lock, indent=2) + "\n").encode(constants.ENCODING)
+
+
+def _read(path: str) -> tuple:
+    """Reads a lock file; returns its contents, mtime and recorded files."""
+    try:
+        with open(path, "rb") as f:
+            data: bytes = f.read()
+            mtime: int = os.fstat(f.fileno()).st_mtime_ns
+    except FileNotFoundError:
+        return b"", 0, {}
+    try:
+        files: object = json.loads(data)["files"]
+    except (ValueError, KeyError, TypeError):
+        files = {}
+    return data, mtime, files if isinstance(files, dict) else {}
+
+
+def _hash_file(path: str) -> str:
+    """Hashes the contents of a file like digest() does."""
+    with open(path, "rb") as f:
+        return digest(f.read())
+
+
+def changes(root: str, mapping: dict) -> tuple:
+    """
+    Finds out which files of a project need to be written to update it.
+
+    A file is written if it doesn't exist, or if it would change and
+    hasn't been edited since it was generated, i.e. it still has the hash
+    in the project's lock file. Files that have been edited are kept as
+    they are. If a file's size is the one in the lock file, and it's
+    older than the lock file, it's taken to be unedited without reading
+    it; otherwise it's hashed. The lock file is rewritten along with any
+    other file, and when it isn't newer than every file, so that the
+    next update can skip reading them.
+
+    Returns the part of mapping that needs to be written, and a list of
+    the files that were kept because they have been edited.
+
+    Parameters:
+        root...... The project's root.
+        mapping... The project's files, as returned by
+                   scaffolding.generate(), with a lock file.
+    """
+    data, lock_mtime, locked = _read(os.path.join(root, LOCK_NAME))
+    changed: dict = {}
+    kept: list = []
+    racy: bool = False
+    for path, content in mapping.items():
+        if path == LOCK_NAME:
+            continue
+        if path.endswith("/"):
+            changed[path] = content
+            continue
+        try:
+            stat: object = os.stat(os.path.join(root, path))
+        except FileNotFoundError:
+            changed[path] = content
+            continue
+
+        entry: object = locked.get(path)
+        if not isinstance(entry, dict):
+            entry = {}
+        current: str
+        if stat.st_size == entry.get("size") and stat.st_mtime_ns < lock_mtime:
+            current = entry.get("sha256")
+        elif not entry and stat.st_size != len(content):
+            current = ""  # Not generated by ppi, and different anyway
+        else:
+            current = _hash_file(os.path.join(root, path))
+            racy = racy or current == entry.get("sha256")
+
+        if current == digest(content):
+            continue
+        if entry and current == entry.get("sha256"):
+            changed[path] = content
+        else:
+            kept.append(path)
+
+    if LOCK_NAME in mapping and (changed or racy or data != mapping[LOCK_NAME]):
+        changed[LOCK_NAME] = mapping[LOCK_NAME]
+    return changed, kept
@@ -3,23 +3,90 @@
 __author__: str = "Niklas Larsson"
 __credits__: list = ["Niklas Larsson"]
 __program__: str = "ppi"
-__version__: str = "1.2.3b2"
 
-import subprocess
-import os
 import sys
+import time
 
+# Only the modules needed for parsing the arguments and printing the
+# help/version texts are imported here, so that those stay fast. The rest
+# are imported when they are needed.
+from ppi import __version__
 from ppi import constants
+from ppi import errors
+from ppi import messages
 from ppi import parsing
 from ppi import texts
-from ppi import writers
 
 
 def main(argc: int=len(sys.argv), argv: list=sys.argv) -> None:
-    language: str = os.getenv("LANG")
+    language: str = messages.locale()
+    if argc >= 2 and argv[1].partition("=")[0] == "--client":
+        # Everything after the socket is forwarded as it is, so the client
+        # is run before the arguments are parsed.
+        from ppi import client
+
+        sys.exit(client.main(argv, __program__, language))
+    if argc >= 2 and argv[1].partition("=")[0] == "--man":
+        # The rest of the arguments are pages and their options, which the
+        # parser doesn't know, so the pages are converted before parsing.
+        from ppi import manpage
+
+        sys.exit(manpage.main(argv, __program__, language))
+
+    started: int = time.perf_counter_ns()
     parser: object = parsing.ArgParser(argv, __program__, language)
     parser.parse_args()
+    if parser.trace or parser.verbose or parser.debug:
+        _run_traced(argc, parser, language, started)
+    else:
+        _run(argc, parser, language)
+
+
+def _run_traced(argc: int, parser: object, language: str, started: int) -> None:
+    """
+    Runs ppi with tracing on, and writes the trace (--trace) and prints
+    a summary of it (-v, --debug) when done, even if ppi failed.
+
+    Parameters:
+        argc...... Amount of arguments.
+        parser.... ArgParser that has parsed the arguments.
+        language.. Language in which to display texts.
+        started... Time (from time.perf_counter_ns()) that parsing started.
+    """
+    parsed: int = time.perf_counter_ns()
+    from ppi import tracing
+
+    tracer: object = tracing.start(started)
+    tracer.complete("parse", "main", started, parsed, argc=argc)
+    try:
+        _run(argc, parser, language)
+    finally:
+        tracing.stop(tracer)
+        if parser.verbose or parser.debug:
+            texts.TraceText(tracer, parser.debug).display(
+                __program__, language, stream=sys.stderr
+            )
+        if parser.trace:
+            import json
+
+            try:
+                with open(parser.trace, "w", encoding=constants.ENCODING) as f:
+                    json.dump(tracer.trace(), f)
+            except OSError as error:
+                handler: object = errors.TraceError(__program__, language)
+                handler.throw_error(str(error))
+                sys.exit(constants.EXIT_ERROR)
+
 
+def _run(argc: int, parser: object, language: str) -> None:
+    """
+    Does what the arguments ask for.
+
+    Parameters:
+        argc...... Amount of arguments.
+        parser.... ArgParser that has parsed the arguments.
+        language.. Language in which to display texts.
+    """
     # Get what flags were provided
     help_: bool = parser.help
     git: bool = parser.git
@@ -27,6 +94,22 @@ def main(argc: int=len(sys.argv), argv: list=sys.argv) -> None:
     quiet: bool = parser.quiet
     version: bool = parser.version
     annotate: bool = parser.annotate
+    manifest: str = parser.batch
+    jobs: int = parser.jobs
+    threads: int = parser.threads
+    durability: str = parser.durability
+    archive: str = parser.archive
+    output: str = parser.output
+    serve: str = parser.serve
+    fork: bool = parser.fork
+    branch: str = parser.branch
+    system_git: bool = parser.system_git
+    commit: bool = parser.initial_commit
+    update: bool = parser.update
+    dedupe: str = parser.dedupe
+    setup_py: bool = parser.setup_py
+    perf: bool = parser.perf
+    large_repo: bool = parser.large_repo
 
     # Text generators
     generator: dict = {
@@ -36,13 +119,6 @@ def main(argc: int=len(sys.argv), argv: list=sys.argv) -> None:
         "success": texts.SuccessText(project)
     }
 
-    # File writers
-    files: dict = {
-        "directory": writers.DirectoryWriter(),
-        "setup": writers.SetupPyWriter(),
-        "main": writers.MainWriter()
-    }
-
     args = argc >= 2
     if not args:
         generator["description"].display(__program__, language, stream=sys.stderr)
@@ -59,43 +135,126 @@ def main(argc: int=len(sys.argv), argv: list=sys.argv) -> None:
         generator["description"].display(__program__, language, stream=sys.stdout)
         sys.exit(constants.EXIT_SUCCESS)
 
-    if project:
-        # Setup writers to write files in desired way
-        if annotate:
-            files["setup"].switch.annotations = True
-            files["main"].switch.annotations = True
+    if serve and any([project, manifest, archive, output]):
+        generator["description"].display(__program__, language, stream=sys.stderr)
+        generator["usage"].display(__program__, language, stream=sys.stderr)
+        sys.exit(constants.EXIT_ERROR)
+
+    if serve:
+        from ppi import serving
 
-        # Write necessary directories
-        files["directory"].write(f"{project}/{project}")
-        files["directory"].write(f"{project}/docs")
+        try:
+            serving.serve(serve, fork=fork)
+        except OSError as error:
+            handler: object = errors.ServerError(__program__, language)
+            handler.throw_error(str(error))
+            sys.exit(constants.EXIT_ERROR)
+        sys.exit(constants.EXIT_SUCCESS)
+
+    if manifest and project:
+        generator["description"].display(__program__, language, stream=sys.stderr)
+        generator["usage"].display(__program__, language, stream=sys.stderr)
+        sys.exit(constants.EXIT_ERROR)
 
-        # Write files that go to the root of the project
-        writers.ReadMeWriter().write(f"{project}/README.md")
-        writers.ChangeLogWriter().write(f"{project}/CHANGELOG.md")
-        writers.ManifestWriter().write(f"{project}/MANIFEST.in")
-        files["setup"].write(f"{project}/setup.py")
-        writers.MakefileWriter().write(f"{project}/Makefile")
+    if (archive or output) and (project or manifest):
+        from ppi import archiving
 
-        # Write man pages
-        writers.ManPageWriter().write(f"{project}/docs/{project}.1.md")
+        archive = archive or archiving.guess_format(output)
+        output = output or "-"
+        if not archive or ((git or commit) and system_git):
+            generator["description"].display(__program__, language, stream=sys.stderr)
+            generator["usage"].display(__program__, language, stream=sys.stderr)
+            sys.exit(constants.EXIT_ERROR)
 
-        # Write rest of the files
-        writers.DunderInitWriter().write(f"{project}/{project}/__init__.py")
-        files["main"].write(f"{project}/{project}/main.py")
-        writers.GitIgnoreWriter().write(f"{project}/.gitignore")
+        failures: int = 0
+        try:
+            with archiving.open_output(output) as stream, \
+                    archiving.Archive(stream, archive) as archive_:
+                if manifest:
+                    from ppi import batch
+
+                    defaults: dict = {"annotate": annotate, "git_init": git,
+                                      "branch": branch,
+                                      "initial_commit": commit,
+                                      "setup_py": setup_py, "perf": perf,
+                                      "large_repo": large_repo}
+                    failures = batch.main(manifest, defaults, jobs, quiet,
+                                          archive=archive_)
+                else:
+                    from ppi import scaffolding
+
+                    archive_.add(project, scaffolding.generate(
+                        project, annotate=annotate, git=git, branch=branch,
+                        commit=commit, lock=True, setup_py=setup_py,
+                        perf=perf, large_repo=large_repo
+                    ))
+        except (OSError, ValueError) as error:
+            handler: object = errors.ScaffoldError(__program__, language)
+            handler.throw_error(str(error))
+            sys.exit(constants.EXIT_ERROR)
+
+        if project and not quiet and output != "-":
+            generator["success"].display(__program__, language, stream=sys.stdout)
 
-        if git:
-            subprocess.run(["git", "init", "--quiet", f"{project}/"])
+        sys.exit(constants.EXIT_ERROR if failures else constants.EXIT_SUCCESS)
+
+    if manifest:
+        from ppi import batch
+
+        defaults: dict = {"annotate": annotate, "git_init": git,
+                          "threads": threads, "durability": durability,
+                          "branch": branch, "system_git": system_git,
+                          "initial_commit": commit, "update": update,
+                          "dedupe": dedupe, "setup_py": setup_py,
+                          "perf": perf, "large_repo": large_repo}
+        try:
+            failures: int = batch.main(manifest, defaults, jobs, quiet)
+        except OSError as error:
+            handler: object = errors.ScaffoldError(__program__, language)
+            handler.throw_error(str(error))
+            sys.exit(constants.EXIT_ERROR)
+        sys.exit(constants.EXIT_ERROR if failures else constants.EXIT_SUCCESS)
+
+    if project:
+        from ppi import scaffolding
+
+        try:
+            kept: list = scaffolding.scaffold(
+                project,
+                scaffolding.create_writers(),
+                annotate=annotate,
+                git=git,
+                width=threads,
+                durability=durability,
+                branch=branch,
+                system_git=system_git,
+                commit=commit,
+                update=update,
+                dedupe=dedupe,
+                setup_py=setup_py,
+                perf=perf,
+                large_repo=large_repo
+            )
+        except scaffolding.MaterializeError as error:
+            handler: object = errors.ScaffoldError(__program__, language)
+            for path, reason in error.errors.items():
+                handler.throw_error(f"{path}: {reason}")
+            sys.exit(constants.EXIT_ERROR)
+        except (OSError, ValueError) as error:
+            handler: object = errors.ScaffoldError(__program__, language)
+            handler.throw_error(str(error))
+            sys.exit(constants.EXIT_ERROR)
 
         if not quiet:
+            texts.KeptText(kept).display(__program__, language, stream=sys.stderr)
             generator["success"].display(__program__, language, stream=sys.stdout)
 
         sys.exit(constants.EXIT_SUCCESS)
 
-    if any([git, quiet, annotate]):
-        generator["description"].display(__program__, language, stream=sys.stderr)
-        generator["usage"].display(__program__, language, stream=sys.stderr)
-        sys.exit(constants.EXIT_ERROR)
+    # Nothing to do, e.g. only options without a name, or just "--"
+    generator["description"].display(__program__, language, stream=sys.stderr)
+    generator["usage"].display(__program__, language, stream=sys.stderr)
+    sys.exit(constants.EXIT_ERROR)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+"""
+Converting man-pages from Markdown to roff, without pandoc.
+
+Only the subset of pandoc's Markdown that the man-pages of ppi use is
+supported: the title block, headers, paragraphs, definition lists, bold,
+italic, code spans, backslash escapes and hard line breaks. Anything else
+is rendered as plain paragraphs.
+"""
+
+import re
+import sys
+
+from ppi import constants
+from ppi import errors
+
+# Inline markup: bold, italic, code spans and backslash escapes (a backslash
+# before a newline is a hard line break).
+INLINE: object = re.compile(
+    r"\*\*(?P<bold>\S(?:.*?\S)??)\*\*"
+    r"|\*(?P<italic>[^*\s](?:.*?[^*\s])??)\*"
+    r"|`(?P<code>[^`]+)`"
+    r"|\\(?P<escape>[!-/:-@\[-`{-~\n])",
+    re.DOTALL
+)
+
+# Title of the title block, e.g. "PPI(1) ppi 1.2.3b2": the name, the
+# section, and the footer and header separated with "|".
+TITLE: object = re.compile(
+    r"^(?P<name>[^\s(]+)\((?P<section>\w+)\)\s*(?P<rest>.*)$"
+)
+
+# ATX headers, e.g. "# NAME".
+HEADER: object = re.compile(r"^#{1,6}(?:\s|$)")
+
+# Characters that mean something else to roff than themselves.
+ROFF: dict = {"\\": "\\[rs]", "-": "\\-"}
+
+# Stands for a hard line break until the text lines have been escaped.
+BREAK: str = "\0"
+
+
+def _text(text: str, smart: bool=True) -> str:
+    """
+    Escapes plain text for roff.
+
+    Parameters:
+        text...... Text to escape.
+        smart..... Whether to turn "--" and "---" into en and em dashes,
+                   as pandoc does.
+    """
+    if smart:
+        text = text.replace("---", "—").replace("--", "–")
+    return "".join(
+        ROFF.get(char) or (f"\\[u{ord(char):04X}]" if ord(char) > 127 else char)
+        for char in text
+    )
+
+
+def _font(font: str, style: str) -> str:
+    """Gets the roff font of style ("B" or "I") within font, e.g. "BI"."""
+    styles: str = "".join(s for s in "BI" if s in font or s == style)
+    return styles or "R"
+
+
+def _inline(text: str, font: str="R") -> str:
+    """
+    Renders the inline markup of text to roff.
+
+    Parameters:
+        text...... Text to render.
+        font...... Font that the text is in, for returning to it.
+    """
+    parts: list = []
+    position: int = 0
+    for match in INLINE.finditer(text):
+        parts.append(_text(text[position:match.start()]))
+        kind: str = match.lastgroup
+        value: str = match.group(kind)
+        if kind == "escape":
+            parts.append(BREAK + "\n" if value == "\n" else _text(value, False))
+        elif kind == "code":
+            parts.append(f"\\f[CR]{_text(value, False)}\\f[{font}]")
+        else:
+            inner: str = _font(font, "B" if kind == "bold" else "I")
+            parts.append(f"\\f[{inner}]{_inline(value, inner)}\\f[{font}]")
+        position = match.end()
+    parts.append(_text(text[position:]))
+    return "".join(parts)
+
+
+def _lines(lines: list) -> str:
+    """Renders lines of Markdown as lines of roff text."""
+    # Two trailing spaces are a hard line break too, except at the end
+    text: str = "\n".join(
+        line.strip() + ("\\" if line.endswith("  ") else "")
+        for line in lines[:-1]
+    )
+    text = _inline(f"{text}\n{lines[-1].strip()}" if text
+                   else lines[-1].strip())
+    # Lines that start with . or ' would be taken as requests
+    text = re.sub(r"^(?=[.'])", r"\\&", text, flags=re.MULTILINE)
+    return text.replace(BREAK, "\n.br")
+
+
+def _quote(text: str) -> str:
+    """Renders text as a quoted argument of a request."""
+    return '"' + _inline(text).replace('"', "\\[dq]") + '"'
+
+
+def _blocks(lines: list) -> list:
+    """
+    Splits lines into blocks: ["header", level, text], ["paragraph", lines]
+    and ["item", term, paragraphs], where paragraphs are lists of lines.
+    """
+    blocks: list = []
+    current: list = None  # Lines of the paragraph being read
+    for line in lines:
+        stripped: str = line.strip()
+        definition: bool = stripped.startswith(":")
+        if not stripped:
+            current = None
+        elif HEADER.match(stripped):
+            level: int = len(stripped) - len(stripped.lstrip("#"))
+            blocks.append(["header", level, stripped.strip("# ")])
+            current = None
+        elif definition and current is not None \
+                and blocks[-1][0] == "paragraph" and len(current) == 1:
+            # The paragraph was the term of a definition list item
+            current = [line.lstrip()[1:]]
+            blocks[-1] = ["item", blocks[-1][1][0], [current]]
+        elif blocks and blocks[-1][0] == "item" and (
+                definition or current is None
+                and line.startswith(("    ", "\t"))):
+            # Another definition, or paragraph of one, of the item
+            current = [line.lstrip()[1:] if definition else line]
+            blocks[-1][2].append(current)
+        elif current is None:
+            current = [line]
+            blocks.append(["paragraph", current])
+        else:
+            current.append(line)
+    return blocks
+
+
+def render(markdown: str) -> str:
+    """
+    Renders a man-page written in Markdown, as pandoc -s -t man would.
+
+    Parameters:
+        markdown.. The man-page, starting with a title block of the title,
+                   e.g. "% PPI(1) ppi 1.2.3b2", the authors and the date.
+    """
+    lines: list = markdown.splitlines()
+    title: list = []
+    while lines and lines[0].startswith("%") and len(title) < 3:
+        title.append(lines.pop(0)[1:].strip())
+    title += [""] * (3 - len(title))
+
+    match: object = TITLE.match(title[0])
+    name, section, rest = match.groups() if match else (title[0], "1", "")
+    footer, _, header = rest.partition("|")
+    out: list = [
+        '.\\" Automatically generated by ppi',
+        f".TH {_quote(name)} {_quote(section)} {_quote(title[2])} "
+        f"{_quote(footer.strip())} {_quote(header.strip())}"
+    ]
+    for block in _blocks(lines):
+        if block[0] == "header":
+            out.append(f".{'SH' if block[1] == 1 else 'SS'} "
+                       f"{_lines([block[2]])}")
+        elif block[0] == "paragraph":
+            out.extend([".PP", _lines(block[1])])
+        else:
+            out.extend([".TP", _lines([block[1]]), _lines(block[2][0])])
+            for paragraph in block[2][1:]:
+                out.extend([".IP", _lines(paragraph)])
+    if title[1]:
+        out.extend([".SH AUTHORS", _lines([title[1] + "."])])
+    return "\n".join(out) + "\n"
+
+
+def convert(source: str, target: str) -> None:
+    """
+    Converts a man-page from Markdown to roff.
+
+    Parameters:
+        source.... Path of the Markdown, or "-" for stdin.
+        target.... Path of the roff, or "-" for stdout.
+    """
+    if source == "-":
+        markdown: str = sys.stdin.read()
+    else:
+        with open(source, "r", encoding=constants.ENCODING) as f:
+            markdown = f.read()
+    roff: str = render(markdown)
+    if target == "-":
+        sys.stdout.write(roff)
+        sys.stdout.flush()
+    else:
+        with open(target, "w", encoding=constants.ENCODING) as f:
+            f.write(roff)
+
+
+def main(argv: list, program: str, language: str) -> int:
+    """
+    Runs "ppi --man [-o <file>] <page.md>..." and returns the exit status.
+
+    Every page is converted next to itself, e.g. docs/ppi.1.md to
+    docs/ppi.1, unless -o tells where the only page goes. A page of "-" is
+    read from stdin and written to stdout. The pages are converted in
+    one go, even if some of them fail.
+
+    Parameters:
+        argv...... Command line, including the program's name and "--man"
+                   (or "--man=<page.md>").
+        program... Program's name.
+        language.. Language in which to display error messages.
+    """
+    first: str = argv[1].partition("=")[2]
+    args: list = ([first] if first else []) + argv[2:]
+    output: str = ""
+    pages: list = []
+    while args:
+        arg: str = args.pop(0)
+        if arg in {"-o", "--output"}:
+            if not args:
+                errors.MissingValueError(program, language).throw_error(arg)
+                return constants.EXIT_ERROR
+            output = args.pop(0)
+        elif arg.startswith("--output="):
+            output = arg.partition("=")[2]
+        elif arg == "--":
+            pages.extend(args)
+            break
+        elif arg.startswith("-") and arg != "-":
+            errors.InvalidArgumentError(program, language).throw_error(arg)
+            return constants.EXIT_ERROR
+        else:
+            pages.append(arg)
+    if not pages:
+        errors.MissingValueError(program, language).throw_error("--man")
+        return constants.EXIT_ERROR
+    if output and len(pages) > 1:
+        errors.ExtraArgumentError(program, language).throw_error(pages[1])
+        return constants.EXIT_ERROR
+
+    status: int = constants.EXIT_SUCCESS
+    for page in pages:
+        target: str = output or ("-" if page == "-" else page[:-3])
+        if not output and page != "-" and not page.endswith(".md"):
+            errors.InvalidArgumentError(program, language).throw_error(page)
+            status = constants.EXIT_ERROR
+            continue
+        try:
+            convert(page, target)
+        except (OSError, UnicodeError) as error:
+            errors.ManPageError(program, language).throw_error(
+                f"{page}: {error}"
+            )
+            status = constants.EXIT_ERROR
+    return status
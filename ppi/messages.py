@@ -0,0 +1,231 @@
+"""Message catalogs that the texts and errors are displayed from."""
+
+import marshal
+import os
+import struct
+import sys
+
+from ppi import constants
+
+# Catalogs that come with ppi: one JSON file per language, e.g. "fi.json",
+# that maps the key of each message to the message. A message is a format
+# string (see str.format()), or a list of lines.
+CATALOG_DIR: str = os.path.join(os.path.dirname(__file__), "locale")
+
+# Language whose catalog has every message, and which is used when the
+# user's language has no catalog, or the catalog lacks a message.
+DEFAULT_LANGUAGE: str = "en"
+
+# Environment variables that choose the language of messages, in order of
+# precedence, as in POSIX.
+LOCALE_VARIABLES: tuple = ("LC_ALL", "LC_MESSAGES", "LANG")
+
+# Header of the compiled catalogs: the interpreter's cache tag, as the
+# format of marshal may change between Python versions, and the source's
+# mtime and size when it was compiled.
+HEADER: object = struct.Struct("<16sQQ")
+
+
+class CatalogError(ValueError):
+    """Raised when a catalog can't be compiled."""
+
+
+def locale(environ: dict=None) -> str:
+    """
+    Gets the locale that messages are displayed in, e.g. "fi_FI.UTF-8".
+
+    Parameters:
+        environ... Environment to read LOCALE_VARIABLES from. Defaults
+                   to os.environ.
+    """
+    if environ is None:
+        environ = os.environ
+    for variable in LOCALE_VARIABLES:
+        if environ.get(variable):
+            return environ[variable]
+    return ""
+
+
+def normalize(locale_: str) -> str:
+    """
+    Gets the language of a locale, e.g. "fi" for "fi_FI.utf8", "fi_FI.UTF-8"
+    or "fi_FI@euro", and "" for "C" and "POSIX".
+
+    Parameters:
+        locale_... The locale, as in LOCALE_VARIABLES.
+    """
+    language: str = (locale_ or "").partition("@")[0].partition(".")[0]
+    language = language.partition("_")[0].partition("-")[0].lower()
+    if language in {"c", "posix"}:
+        return ""
+    return language
+
+
+def compile_catalog(source: str, filename: str="<catalog>") -> dict:
+    """
+    Compiles the source of a catalog into a dict of messages.
+
+    Parameters:
+        source.... Contents of the catalog.
+        filename.. Name of the catalog, used in error messages.
+    """
+    import json  # Only needed when a catalog isn't compiled yet
+
+    try:
+        catalog: object = json.loads(source)
+    except ValueError as error:
+        raise CatalogError(f"{filename}: {error}") from None
+    if not isinstance(catalog, dict):
+        raise CatalogError(f"{filename}: not an object")
+    messages: dict = {}
+    for key, message in catalog.items():
+        if isinstance(message, list) and all(isinstance(line, str)
+                                             for line in message):
+            message = "\n".join(message)
+        if not isinstance(message, str):
+            raise CatalogError(f"{filename}: invalid message '{key}'")
+        messages[key] = message
+    return messages
+
+
+def _cache_dir() -> str:
+    """Gets the directory for the compiled catalogs."""
+    cache: str = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache, "ppi", "locale")
+
+
+def _tag() -> bytes:
+    """Gets the interpreter's cache tag, as stored in HEADER."""
+    return (sys.implementation.cache_tag or "").encode()[:16]
+
+
+class CatalogLoader:
+    """Class for finding, compiling and caching message catalogs."""
+
+    def __init__(self, catalog_dir: str=None, cache_dir: str=None) -> None:
+        """
+        Initializes CatalogLoader.
+
+        Parameters:
+            catalog_dir... Directory of the catalogs. Defaults to the
+                           catalogs that come with ppi.
+            cache_dir..... Directory for the compiled catalogs. Defaults
+                           to ~/.cache/ppi/locale. An empty string
+                           disables the on-disk cache.
+        """
+        if catalog_dir is None:
+            catalog_dir = CATALOG_DIR
+        if cache_dir is None:
+            cache_dir = _cache_dir()
+        self.catalog_dir: str = catalog_dir
+        self.cache_dir: str = cache_dir
+        self._languages: dict = {}
+        self._catalogs: dict = {}
+
+    def language(self, locale_: str) -> str:
+        """
+        Gets the language of the catalog that a locale's messages are
+        displayed from. Falls back to DEFAULT_LANGUAGE.
+
+        Parameters:
+            locale_... The locale, as in LOCALE_VARIABLES.
+        """
+        if locale_ not in self._languages:
+            language: str = normalize(locale_)
+            if not language.isalpha() or not os.path.isfile(
+                os.path.join(self.catalog_dir, f"{language}.json")
+            ):
+                language = DEFAULT_LANGUAGE
+            self._languages[locale_] = language
+        return self._languages[locale_]
+
+    def _load_cached(self, language: str, stat: object) -> object:
+        """Gets the cached messages of language, if they're still valid."""
+        try:
+            with open(os.path.join(self.cache_dir, f"{language}.bin"),
+                      "rb") as f:
+                data: bytes = f.read()
+            tag, mtime, size = HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if (tag.rstrip(b"\0"), mtime, size) != (_tag(), stat.st_mtime_ns,
+                                                stat.st_size):
+            return None
+        try:
+            return marshal.loads(data[HEADER.size:])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _store_cached(self, language: str, stat: object, messages: dict) -> None:
+        """Caches the messages of language; failing to do so is not an error."""
+        path: str = os.path.join(self.cache_dir, f"{language}.bin")
+        temporary: str = f"{path}.{os.getpid()}"
+        data: bytes = HEADER.pack(
+            _tag(), stat.st_mtime_ns, stat.st_size
+        ) + marshal.dumps(messages)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def load(self, language: str) -> dict:
+        """
+        Gets the messages of a language.
+
+        Catalogs are compiled only when they have changed since they were
+        cached, and loaded only once per process.
+
+        Parameters:
+            language.. The language, as returned by language().
+        """
+        if language in self._catalogs:
+            return self._catalogs[language]
+
+        path: str = os.path.join(self.catalog_dir, f"{language}.json")
+        stat: object = os.stat(path)
+        messages: object = None
+        if self.cache_dir:
+            messages = self._load_cached(language, stat)
+        if not isinstance(messages, dict):
+            with open(path, "r", encoding=constants.ENCODING) as f:
+                messages = compile_catalog(f.read(), path)
+            if self.cache_dir:
+                self._store_cached(language, stat, messages)
+        self._catalogs[language] = messages
+        return messages
+
+    def get(self, locale_: str, key: str, **fields: object) -> str:
+        """
+        Gets a message in the language of a locale.
+
+        Parameters:
+            locale_... The locale, as in LOCALE_VARIABLES.
+            key....... Key of the message.
+            fields.... Values of the message's fields.
+        """
+        message: object = self.load(self.language(locale_)).get(key)
+        if message is None:
+            message = self.load(DEFAULT_LANGUAGE)[key]
+        return message.format(**fields)
+
+
+# Loader used by the texts and errors, created when it's first needed.
+_loader: object = None
+
+
+def get(locale_: str, key: str, **fields: object) -> str:
+    """
+    Gets a message with the default CatalogLoader.
+
+    Parameters:
+        locale_... The locale, as in LOCALE_VARIABLES.
+        key....... Key of the message.
+        fields.... Values of the message's fields.
+    """
+    global _loader
+    if _loader is None:
+        _loader = CatalogLoader()
+    return _loader.get(locale_, key, **fields)
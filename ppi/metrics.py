@@ -0,0 +1,315 @@
+"""Counters and histograms of what ppi does, for programs that embed it."""
+
+import math
+import threading
+import time
+
+from ppi import tracing
+
+# Upper bounds (in seconds) of the buckets of the histograms.
+BUCKETS: tuple = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                  0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: tuple, values: tuple, extra: str="") -> str:
+    """Formats labels for the Prometheus text format, e.g. '{writer="x"}'."""
+    pairs: list = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"') \
+                     .replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Formats a number for the Prometheus text format."""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Class for a count that only goes up, for each combination of labels."""
+
+    kind: str = "counter"
+
+    def __init__(self, name: str, help_: str, labels: tuple=()) -> None:
+        """
+        Initializes Counter.
+
+        Parameters:
+            name...... Name of the metric, e.g. "ppi_files_written_total".
+            help_..... Description of the metric.
+            labels.... Names of the labels, e.g. ("writer",).
+        """
+        self.name: str = name
+        self.help: str = help_
+        self.labels: tuple = labels
+        self.values: dict = {}
+
+    def inc(self, amount: float=1, labels: tuple=()) -> None:
+        """
+        Adds amount to the count of labels.
+
+        Parameters:
+            amount.... How much to add.
+            labels.... Values of the labels, in the order of self.labels.
+        """
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> list:
+        """Gets the counts as dicts of "labels" and "value"."""
+        return [
+            {"labels": dict(zip(self.labels, labels)), "value": value}
+            for labels, value in self.values.items()
+        ]
+
+    def text(self) -> list:
+        """Gets the lines of the counts in the Prometheus text format."""
+        return [
+            f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Histogram:
+    """Class for a distribution of durations, for each combination of labels."""
+
+    kind: str = "histogram"
+
+    def __init__(self, name: str, help_: str, labels: tuple=(),
+                 buckets: tuple=BUCKETS) -> None:
+        """
+        Initializes Histogram.
+
+        Parameters:
+            name...... Name of the metric, e.g. "ppi_write_seconds".
+            help_..... Description of the metric.
+            labels.... Names of the labels, e.g. ("writer",).
+            buckets... Upper bounds of the buckets, in increasing order.
+        """
+        self.name: str = name
+        self.help: str = help_
+        self.labels: tuple = labels
+        self.buckets: tuple = (*buckets, math.inf)
+        self.values: dict = {}
+
+    def observe(self, value: float, labels: tuple=()) -> None:
+        """
+        Adds value to the distribution of labels.
+
+        Parameters:
+            value..... The value, e.g. a duration in seconds.
+            labels.... Values of the labels, in the order of self.labels.
+        """
+        if labels not in self.values:
+            self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+        counts, _, _ = entry = self.values[labels]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> list:
+        """
+        Gets the distributions as dicts of "labels", "buckets" (cumulative
+        counts by upper bound), "sum" and "count".
+        """
+        samples: list = []
+        for labels, (counts, sum_, count) in self.values.items():
+            cumulative: list = []
+            total: int = 0
+            for bound, amount in zip(self.buckets, counts):
+                total += amount
+                cumulative.append((bound, total))
+            samples.append({"labels": dict(zip(self.labels, labels)),
+                            "buckets": dict(cumulative), "sum": sum_,
+                            "count": count})
+        return samples
+
+    def text(self) -> list:
+        """Gets the lines of the distributions in the Prometheus text format."""
+        lines: list = []
+        for sample in self.samples():
+            labels: tuple = tuple(sample["labels"].values())
+            for bound, count in sample["buckets"].items():
+                le: str = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket"
+                             f"{_labels(self.labels, labels, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} "
+                         f"{_number(sample['sum'])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} "
+                         f"{sample['count']}")
+        return lines
+
+
+class Registry:
+    """
+    Class for collecting metrics of the spans that ppi records (see
+    tracing), while anyone is subscribed.
+
+    Only the counts and distributions are kept, never the spans, so the
+    memory a registry uses doesn't grow with the amount of projects.
+    """
+
+    def __init__(self) -> None:
+        """Initializes Registry."""
+        self.files: object = Counter(
+            "ppi_files_written_total", "Files written.", ("writer",)
+        )
+        self.bytes: object = Counter(
+            "ppi_bytes_written_total", "Bytes written to files.", ("writer",)
+        )
+        self.directories: object = Counter(
+            "ppi_directories_created_total", "Directories created."
+        )
+        self.errors: object = Counter(
+            "ppi_errors_total", "Steps that failed.", ("step",)
+        )
+        self.write: object = Histogram(
+            "ppi_write_seconds", "Time taken to write a file.", ("writer",)
+        )
+        self.render: object = Histogram(
+            "ppi_render_seconds", "Time taken to render a file.", ("writer",)
+        )
+        self.git: object = Histogram(
+            "ppi_git_seconds", "Time taken by the steps of creating the "
+            "git-repo.", ("step",)
+        )
+        self.scaffold: object = Histogram(
+            "ppi_scaffold_seconds", "Time taken to create a whole project."
+        )
+        self.metrics: tuple = (self.files, self.bytes, self.directories,
+                               self.errors, self.write, self.render, self.git,
+                               self.scaffold)
+        self._subscribers: list = []
+        self._collecting: bool = False
+        self._lock: object = threading.Lock()
+
+    now: object = staticmethod(time.perf_counter_ns)
+
+    def complete(self, name: str, category: str, start: int, end: int=None,
+                 **args: object) -> None:
+        """
+        Updates the metrics with a span that has ended, and passes it on
+        to the subscribers. Called through tracing.
+
+        Parameters:
+            name...... Name of the span, e.g. "write".
+            category.. Category of the span, e.g. "file".
+            start..... Time the span started at, from now().
+            end....... Time the span ended at. Defaults to now.
+            args...... Details of the span, e.g. path="setup.py".
+        """
+        if end is None:
+            end = time.perf_counter_ns()
+        seconds: float = (end - start) / 1e9
+        with self._lock:
+            if "error" in args:
+                self.errors.inc(labels=(name,))
+            elif name == "write":
+                writer: tuple = (args.get("writer", ""),)
+                self.files.inc(labels=writer)
+                self.bytes.inc(args.get("bytes", 0), writer)
+                self.write.observe(seconds, writer)
+            elif name == "mkdir":
+                self.directories.inc()
+            elif name == "render":
+                self.render.observe(seconds, (args.get("writer", ""),))
+            elif name == "scaffold":
+                self.scaffold.observe(seconds)
+            if category == "git":
+                self.git.observe(seconds, (name,))
+            subscribers: tuple = tuple(self._subscribers)
+        for subscriber in subscribers:
+            subscriber(name, category, seconds, args)
+
+    def span(self, name: str, category: str, **args: object) -> object:
+        """
+        Gets a context manager that records a span around its block.
+
+        Parameters:
+            name...... Name of the span, e.g. "git init".
+            category.. Category of the span, e.g. "git".
+            args...... Details of the span, e.g. path="demo".
+        """
+        return tracing.Span(self, name, category, args)
+
+    def _update(self) -> None:
+        """Installs or uninstalls the registry, as needed."""
+        if self._subscribers or self._collecting:
+            tracing.install(self)
+        else:
+            tracing.uninstall(self)
+
+    def subscribe(self, subscriber: object) -> object:
+        """
+        Calls subscriber for every span from now on, with the span's name,
+        category, duration in seconds and details, e.g. ("write", "file",
+        0.0001, {"path": "setup.py", "bytes": 10, "writer": "SetupPyWriter"}).
+        The metrics are collected while anyone is subscribed.
+
+        Returns subscriber, so that this can be used as a decorator.
+
+        Parameters:
+            subscriber Function to call.
+        """
+        self._subscribers.append(subscriber)
+        self._update()
+        return subscriber
+
+    def unsubscribe(self, subscriber: object) -> None:
+        """
+        Stops calling subscriber.
+
+        Parameters:
+            subscriber Function given to subscribe().
+        """
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+        self._update()
+
+    def start(self) -> None:
+        """Starts collecting the metrics, for scraping them without subscribing."""
+        self._collecting = True
+        self._update()
+
+    def stop(self) -> None:
+        """Stops collecting the metrics, unless someone is subscribed."""
+        self._collecting = False
+        self._update()
+
+    def snapshot(self) -> dict:
+        """
+        Gets the metrics as a dict that maps each metric's name to its
+        "type", "help" and "samples" (see Counter.samples() and
+        Histogram.samples()).
+        """
+        with self._lock:
+            return {
+                metric.name: {"type": metric.kind, "help": metric.help,
+                              "samples": metric.samples()}
+                for metric in self.metrics
+            }
+
+    def prometheus(self) -> str:
+        """Gets the metrics in the Prometheus text exposition format."""
+        lines: list = []
+        with self._lock:
+            for metric in self.metrics:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.text())
+        return "\n".join(lines) + "\n"
+
+
+# Registry for programs that embed ppi; anyone can subscribe to it.
+registry: object = Registry()
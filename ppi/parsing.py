@@ -4,7 +4,71 @@ import sys
 
 from ppi import constants
 from ppi import errors
-from ppi import texts
+
+# Options that don't take a value, mapped to the property that they
+# switch on. Short ones can be combined, e.g. "-qi".
+FLAGS: dict = {
+    "-h": "help", "--help": "help",
+    "-V": "version", "--version": "version",
+    "-q": "quiet", "--quiet": "quiet",
+    "-i": "git", "--git-init": "git",
+    "-a": "annotate", "--annotate": "annotate",
+    "--fork": "fork",
+    "--system-git": "system_git",
+    "--initial-commit": "initial_commit",
+    "--update": "update",
+    "--setup-py": "setup_py",
+    "--perf": "perf",
+    "--large-repo": "large_repo",
+    "-v": "verbose", "--verbose": "verbose",
+    "--debug": "debug",
+}
+
+# Options that take a value, e.g. "--batch specs.jsonl", mapped to the
+# property that they set.
+VALUE_OPTIONS: dict = {
+    "--batch": "batch",
+    "--jobs": "jobs",
+    "--threads": "threads",
+    "--durability": "durability",
+    "--archive": "archive",
+    "-o": "output", "--output": "output",
+    "--serve": "serve",
+    "--initial-branch": "branch",
+    "--trace": "trace",
+}
+
+# Options that take a value only in the "--option=value" form, mapped to
+# the property that they set and the value they get when given alone.
+OPTIONAL_VALUE_OPTIONS: dict = {"--dedupe": ("dedupe", "reflink")}
+
+
+def _positive(value: str) -> int:
+    """Converts value to a positive int, raising ValueError if it isn't."""
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(value)
+    return int(value)
+
+
+def _choice(choices: tuple) -> object:
+    """Gets a function that checks that a value is one of choices."""
+    def check(value: str) -> str:
+        if value not in choices:
+            raise ValueError(value)
+        return value
+    return check
+
+
+# Functions that convert the values of options, by the property that
+# they set, raising ValueError if a value is invalid. Other values are
+# taken as they are.
+CONVERTERS: dict = {
+    "jobs": _positive,
+    "threads": _positive,
+    "durability": _choice(constants.DURABILITY),
+    "archive": _choice(constants.ARCHIVE_FORMATS),
+    "dedupe": _choice(constants.DEDUPE),
+}
 
 
 class ArgParser:
@@ -16,15 +80,11 @@ class ArgParser:
         self.program: str = program
         self.language: str = language
 
-        self.options: dict = {
-            "long": None,
-            "short": None
-        }
-
         self.arguments: dict = {
             "invalid": None,
             "positional": None,
-            "extra": None
+            "extra": None,
+            "missing": None
         }
 
         # Option switches
@@ -34,6 +94,25 @@ class ArgParser:
         self._quiet: bool = False
         self._git: bool = False
         self._annotate: bool = False
+        self._batch: str = ""
+        self._jobs: int = 0
+        self._threads: int = 1
+        self._durability: str = "none"
+        self._archive: str = ""
+        self._output: str = ""
+        self._serve: str = ""
+        self._fork: bool = False
+        self._branch: str = ""
+        self._system_git: bool = False
+        self._initial_commit: bool = False
+        self._update: bool = False
+        self._dedupe: str = ""
+        self._setup_py: bool = False
+        self._perf: bool = False
+        self._large_repo: bool = False
+        self._trace: str = ""
+        self._verbose: bool = False
+        self._debug: bool = False
 
     @property
     def project(self) -> str:
@@ -101,37 +180,310 @@ class ArgParser:
         if value in {True, False}:
             self._annotate = value
 
-    def _startswith_hyphens(self, arg: str, count: int) -> bool:
-        """Checks if arg starts with count amount of "-"."""
-        return arg[0:count] == "-" * count and arg[count] != "-"
+    @property
+    def batch(self) -> str:
+        """Gets the manifest given with --batch ("-" means stdin)."""
+        return self._batch
+
+    @batch.setter
+    def batch(self, value: str) -> None:
+        """Sets self._batch."""
+        if isinstance(value, str):
+            self._batch = value
+
+    @property
+    def jobs(self) -> int:
+        """Gets the amount of workers given with --jobs (0 means default)."""
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, value: int) -> None:
+        """Sets self._jobs."""
+        if isinstance(value, int) and value >= 0:
+            self._jobs = value
+
+    @property
+    def threads(self) -> int:
+        """Gets the amount of threads given with --threads."""
+        return self._threads
+
+    @threads.setter
+    def threads(self, value: int) -> None:
+        """Sets self._threads."""
+        if isinstance(value, int) and value >= 1:
+            self._threads = value
+
+    @property
+    def durability(self) -> str:
+        """Gets the durability given with --durability."""
+        return self._durability
+
+    @durability.setter
+    def durability(self, value: str) -> None:
+        """Sets self._durability."""
+        if value in constants.DURABILITY:
+            self._durability = value
+
+    @property
+    def archive(self) -> str:
+        """Gets the archive format given with --archive."""
+        return self._archive
+
+    @archive.setter
+    def archive(self, value: str) -> None:
+        """Sets self._archive."""
+        if value in constants.ARCHIVE_FORMATS:
+            self._archive = value
+
+    @property
+    def output(self) -> str:
+        """Gets the path given with -o or --output ("-" means stdout)."""
+        return self._output
+
+    @output.setter
+    def output(self, value: str) -> None:
+        """Sets self._output."""
+        if isinstance(value, str):
+            self._output = value
+
+    @property
+    def serve(self) -> str:
+        """Gets the socket given with --serve."""
+        return self._serve
+
+    @serve.setter
+    def serve(self, value: str) -> None:
+        """Sets self._serve."""
+        if isinstance(value, str):
+            self._serve = value
+
+    @property
+    def fork(self) -> bool:
+        """Gets whether --fork was provided on the command line."""
+        return self._fork
+
+    @fork.setter
+    def fork(self, value: bool) -> None:
+        """Sets self._fork."""
+        if value in {True, False}:
+            self._fork = value
+
+    @property
+    def branch(self) -> str:
+        """Gets the initial branch given with --initial-branch."""
+        return self._branch
+
+    @branch.setter
+    def branch(self, value: str) -> None:
+        """Sets self._branch."""
+        if isinstance(value, str):
+            self._branch = value
+
+    @property
+    def system_git(self) -> bool:
+        """Gets whether --system-git was provided on the command line."""
+        return self._system_git
+
+    @system_git.setter
+    def system_git(self, value: bool) -> None:
+        """Sets self._system_git."""
+        if value in {True, False}:
+            self._system_git = value
+
+    @property
+    def initial_commit(self) -> bool:
+        """Gets whether --initial-commit was provided on the command line."""
+        return self._initial_commit
+
+    @initial_commit.setter
+    def initial_commit(self, value: bool) -> None:
+        """Sets self._initial_commit."""
+        if value in {True, False}:
+            self._initial_commit = value
+
+    @property
+    def update(self) -> bool:
+        """Gets whether --update was provided on the command line."""
+        return self._update
+
+    @update.setter
+    def update(self, value: bool) -> None:
+        """Sets self._update."""
+        if value in {True, False}:
+            self._update = value
+
+    @property
+    def setup_py(self) -> bool:
+        """Gets whether --setup-py was provided on the command line."""
+        return self._setup_py
+
+    @setup_py.setter
+    def setup_py(self, value: bool) -> None:
+        """Sets self._setup_py."""
+        if value in {True, False}:
+            self._setup_py = value
+
+    @property
+    def perf(self) -> bool:
+        """Gets whether --perf was provided on the command line."""
+        return self._perf
+
+    @perf.setter
+    def perf(self, value: bool) -> None:
+        """Sets self._perf."""
+        if value in {True, False}:
+            self._perf = value
+
+    @property
+    def large_repo(self) -> bool:
+        """Gets whether --large-repo was provided on the command line."""
+        return self._large_repo
+
+    @large_repo.setter
+    def large_repo(self, value: bool) -> None:
+        """Sets self._large_repo."""
+        if value in {True, False}:
+            self._large_repo = value
+
+    @property
+    def dedupe(self) -> str:
+        """Gets the mode given with --dedupe ("" if not given)."""
+        return self._dedupe
+
+    @dedupe.setter
+    def dedupe(self, value: str) -> None:
+        """Sets self._dedupe."""
+        if value in constants.DEDUPE:
+            self._dedupe = value
+
+    @property
+    def trace(self) -> str:
+        """Gets the path given with --trace."""
+        return self._trace
+
+    @trace.setter
+    def trace(self, value: str) -> None:
+        """Sets self._trace."""
+        if isinstance(value, str):
+            self._trace = value
+
+    @property
+    def verbose(self) -> bool:
+        """Checks if -v or --verbose is requested."""
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, value: bool) -> None:
+        """Sets self._verbose."""
+        if value in {True, False}:
+            self._verbose = value
+
+    @property
+    def debug(self) -> bool:
+        """Checks if --debug is requested."""
+        return self._debug
+
+    @debug.setter
+    def debug(self, value: bool) -> None:
+        """Sets self._debug."""
+        if value in {True, False}:
+            self._debug = value
 
-    def _sort_args_long(self) -> None:
-        """Gathers all '--' prefixed options from sys.argv into one group."""
-        self.options["long"] = (
-            arg for arg in self.argv if self._startswith_hyphens(arg, 2)
-        )
+    def _add_invalid(self, arg: str) -> None:
+        """Records an invalid argument."""
+        if self.arguments["invalid"] is None:
+            self.arguments["invalid"] = []
+        self.arguments["invalid"].append(arg)
 
-    def _sort_args_short(self) -> None:
-        """Gathers all '-' prefixed options from sys.argv into one group."""
-        self.options["short"] = (
-            arg for arg in self.argv if self._startswith_hyphens(arg, 1)
-        )
+    def _add_missing(self, option: str) -> None:
+        """Records an option that is missing its value."""
+        if self.arguments["missing"] is None:
+            self.arguments["missing"] = []
+        self.arguments["missing"].append(option)
 
-    def _sort_args_pos(self) -> None:
+    def _add_positional(self, arg: str) -> None:
         """
-        Gathers all arguments with no prefixing
-        from sys.argv into one group.
+        Stores the first positional argument as the project's name, and
+        records the rest as extra arguments.
         """
-        self.arguments["positional"] = (
-            arg for index, arg in enumerate(self.argv)
-            if not arg.startswith("-") and index != 0
-        )
+        if not self._project:
+            self.project = arg
+        elif self.arguments["extra"] is None:
+            self.arguments["extra"] = [arg]
+        else:
+            self.arguments["extra"].append(arg)
+
+    def _set_value(self, option: str, value: str) -> None:
+        """Sets the property of an option that takes a value."""
+        name: str = VALUE_OPTIONS.get(option) or OPTIONAL_VALUE_OPTIONS[option][0]
+        try:
+            setattr(self, name, CONVERTERS.get(name, str)(value))
+        except ValueError:
+            self._add_invalid(f"{option}={value}")
+
+    def _parse_short(self, arg: str, args: object) -> None:
+        """
+        Evaluates a group of '-' prefixed options, e.g. "-qi". An option
+        that takes a value gets the rest of the group (without a leading
+        "="), or the next argument if the group ends with it.
+        """
+        for index in range(1, len(arg)):
+            option: str = "-" + arg[index]
+            if option in FLAGS:
+                setattr(self, FLAGS[option], True)
+            elif option in VALUE_OPTIONS:
+                value: str = arg[index + 1:]
+                if value.startswith("="):
+                    value = value[1:]
+                elif not value:
+                    value = next(args, None)
+                if value is None:
+                    self._add_missing(option)
+                else:
+                    self._set_value(option, value)
+                return
+            else:
+                self._add_invalid(option)
+
+    def _parse_long(self, arg: str, args: object) -> None:
+        """Evaluates a '--' prefixed option, or its "--option=value" form."""
+        option, separator, value = arg.partition("=")
+        if option in FLAGS and not separator:
+            setattr(self, FLAGS[option], True)
+        elif option in VALUE_OPTIONS:
+            if not separator:
+                value = next(args, None)
+            if value is None:
+                self._add_missing(option)
+            else:
+                self._set_value(option, value)
+        elif option in OPTIONAL_VALUE_OPTIONS:
+            self._set_value(
+                option, value if separator else OPTIONAL_VALUE_OPTIONS[option][1]
+            )
+        else:
+            self._add_invalid(arg)
 
     def _sort_args(self) -> None:
-        """Sorts all argument types."""
-        self._sort_args_long()
-        self._sort_args_short()
-        self._sort_args_pos()
+        """
+        Evaluates every argument in a single pass over sys.argv (skipping
+        the program's name). Everything after "--" is positional. A lone
+        "-" is invalid, as ppi doesn't read anything from stdin.
+        """
+        args: object = iter(self.argv)
+        next(args, None)
+        for arg in args:
+            if arg[:1] != "-":
+                self._add_positional(arg)
+            elif arg == "--":
+                for arg in args:
+                    self._add_positional(arg)
+            elif arg[:2] == "--":
+                self._parse_long(arg, args)
+            elif arg == "-":
+                self._add_invalid(arg)
+            else:
+                self._parse_short(arg, args)
 
     def _parse_args_inv(self) -> None:
         """Prints error for each invalid argument."""
@@ -145,6 +497,18 @@ class ArgParser:
             del handler
             sys.exit(constants.EXIT_ERROR)
 
+    def _parse_args_missing(self) -> None:
+        """Prints error for each option that is missing its value."""
+        if self.arguments["missing"] is not None:
+            handler: object = errors.MissingValueError(
+                self.program,
+                self.language
+            )
+            for arg in self.arguments["missing"]:
+                handler.throw_error(arg)
+            del handler
+            sys.exit(constants.EXIT_ERROR)
+
     def _parse_args_xtra(self) -> None:
         """Prints error for each xtra positional arguments."""
         if self.arguments["extra"] is not None:
@@ -157,61 +521,9 @@ class ArgParser:
             del handler
             sys.exit(constants.EXIT_ERROR)
 
-    def _parse_args_pos(self) -> None:
-        """Stores the first non-prefixed argument from sys.argv."""
-        if self.arguments["positional"]:
-            for arg in self.arguments["positional"]:
-                if self.project:
-                    if self.arguments["extra"] is None:
-                        self.arguments["extra"] = []
-                    self.arguments["extra"].append(arg)
-                else:
-                    self.project = arg
-
-    def _parse_args_short(self) -> None:
-        """Evaluates each '-' prefixed option."""
-        for arg in self.options["short"]:
-            for index, letter in enumerate(arg):
-                if index == 0:
-                    continue  # Skip the "-" prefix.
-                if letter == "V":
-                    self.version = True
-                elif letter == "h":
-                    self.help = True
-                elif letter == "q":
-                    self.quiet = True
-                elif letter == "i":
-                    self.git = True
-                elif letter == "a":
-                    self.annotate = True
-                else:
-                    if self.arguments["invalid"] is None:
-                        self.arguments["invalid"] = []
-                    self.arguments["invalid"].append(f"-{letter}")
-
-    def _parse_args_long(self) -> None:
-        """Evaluates each '--' prefixed option."""
-        for index, arg in enumerate(self.options["long"]):
-            if arg == "--version":
-                self.version = True
-            elif arg == "--help":
-                self.help = True
-            elif arg == "--quiet":
-                self.quiet = True
-            elif arg == "--git-init":
-                self.git = True
-            elif arg == "--annotate":
-                self.annotate = True
-            else:
-                if self.arguments["invalid"] is None:
-                    self.arguments["invalid"] = []
-                self.arguments["invalid"].append(arg)
-
     def parse_args(self) -> None:
         """Parse args and execute actions according to the given options."""
         self._sort_args()
-        self._parse_args_pos()
-        self._parse_args_short()
-        self._parse_args_long()
+        self._parse_args_missing()
         self._parse_args_inv()
         self._parse_args_xtra()
@@ -0,0 +1,386 @@
+"""Creating git-repos, and their initial commits, without running git."""
+
+import getpass
+import hashlib
+import os
+import re
+import socket
+import struct
+import sys
+import time
+import zlib
+
+from ppi import constants
+from ppi import filesystem
+
+# Branch that HEAD points to, when no other branch is asked for. Same as
+# git's own default.
+DEFAULT_BRANCH: str = "master"
+
+# Message of the initial commit.
+MESSAGE: str = "Initial commit\n"
+
+# Index entries: ctime, mtime (seconds and nanoseconds), dev, ino, mode,
+# uid, gid and size, the object id, and the flags (i.e. length of the path).
+INDEX_ENTRY: object = struct.Struct(">10I20sH")
+
+# Version of the index of the large-repo profile, which compresses the paths
+# of the entries against each other (see large_settings()).
+LARGE_INDEX_VERSION: int = 4
+
+# Things that git doesn't allow in branch names (see git-check-ref-format(1)).
+INVALID_BRANCH: object = re.compile(
+    r"^[-/]|/$|^@$|\.lock$|\.$|\.\.|//|/\.|^\.|@\{|[\x00-\x20\x7f~^:?*\[\\]"
+)
+
+
+def check_branch(branch: str) -> str:
+    """
+    Checks that branch is a valid branch name, and returns it.
+
+    Parameters:
+        branch.... Name of the branch.
+    """
+    if not branch or INVALID_BRANCH.search(branch):
+        raise ValueError(f"invalid branch name: {branch!r}")
+    return branch
+
+
+def large_settings() -> dict:
+    """
+    Gets the settings of the large-repo profile, as a dict that maps each
+    section of the config to its (key, value) pairs.
+
+    The untracked cache, fsmonitor and version 4 index make git status
+    check less of the work tree and read a smaller index, and the commit
+    graph and sparse packing speed up log, fetch and push. core.fsmonitor
+    is only set where git has a built-in file system monitor (macOS and
+    Windows), as elsewhere git would only warn about it.
+    """
+    core: list = [("untrackedCache", "true")]
+    if sys.platform in {"darwin", "win32"}:
+        core.append(("fsmonitor", "true"))
+    return {
+        "core": core,
+        "index": [("version", str(LARGE_INDEX_VERSION))],
+        "feature": [("manyFiles", "true")],
+        "fetch": [("writeCommitGraph", "true")],
+        "gc": [("writeCommitGraph", "true")],
+        "pack": [("useSparse", "true"), ("writeBitmapHashCache", "true")]
+    }
+
+
+def render_settings(settings: dict) -> str:
+    """
+    Renders sections of a config, as returned by large_settings().
+
+    Parameters:
+        settings.. Sections mapped to their (key, value) pairs.
+    """
+    return "".join(
+        f"[{section}]\n" + "".join(f"\t{key} = {value}\n"
+                                    for key, value in pairs)
+        for section, pairs in settings.items()
+    )
+
+
+def _config(large: bool=False) -> bytes:
+    """
+    Renders the config of a new repository, as git init would.
+
+    Parameters:
+        large..... Whether to add the settings of large_settings().
+    """
+    filemode: str = "true" if os.name == "posix" else "false"
+    settings: dict = {"core": [
+        ("repositoryformatversion", "0"),
+        ("filemode", filemode),
+        ("bare", "false"),
+        ("logallrefupdates", "true")
+    ]}
+    if large:
+        for section, pairs in large_settings().items():
+            settings[section] = settings.get(section, []) + pairs
+    return render_settings(settings).encode(constants.ENCODING)
+
+
+def skeleton(branch: str=DEFAULT_BRANCH, large: bool=False) -> dict:
+    """
+    Renders an empty git-repo in memory.
+
+    Returns a dict that maps the paths of the repository's files,
+    relative to the project's root, to their contents, like
+    scaffolding.generate() does. Paths that end with "/" are empty
+    directories.
+
+    Parameters:
+        branch.... Branch that HEAD points to.
+        large..... Whether to configure the repository for many files
+                   (see large_settings()).
+    """
+    return {
+        ".git/HEAD": f"ref: refs/heads/{check_branch(branch)}\n".encode(
+            constants.ENCODING
+        ),
+        ".git/config": _config(large),
+        ".git/objects/info/": b"",
+        ".git/objects/pack/": b"",
+        ".git/refs/heads/": b"",
+        ".git/refs/tags/": b""
+    }
+
+
+def _object(kind: str, body: bytes) -> tuple:
+    """
+    Creates a loose object.
+
+    Returns the object id (as bytes), and the path and contents of the
+    object's file.
+    """
+    data: bytes = f"{kind} {len(body)}\0".encode(constants.ENCODING) + body
+    oid: bytes = hashlib.sha1(data).digest()
+    name: str = oid.hex()
+    # Same compression level as git's own default for loose objects
+    return oid, f".git/objects/{name[:2]}/{name[2:]}", zlib.compress(data, 1)
+
+
+def _file_mode(content: bytes) -> int:
+    """Gets the git mode of a file, matching filesystem.file_mode()."""
+    return 0o100755 if content.startswith(b"#!") else 0o100644
+
+
+def _files(mapping: dict) -> list:
+    """Gets the files of a project that are committed, sorted like git does."""
+    return sorted(
+        (path, content) for path, content in mapping.items()
+        if not path.endswith("/") and not path.startswith(".git/")
+    )
+
+
+def _config_user() -> dict:
+    """Reads user.name and user.email from the user's global git config."""
+    config: str = os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    user: dict = {}
+    for path in (os.path.join(config, "git", "config"),
+                 os.path.expanduser("~/.gitconfig")):
+        try:
+            with open(path, "r", encoding=constants.ENCODING) as f:
+                lines: list = f.readlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        section: str = ""
+        for line in lines:
+            line = line.strip()
+            if line.startswith("["):
+                section = line.strip("[]").strip().lower()
+            elif section == "user" and "=" in line:
+                key, _, value = line.partition("=")
+                if key.strip().lower() in {"name", "email"}:
+                    user[key.strip().lower()] = value.strip().strip('"')
+    return user
+
+
+def _date(value: str) -> str:
+    """Converts a git date ("@<epoch> <tz>" or "<epoch> <tz>") to raw form."""
+    epoch, _, zone = value.strip().lstrip("@").partition(" ")
+    zone = zone.strip() or "+0000"
+    if not epoch.isdigit() or not re.fullmatch(r"[+-]\d{4}", zone):
+        raise ValueError(f"invalid date: {value!r}")
+    return f"{epoch} {zone}"
+
+
+def identity(role: str) -> str:
+    """
+    Gets the identity and date of the author or committer of a commit,
+    e.g. "Jane Doe <jane@example.com> 1600000000 +0000".
+
+    Like git, GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL and GIT_AUTHOR_DATE (or
+    GIT_COMMITTER_*) are used first, then user.name and user.email from
+    the global git config. The date defaults to SOURCE_DATE_EPOCH, and
+    then the current time.
+
+    Parameters:
+        role...... Either "author" or "committer".
+    """
+    prefix: str = f"GIT_{role.upper()}_"
+    user: dict = {}
+    if not (os.getenv(f"{prefix}NAME") and os.getenv(f"{prefix}EMAIL")):
+        user = _config_user()
+    try:
+        login: str = getpass.getuser()
+    except (KeyError, OSError):
+        login = "ppi"  # Running as a user that has no name
+    name: str = os.getenv(f"{prefix}NAME") or user.get("name") or login
+    email: str = (os.getenv(f"{prefix}EMAIL") or user.get("email")
+                  or os.getenv("EMAIL") or f"{login}@{socket.gethostname()}")
+    date: str = os.getenv(f"{prefix}DATE") or os.getenv("SOURCE_DATE_EPOCH")
+    date = _date(date) if date else f"{int(time.time())} +0000"
+    for value in (name, email):
+        if set(value) & set("<>\n"):
+            raise ValueError(f"invalid {role} identity: {value!r}")
+    return f"{name} <{email}> {date}"
+
+
+def _varint(value: int) -> bytes:
+    """Encodes value as git's offset varint, which version 4 indexes use."""
+    data: bytearray = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        value -= 1
+        data.insert(0, 0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(data)
+
+
+def render_index(files: list, stats: list=None, version: int=2) -> bytes:
+    """
+    Renders an index of files.
+
+    Parameters:
+        files..... (path, mode, object id, size) of every file, sorted by
+                   path.
+        stats..... os.stat_result of every file, for telling git that the
+                   files haven't changed since. Without them git checks
+                   the files once itself.
+        version... Version of the index: 2, or 4 for storing each path as
+                   what it doesn't share with the previous one.
+    """
+    if version not in {2, 4}:
+        raise ValueError(f"unsupported index version: {version}")
+    parts: list = [b"DIRC", struct.pack(">II", version, len(files))]
+    previous: bytes = b""
+    for index, (path, mode, oid, size) in enumerate(files):
+        times: tuple = (0, 0, 0, 0)
+        ids: tuple = (0, 0, 0, 0)
+        if stats is not None:
+            stat: object = stats[index]
+            times = (int(stat.st_ctime), stat.st_ctime_ns % 1000000000,
+                     int(stat.st_mtime), stat.st_mtime_ns % 1000000000)
+            ids = (stat.st_dev, stat.st_ino, stat.st_uid, stat.st_gid)
+        name: bytes = path.encode(constants.ENCODING)
+        parts.append(INDEX_ENTRY.pack(
+            *(value & 0xFFFFFFFF for value in times + ids[:2]),
+            mode,
+            *(value & 0xFFFFFFFF for value in ids[2:]),
+            size & 0xFFFFFFFF,
+            oid,
+            min(len(name), 0xFFF)
+        ))
+        if version == 4:
+            # Bytes to drop from the end of the previous path, and the rest
+            shared: int = len(os.path.commonprefix([previous, name]))
+            parts.append(_varint(len(previous) - shared)
+                         + name[shared:] + b"\0")
+            previous = name
+        else:
+            # Entries are padded with 1-8 NULs to a multiple of 8 bytes
+            parts.append(name + b"\0"
+                         * (8 - (INDEX_ENTRY.size + len(name)) % 8))
+    data: bytes = b"".join(parts)
+    return data + hashlib.sha1(data).digest()
+
+
+def _index_files(mapping: dict) -> list:
+    """Gets (path, mode, object id, size) of the committed files."""
+    return [
+        (path, _file_mode(content), _object("blob", content)[0], len(content))
+        for path, content in _files(mapping)
+    ]
+
+
+def initial_commit(mapping: dict, branch: str=DEFAULT_BRANCH,
+                   version: int=2) -> dict:
+    """
+    Renders the initial commit of a project in memory.
+
+    Returns a dict that maps the paths of the loose objects, the branch
+    and the index to their contents, to be added to the project along
+    with skeleton(). Every file of mapping is committed, except for the
+    git-repo itself. The index has no stat data, as the files don't exist
+    yet; see update_index().
+
+    Parameters:
+        mapping... The project's files, as returned by
+                   scaffolding.generate().
+        branch.... Branch to commit to.
+        version... Version of the index (see render_index()).
+    """
+    objects: dict = {}
+    trees: dict = {"": []}
+    for path, content in _files(mapping):
+        oid, object_path, data = _object("blob", content)
+        objects[object_path] = data
+        parts: list = path.split("/")
+        for depth in range(1, len(parts)):
+            directory: str = "/".join(parts[:depth])
+            if directory not in trees:
+                trees[directory] = []
+                trees["/".join(parts[:depth - 1])].append(
+                    (parts[depth - 1], 0o40000, directory)
+                )
+        trees["/".join(parts[:-1])].append((parts[-1], _file_mode(content), oid))
+
+    def write_tree(directory: str) -> bytes:
+        entries: list = []
+        for name, mode, value in trees[directory]:
+            if mode == 0o40000:
+                value = write_tree(value)
+            entries.append((name, mode, value))
+        # Trees sort their subtrees as if their names ended with "/"
+        entries.sort(key=lambda e: e[0] + "/" if e[1] == 0o40000 else e[0])
+        body: bytes = b"".join(
+            f"{mode:o} {name}\0".encode(constants.ENCODING) + oid
+            for name, mode, oid in entries
+        )
+        oid, object_path, data = _object("tree", body)
+        objects[object_path] = data
+        return oid
+
+    tree: bytes = write_tree("")
+    commit: bytes = "".join([
+        f"tree {tree.hex()}\n",
+        f"author {identity('author')}\n",
+        f"committer {identity('committer')}\n",
+        "\n",
+        MESSAGE
+    ]).encode(constants.ENCODING)
+    oid, object_path, data = _object("commit", commit)
+    objects[object_path] = data
+
+    return {
+        **objects,
+        f".git/refs/heads/{check_branch(branch)}": f"{oid.hex()}\n".encode(
+            constants.ENCODING
+        ),
+        ".git/index": render_index(_index_files(mapping),
+                                   version=version)
+    }
+
+
+def update_index(root: str, mapping: dict, version: int=2,
+                 durability: str="none") -> None:
+    """
+    Rewrites the index of a project written to the disk with the stat data
+    of its files, so that git status doesn't need to read the files.
+
+    Parameters:
+        root...... The project's root.
+        mapping... The project's files, as returned by
+                   scaffolding.generate().
+        version... Version of the index (see render_index()).
+        durability One of constants.DURABILITY; with anything but "none",
+                   the new index and its rename are fsynced, so that a
+                   crash can't leave the commit with a truncated index.
+    """
+    files: list = _index_files(mapping)
+    stats: list = [os.lstat(os.path.join(root, path)) for path, *_ in files]
+    git: str = os.path.join(root, ".git")
+    lock: str = os.path.join(git, "index.lock")
+    synced: bool = durability != "none"
+    filesystem.write_fd(
+        os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666),
+        render_index(files, stats, version), "each" if synced else "none"
+    )
+    os.replace(lock, os.path.join(git, "index"))
+    if synced:
+        filesystem.fsync_path(git)
@@ -0,0 +1,389 @@
+"""Creating whole projects out of the individual writers."""
+
+import os
+import subprocess
+
+from ppi import constants
+from ppi import filesystem
+from ppi import locking
+from ppi import repository
+from ppi import scheduling
+from ppi import store as store_
+from ppi import tracing
+from ppi import writers
+
+# Writers of create_writers() that only projects created with perf get.
+PERF_WRITERS: tuple = ("bench_init", "bench_runner", "bench_sample")
+
+
+def create_writers() -> dict:
+    """
+    Creates one instance of every writer needed for a project.
+
+    The instances can be reused for as many projects as needed; only the
+    type hint switches are changed between the projects. Files are
+    written in the order of the returned dict. A project gets either
+    pyproject.toml or setup.py, not both, and the benchmarks only with
+    perf (see generate()).
+    """
+    return {
+        "directory": writers.DirectoryWriter(),
+        "readme": writers.ReadMeWriter(),
+        "changelog": writers.ChangeLogWriter(),
+        "manifest": writers.ManifestWriter(),
+        "pyproject": writers.PyProjectWriter(),
+        "setup": writers.SetupPyWriter(),
+        "makefile": writers.MakefileWriter(),
+        "manpage": writers.ManPageWriter(),
+        "init": writers.DunderInitWriter(),
+        "main": writers.MainWriter(),
+        "bench_init": writers.BenchInitWriter(),
+        "bench_runner": writers.BenchRunnerWriter(),
+        "bench_sample": writers.BenchSampleWriter(),
+        "gitignore": writers.GitIgnoreWriter()
+    }
+
+
+def generate(name: str, *, annotate: bool=False, files: dict=None,
+             git: bool=False, branch: str=None, commit: bool=False,
+             lock: bool=False, setup_py: bool=False,
+             perf: bool=False, large_repo: bool=False) -> dict:
+    """
+    Renders a project in memory, without touching the disk.
+
+    Returns a dict (in the order the files would be written) that maps
+    each file's path, relative to the project's root, to its contents.
+    Paths that end with "/" are empty directories.
+
+    Parameters:
+        name...... Name of the project.
+        annotate.. Whether to render Python files with type hints.
+        files..... Writers to use, as returned by create_writers(). New
+                   ones are created if not given.
+        git....... Whether to include an empty git-repo in the project.
+        branch.... Initial branch of the git-repo. Defaults to
+                   repository.DEFAULT_BRANCH.
+        commit.... Whether to include an initial commit of the project in
+                   the git-repo (implies git).
+        lock...... Whether to include a lock file (see locking), which
+                   --update needs.
+        setup_py.. Whether to include an executable setup.py instead of
+                   pyproject.toml with static metadata.
+        perf...... Whether to include a benchmarks/ package, make targets
+                   for benchmarking and profiling, and a hook for timing
+                   the startup in main.py.
+        large_repo Whether to configure the git-repo for many files (see
+                   repository.large_settings()), and to ignore the caches
+                   of the tools with patterns anchored to the root.
+    """
+    if not name or "/" in name or name in {".", ".."}:
+        raise ValueError(f"invalid project name: {name!r}")
+    if files is None:
+        files = create_writers()
+
+    # Setup writers to render files in desired way
+    for key in ("setup", "main", *PERF_WRITERS):
+        files[key].switch.annotations = annotate
+    for key in ("makefile", "main", "gitignore"):
+        files[key].perf = perf
+    files["gitignore"].large_repo = large_repo
+
+    tracer: object = tracing.tracer
+    mapping: dict = {}
+    skipped: set = {"pyproject" if setup_py else "setup"}
+    if not perf:
+        skipped.update(PERF_WRITERS)
+    for key, writer in files.items():
+        if not writer.output or key in skipped:
+            continue
+        start: int = tracer.now() if tracer is not None else 0
+        path: str = writer.output.format(project=name)
+        mapping[path] = writer.render(name)
+        if tracer is not None:
+            tracer.complete("render", "render", start, path=path,
+                            writer=type(writer).__name__,
+                            bytes=len(mapping[path]))
+    if lock:
+        mapping[locking.LOCK_NAME] = locking.render(mapping)
+    branch = branch or repository.DEFAULT_BRANCH
+    if git or commit:
+        with tracing.span("git skeleton", "git", branch=branch):
+            mapping.update(repository.skeleton(branch, large_repo))
+    if commit:
+        with tracing.span("initial commit", "git", branch=branch):
+            mapping.update(repository.initial_commit(
+                mapping, branch, _index_version(large_repo)
+            ))
+    return mapping
+
+
+class MaterializeError(OSError):
+    """Raised when some of the files of a project couldn't be written."""
+
+    def __init__(self, errors: dict) -> None:
+        """
+        Initializes MaterializeError.
+
+        Parameters:
+            errors.... Paths mapped to the exceptions writing them raised.
+        """
+        self.errors: dict = errors
+        super().__init__("; ".join(
+            f"{path}: {error}" for path, error in errors.items()
+        ))
+
+
+def plan(scheduler: object, mapping: dict, root: str,
+         durability: str="none", store: object=None,
+         labels: dict=None) -> None:
+    """
+    Adds tasks for writing the files of mapping under root to scheduler.
+
+    Every directory is a task of its own, and each file or directory
+    requires the directory it goes to. The tasks are named after the
+    paths they write, relative to root; root itself is named "". Paths
+    in mapping that end with "/" are empty directories.
+
+    Parameters:
+        scheduler. Scheduler to add the tasks to.
+        mapping... Relative paths mapped to the contents of the files.
+        root...... Directory where to write the files.
+        durability One of constants.DURABILITY.
+        store..... store.Store to share the files' storage with, if any.
+        labels.... Paths mapped to the names of the writers that rendered
+                   them, for tracing.
+    """
+    labels = labels or {}
+    directory: object = writers.DirectoryWriter()
+    traced: object = _traced if tracing.tracer is not None else _untraced
+    scheduler.add("", traced(lambda: directory.write(root), "mkdir", path=""))
+    for path, content in mapping.items():
+        parts: list = path.split("/")
+        if path.startswith("/") or ".." in parts:
+            raise ValueError(f"path outside of the project: {path!r}")
+        for depth in range(1, len(parts)):
+            parent: str = "/".join(parts[:depth])
+            if parent not in scheduler.tasks:
+                scheduler.add(
+                    parent,
+                    traced(lambda parent=parent: directory.write(
+                        os.path.join(root, parent)
+                    ), "mkdir", path=parent),
+                    requires=("/".join(parts[:depth - 1]),)
+                )
+        if not parts[-1]:
+            continue  # An empty directory, which has a task already
+        scheduler.add(
+            path,
+            traced(lambda path=path, content=content: filesystem.write_file(
+                os.path.join(root, path), content, durability, store=store
+            ), "write", path=path, bytes=len(content),
+                writer=labels.get(path, "")),
+            requires=("/".join(parts[:-1]),)
+        )
+
+
+def _untraced(function: object, name: str, **args: object) -> object:
+    """Gets function as it is, for plan() when tracing is off."""
+    return function
+
+
+def _traced(function: object, name: str, **args: object) -> object:
+    """Gets a function that records a "file" span around function."""
+    def traced() -> object:
+        with tracing.span(name, "file", **args):
+            return function()
+    return traced
+
+
+def _raise_errors(results: dict) -> None:
+    """Raises MaterializeError if any of the tasks failed."""
+    errors: dict = {
+        name or ".": error for name, error in results.items()
+        if error is not None
+    }
+    if errors:
+        raise MaterializeError(errors)
+
+
+def _build(mapping: dict, root: str, width: int, durability: str,
+           tasks: dict, store: object=None, labels: dict=None) -> None:
+    """
+    Writes mapping to a staging directory next to root, runs the extra
+    tasks there, and publishes the result to root.
+
+    With a width of 1, the files are written in one pass relative to the
+    staging directory (see filesystem.write_tree()); otherwise every file
+    and directory is a task of its own (see plan()). Nothing is published
+    if any of the tasks fail, and the staging directory is always
+    removed, so root never ends up half-written.
+
+    Parameters:
+        mapping... Relative paths mapped to the contents of the files.
+        root...... Directory to publish the files to.
+        width..... How many files may be written at the same time.
+        durability One of constants.DURABILITY.
+        tasks..... Extra tasks to run after the project's root has been
+                   created; names mapped to functions that are called
+                   with the path of the staging directory.
+        store..... store.Store to share the files' storage with, if any.
+        labels.... Paths mapped to the names of the writers that rendered
+                   them, for tracing.
+    """
+    if durability not in constants.DURABILITY:
+        raise ValueError(f"invalid durability: {durability!r}")
+    staging: str = filesystem.make_staging(root)
+    try:
+        scheduler: object = scheduling.Scheduler(width)
+        results: dict = {}
+        requires: tuple = ()
+        if scheduler.width == 1:
+            results = filesystem.write_tree(staging, mapping, durability,
+                                            store, labels)
+        else:
+            plan(scheduler, mapping, staging, durability, store, labels)
+            requires = ("",)
+        for name, function in tasks.items():
+            scheduler.add(name, lambda f=function: f(staging), requires=requires)
+        results.update(scheduler.run())
+        _raise_errors(results)
+        with tracing.span("sync", "publish", durability=durability):
+            filesystem.sync_tree(staging, durability)
+        with tracing.span("publish", "publish", path=root):
+            filesystem.publish(staging, root, durability)
+    finally:
+        filesystem.discard(staging)
+
+
+def materialize(mapping: dict, root: str, width: int=1,
+                durability: str="none", store: object=None) -> None:
+    """
+    Writes files rendered by generate() under root.
+
+    The files are first written to a staging directory next to root,
+    which is then renamed to root, so that root appears at once and
+    complete. Raises MaterializeError, which tells the error of each
+    file that couldn't be written, if writing any of them fails.
+
+    Parameters:
+        mapping... Relative paths mapped to the contents of the files.
+        root...... Directory where to write the files.
+        width..... How many files may be written at the same time.
+        durability One of constants.DURABILITY: "none", "batch" or "each".
+        store..... store.Store to share the files' storage with, if any.
+    """
+    _build(mapping, root, width, durability, {}, store)
+
+
+def _labels(project: str, files: dict, mapping: dict) -> dict:
+    """
+    Maps each path of mapping to the name of the writer that rendered it,
+    or of the module that did, for tracing.
+    """
+    names: dict = {
+        writer.output.format(project=project): type(writer).__name__
+        for writer in files.values() if writer.output
+    }
+    return {
+        path: names.get(path) or ("repository" if path.startswith(".git/")
+                                  else "locking")
+        for path in mapping
+    }
+
+
+def _index_version(large_repo: bool) -> int:
+    """Gets the version of the index of a git-repo written by ppi."""
+    return repository.LARGE_INDEX_VERSION if large_repo else 2
+
+
+def _git_init(root: str, branch: str=None, large_repo: bool=False) -> None:
+    """Initializes root as a git-repo by running git init."""
+    options: list = []
+    if branch:
+        options.append(f"--initial-branch={repository.check_branch(branch)}")
+    with tracing.span("git init", "git", path=root):
+        subprocess.run(["git", "init", "--quiet", *options, f"{root}/"],
+                       check=True)
+        if large_repo:
+            # Appended instead of running git config for each setting
+            with open(os.path.join(root, ".git", "config"), "a",
+                      encoding=constants.ENCODING) as f:
+                f.write(repository.render_settings(
+                    repository.large_settings()
+                ))
+
+
+def scaffold(project: str, files: dict, annotate: bool=False,
+             git: bool=False, directory: str=".", width: int=1,
+             durability: str="none", branch: str=None,
+             system_git: bool=False, commit: bool=False,
+             update: bool=False, dedupe: str="",
+             setup_py: bool=False, perf: bool=False,
+             large_repo: bool=False) -> list:
+    """
+    Writes a new project to the disk, with a lock file.
+
+    The project is built in a staging directory and published with
+    a single rename (see materialize()). Raises MaterializeError, telling
+    what went wrong with each file (and the git-repo), instead of exiting,
+    so that the caller can decide what to do with the error.
+
+    Parameters:
+        project... Name of the project to create.
+        files..... Writers to use, as returned by create_writers().
+        annotate.. Whether to write Python files with type hints.
+        git....... Whether to initialize the project as a git-repo.
+        directory. Directory where to create the project.
+        width..... How many files may be written at the same time.
+        durability One of constants.DURABILITY: "none", "batch" or "each".
+        branch.... Initial branch of the git-repo.
+        system_git Whether to initialize the git-repo by running git init,
+                   instead of writing it along with the other files.
+        commit.... Whether to commit the project's files to the git-repo
+                   (implies git). Can't be used with system_git.
+        update.... Whether to write only the files that have changed, and
+                   that haven't been edited, if the project exists already
+                   (see locking.changes()). Returns the paths of the files
+                   that were kept because they have been edited.
+        dedupe.... One of constants.DEDUPE, to share the storage of the
+                   files with other projects through store.Store.
+        setup_py.. Whether to write an executable setup.py instead of
+                   pyproject.toml.
+        perf...... Whether to write the performance tooling too (see
+                   generate()).
+        large_repo Whether to configure the git-repo for many files, and
+                   to ignore the caches of the tools (see generate()).
+    """
+    root: str = os.path.join(directory, project)
+    if os.path.exists(os.path.join(root, ".git")):
+        # Never overwrite the HEAD, config or index of an existing repo
+        if commit:
+            raise ValueError(f"{root}: already a git-repo")
+        git = git and system_git
+    if commit and system_git:
+        raise ValueError("initial commit needs the git-repo written by ppi")
+
+    tasks: dict = {}
+    if git and system_git:
+        tasks[".git"] = lambda root: _git_init(root, branch, large_repo)
+    with tracing.span("scaffold", "project", project=project):
+        mapping: dict = generate(project, annotate=annotate, files=files,
+                                 git=git and not system_git, branch=branch,
+                                 commit=commit, lock=True, setup_py=setup_py,
+                                 perf=perf, large_repo=large_repo)
+        kept: list = []
+        changed: dict = mapping
+        if update:
+            with tracing.span("changes", "lock", path=root):
+                changed, kept = locking.changes(root, mapping)
+        if changed or tasks:
+            _build(changed, root, width, durability, tasks,
+                   store_.Store(mode=dedupe) if dedupe else None,
+                   _labels(project, files, changed)
+                   if tracing.tracer is not None else None)
+        if commit:
+            with tracing.span("update index", "git", path=root):
+                repository.update_index(root, mapping,
+                                        _index_version(large_repo),
+                                        durability)
+    return kept
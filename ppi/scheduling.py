@@ -0,0 +1,132 @@
+"""Running tasks that depend on each other, optionally in parallel."""
+
+import concurrent.futures
+
+
+class PrerequisiteError(Exception):
+    """Raised (as a result) for tasks whose prerequisites failed."""
+
+
+class Task:
+    """A function to run, and the names of the tasks it needs to run after."""
+
+    def __init__(self, name: str, function: object, requires: tuple) -> None:
+        """
+        Initializes Task.
+
+        Parameters:
+            name...... Unique name of the task, e.g. the path it writes.
+            function.. Function to run, called without arguments.
+            requires.. Names of the tasks that must succeed first.
+        """
+        self.name: str = name
+        self.function: object = function
+        self.requires: tuple = requires
+
+
+class Scheduler:
+    """
+    Class for running a graph of tasks on a pool of threads.
+
+    Tasks must be added after the tasks they require, so the graph can't
+    have cycles, and running it with a width of 1 runs the tasks in the
+    order they were added.
+    """
+
+    def __init__(self, width: int=1) -> None:
+        """
+        Initializes Scheduler.
+
+        Parameters:
+            width..... How many tasks may run at the same time.
+        """
+        self.width: int = max(width, 1)
+        self.tasks: dict = {}
+
+    def add(self, name: str, function: object, requires: tuple=()) -> None:
+        """
+        Adds a task to the graph.
+
+        Parameters:
+            name...... Unique name of the task, e.g. the path it writes.
+            function.. Function to run, called without arguments.
+            requires.. Names of the (already added) tasks that must succeed
+                       before this one is run.
+        """
+        if name in self.tasks:
+            raise ValueError(f"task already added: {name!r}")
+        for requirement in requires:
+            if requirement not in self.tasks:
+                raise ValueError(f"unknown prerequisite: {requirement!r}")
+        self.tasks[name] = Task(name, function, tuple(requires))
+
+    def _failed_requirement(self, task: Task, results: dict) -> object:
+        """Gets an error for task if any of its prerequisites failed."""
+        for requirement in task.requires:
+            if results[requirement] is not None:
+                return PrerequisiteError(f"{requirement}: prerequisite failed")
+        return None
+
+    def _run_serial(self, results: dict) -> None:
+        """Runs the tasks one by one, in the order they were added."""
+        for task in self.tasks.values():
+            error: object = self._failed_requirement(task, results)
+            if error is None:
+                try:
+                    task.function()
+                except Exception as exception:
+                    error = exception
+            results[task.name] = error
+
+    def _run_parallel(self, results: dict) -> None:
+        """Runs every task as soon as its prerequisites have succeeded."""
+        waiting: dict = {name: len(task.requires)
+                         for name, task in self.tasks.items()}
+        dependents: dict = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for requirement in task.requires:
+                dependents[requirement].append(task.name)
+
+        with concurrent.futures.ThreadPoolExecutor(self.width) as executor:
+            running: dict = {}
+
+            def finish(name: str, error: object) -> None:
+                results[name] = error
+                for dependent in dependents[name]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        start(self.tasks[dependent])
+
+            def start(task: Task) -> None:
+                error: object = self._failed_requirement(task, results)
+                if error is not None:
+                    finish(task.name, error)
+                else:
+                    running[executor.submit(task.function)] = task.name
+
+            for task in list(self.tasks.values()):
+                if not task.requires:
+                    start(task)
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    finish(running.pop(future), future.exception())
+
+    def run(self) -> dict:
+        """
+        Runs all the tasks.
+
+        Returns a dict that maps the name of every task to the exception
+        it raised, or None if it succeeded, in the order the tasks were
+        added. Tasks whose prerequisites failed aren't run, and get
+        a PrerequisiteError instead.
+        """
+        results: dict = {}
+        if self.width == 1:
+            self._run_serial(results)
+        else:
+            self._run_parallel(results)
+        return {name: results[name] for name in self.tasks}
@@ -0,0 +1,192 @@
+"""Running ppi as a daemon that serves command lines over a Unix socket."""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import traceback
+
+from ppi import client
+from ppi import constants
+
+
+def preload() -> None:
+    """Imports and warms up everything that creating projects needs."""
+    # archiving and batch are imported only to have them loaded already
+    from ppi import archiving
+    from ppi import batch
+    from ppi import main
+    from ppi import scaffolding
+
+    for annotate in (False, True):
+        scaffolding.generate(main.__program__, annotate=annotate)
+    # The templates that only some of the options use
+    scaffolding.generate(main.__program__, setup_py=True, perf=True)
+
+
+@contextlib.contextmanager
+def _context(request: dict) -> object:
+    """
+    Runs the body in the client's working directory, environment and umask,
+    with the standard streams redirected to buffers, and restores all of
+    them afterwards.
+
+    Yields the buffers of stdout and stderr.
+    """
+    cwd: str = os.getcwd()
+    environ: dict = dict(os.environ)
+    streams: tuple = (sys.stdin, sys.stdout, sys.stderr)
+    stdout: object = io.BytesIO()
+    stderr: object = io.BytesIO()
+    umask: int = os.umask(request.get("umask", 0o022))
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        sys.stdin = io.TextIOWrapper(
+            io.BytesIO(client.encode(request.get("stdin", ""))),
+            encoding=constants.ENCODING
+        )
+        sys.stdout = io.TextIOWrapper(stdout, encoding=constants.ENCODING,
+                                      write_through=True)
+        sys.stderr = io.TextIOWrapper(stderr, encoding=constants.ENCODING,
+                                      write_through=True)
+        yield stdout, stderr
+    finally:
+        # Detached, so that the buffers aren't closed with the wrappers
+        for wrapper in (sys.stdin, sys.stdout, sys.stderr):
+            if wrapper not in streams:
+                wrapper.detach()
+        sys.stdin, sys.stdout, sys.stderr = streams
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+        os.umask(umask)
+
+
+def handle(request: dict) -> dict:
+    """
+    Runs a command line of a client, as if ppi was run by the client.
+
+    Returns the response to send to the client (see client.request()).
+
+    Parameters:
+        request... Request from the client (see client.request()).
+    """
+    from ppi import batch
+    from ppi import main
+
+    # The writers of batch are created again, so that the dates of the
+    # man-pages are today's and not the day when the daemon started
+    batch._files.clear()
+    status: int = constants.EXIT_SUCCESS
+    with _context(request) as (stdout, stderr):
+        try:
+            main.main(len(request["argv"]), request["argv"])
+        except SystemExit as exit_:
+            if exit_.code is None or isinstance(exit_.code, int):
+                status = exit_.code or constants.EXIT_SUCCESS
+            else:
+                print(exit_.code, file=sys.stderr)
+                status = constants.EXIT_ERROR
+        except Exception:
+            traceback.print_exc()
+            status = constants.EXIT_ERROR
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+    return {
+        "status": status,
+        "stdout": client.decode(stdout.getvalue()),
+        "stderr": client.decode(stderr.getvalue())
+    }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one request: a JSON line in, a JSON line out."""
+
+    def handle(self) -> None:
+        """Reads the request, runs it, and writes the response."""
+        try:
+            request: dict = json.loads(self.rfile.readline())
+            if not isinstance(request.get("argv"), list) or "cwd" not in request:
+                raise ValueError("'argv' and 'cwd' are required")
+        except (ValueError, AttributeError) as error:
+            response: dict = {
+                "status": constants.EXIT_ERROR,
+                "stdout": "",
+                "stderr": f"invalid request: {error}\n"
+            }
+        else:
+            response = handle(request)
+        self.wfile.write(json.dumps(response).encode(constants.ENCODING) + b"\n")
+
+
+class Server(socketserver.UnixStreamServer):
+    """Serves the requests one at a time, in the daemon's own process."""
+
+
+class ForkingServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Serves every request in a process of its own, forked from the daemon."""
+
+
+def _remove_stale(path: str) -> None:
+    """Removes a socket left behind by a daemon that is no longer running."""
+    try:
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(f"{path}: a daemon is already listening")
+
+
+def make_server(path: str, fork: bool=False) -> object:
+    """
+    Creates a server listening on a Unix socket, with ppi preloaded.
+
+    Only the user running the daemon may connect to the socket.
+
+    Parameters:
+        path...... Path of the socket.
+        fork...... Whether to serve every request in a forked process, so
+                   that the requests can't affect each other (or the
+                   daemon), and can be served at the same time.
+    """
+    preload()
+    _remove_stale(path)
+    umask: int = os.umask(0o177)
+    try:
+        return (ForkingServer if fork else Server)(path, RequestHandler)
+    finally:
+        os.umask(umask)
+
+
+def serve(path: str, fork: bool=False) -> None:
+    """
+    Serves requests until the daemon is interrupted or terminated.
+
+    Parameters:
+        path...... Path of the socket.
+        fork...... Whether to serve every request in a forked process.
+    """
+    server: object = make_server(path, fork)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
@@ -0,0 +1,150 @@
+"""Content-addressed store of rendered files, for deduplicating projects."""
+
+import errno
+import hashlib
+import os
+import threading
+
+from ppi import constants
+from ppi import filesystem
+
+# ioctl(2) that clones a file's extents into another file (see
+# ioctl_ficlone(2)); _IOW(0x94, 9, int) from linux/fs.h.
+FICLONE: int = 0x40049409
+
+# Errors that mean a hard link can't be made to the store, e.g. because
+# it's on another file system.
+LINK_ERRORS: set = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+
+def _store_dir() -> str:
+    """Gets the default directory of the store."""
+    cache: str = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache, "ppi", "store")
+
+
+class Store:
+    """
+    Class for creating files that share their storage with a copy kept in
+    a store, keyed by the hash of their contents.
+
+    Files are cloned from the store with FICLONE if the file system
+    supports it, and copied with copy_file_range(2) (which some file
+    systems do without copying the data) otherwise, or hard linked to the
+    store. Each method that fails is skipped for the rest of the files.
+    Files in the store are never changed after they have been added, and
+    the store can be removed at any time.
+    """
+
+    def __init__(self, directory: str=None, mode: str="reflink") -> None:
+        """
+        Initializes Store.
+
+        Parameters:
+            directory. Directory of the store. Defaults to
+                       ~/.cache/ppi/store.
+            mode...... One of constants.DEDUPE.
+        """
+        if mode not in constants.DEDUPE:
+            raise ValueError(f"invalid dedupe mode: {mode!r}")
+        self.directory: str = directory or _store_dir()
+        self.mode: str = mode
+        self._blobs: dict = {}
+        self._link: bool = mode == "hardlink"
+        self._clone: bool = True
+        self._copy_range: bool = hasattr(os, "copy_file_range")
+
+    def blob(self, content: bytes) -> str:
+        """
+        Adds content to the store, unless it's there already, and returns
+        the path of the stored file.
+
+        Stored files are read-only, written atomically and fsynced, as
+        a broken file would break every project created from it.
+
+        Parameters:
+            content... Contents of the file.
+        """
+        key: str = hashlib.sha256(content).hexdigest()
+        if key in self._blobs:
+            return self._blobs[key]
+        path: str = os.path.join(self.directory, key[:2], key[2:])
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary: str = f"{path}.{os.getpid()}.{threading.get_ident()}"
+            filesystem.write_fd(
+                os.open(temporary, filesystem.CREATE_FLAGS,
+                        filesystem.file_mode(content) & 0o555),
+                content,
+                "each"
+            )
+            os.replace(temporary, path)
+        self._blobs[key] = path
+        return path
+
+    def _fill(self, fd: int, source: str, content: bytes) -> None:
+        """Fills an empty file from the stored copy of content."""
+        source_fd: int = os.open(source, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        try:
+            if self._clone:
+                try:
+                    import fcntl
+
+                    fcntl.ioctl(fd, FICLONE, source_fd)
+                    return
+                except (ImportError, OSError):
+                    self._clone = False
+            if self._copy_range:
+                try:
+                    copied: int = 0
+                    while copied < len(content):
+                        count: int = os.copy_file_range(
+                            source_fd, fd, len(content) - copied
+                        )
+                        if count == 0:
+                            break
+                        copied += count
+                    if copied == len(content):
+                        return
+                except OSError:
+                    pass
+                self._copy_range = False
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+            view: object = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(source_fd)
+
+    def create(self, path: str, content: bytes, durability: str="none",
+               dir_fd: int=None) -> None:
+        """
+        Creates a new file at path, sharing its storage with the store.
+
+        Parameters:
+            path...... Path of the file.
+            content... Contents of the file.
+            durability One of constants.DURABILITY; the file is fsynced with
+                       "each".
+            dir_fd.... Directory that path is relative to, if not the
+                       current one.
+        """
+        source: str = self.blob(content)
+        if self._link:
+            try:
+                os.link(source, path, dst_dir_fd=dir_fd)
+                return
+            except OSError as error:
+                if error.errno not in LINK_ERRORS:
+                    raise
+                self._link = False
+
+        fd: int = os.open(path, filesystem.CREATE_FLAGS,
+                          filesystem.file_mode(content), dir_fd=dir_fd)
+        try:
+            self._fill(fd, source, content)
+            if durability == "each":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
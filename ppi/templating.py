@@ -0,0 +1,306 @@
+"""Templates that the project files are rendered from."""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import re
+import struct
+
+from ppi import __version__
+from ppi import constants
+
+# Templates that come with ppi. Templates with the same name in the user's
+# template directory (see TemplateLoader) are used instead of these.
+BUILTIN_DIR: str = os.path.join(os.path.dirname(__file__), "templates")
+
+# Template tags: "{{ variable }}", "{{ variable|filter }}", "{% if variable %}",
+# "{% if not variable %}", "{% else %}" and "{% endif %}". A "{% ... %}" tag
+# that is alone on its line is removed together with the line.
+TAG: object = re.compile(
+    r"^[ \t]*(\{%.*?%\})[ \t]*\n|(\{\{.*?\}\}|\{%.*?%\})",
+    re.MULTILINE
+)
+
+# Filters that can be applied to variables, mapped to str methods.
+FILTERS: dict = {"upper": "upper", "lower": "lower"}
+
+# Header of the cached templates: Python's bytecode magic number, the
+# fingerprint of the compiler (see _fingerprint()), and the source's mtime
+# and size when it was compiled.
+HEADER: object = struct.Struct("<4s20sQQ")
+
+# Fingerprint of the compiler, computed once per process.
+_compiler: bytes = b""
+
+
+class TemplateError(ValueError):
+    """Raised when a template can't be found or compiled."""
+
+
+def _variable(name: str, filename: str) -> str:
+    """Checks that name is a valid variable name and returns its repr."""
+    if not name.isidentifier():
+        raise TemplateError(f"{filename}: invalid variable name '{name}'")
+    return repr(name)
+
+
+def compile_template(source: str, filename: str="<template>") -> object:
+    """
+    Compiles a template into a Python code object.
+
+    Executing the code object defines a function render(context, encoding),
+    which returns the rendered template as bytes. The static parts of the
+    template are stored in the code object already encoded, so rendering
+    only needs to encode the variables and join the parts.
+
+    Parameters:
+        source.... Contents of the template.
+        filename.. Name of the template, used in error messages.
+    """
+    lines: list = [
+        "def render(context, encoding):",
+        "    parts = []",
+        "    append = parts.append"
+    ]
+    blocks: list = []
+    position: int = 0
+
+    def emit(line: str) -> None:
+        lines.append("    " * (len(blocks) + 1) + line)
+
+    for match in TAG.finditer(source):
+        text: str = source[position:match.start()]
+        if text:
+            emit(f"append({text.encode(constants.ENCODING)!r})")
+        position = match.end()
+
+        tag: str = match.group(1) or match.group(2)
+        if tag.startswith("{{"):
+            name, _, filter_ = tag[2:-2].strip().partition("|")
+            expression: str = f"str(context[{_variable(name, filename)}])"
+            if filter_:
+                if filter_ not in FILTERS:
+                    raise TemplateError(f"{filename}: unknown filter '{filter_}'")
+                expression = f"{expression}.{FILTERS[filter_]}()"
+            emit(f"append({expression}.encode(encoding))")
+            continue
+
+        words: list = tag[2:-2].split()
+        if words[:1] == ["if"] and len(words) in {2, 3}:
+            negate: str = ""
+            if len(words) == 3:
+                if words[1] != "not":
+                    raise TemplateError(f"{filename}: invalid tag '{tag}'")
+                negate = "not "
+            emit(f"if {negate}context[{_variable(words[-1], filename)}]:")
+            blocks.append("if")
+            emit("pass")
+        elif words == ["else"] and blocks and blocks[-1] == "if":
+            blocks[-1] = "else"
+            lines.append("    " * len(blocks) + "else:")
+            emit("pass")
+        elif words == ["endif"] and blocks:
+            blocks.pop()
+        else:
+            raise TemplateError(f"{filename}: unexpected tag '{tag}'")
+
+    if blocks:
+        raise TemplateError(f"{filename}: missing '{{% endif %}}'")
+    text = source[position:]
+    if text:
+        emit(f"append({text.encode(constants.ENCODING)!r})")
+    emit("return b''.join(parts)")
+    return compile("\n".join(lines) + "\n", filename, "exec")
+
+
+def _fingerprint() -> bytes:
+    """
+    Gets a fingerprint of ppi's version and of the code of the compiler, so
+    that templates cached by another version of ppi are compiled again,
+    even if they haven't changed themselves.
+    """
+    global _compiler
+    if not _compiler:
+        digest: object = hashlib.sha1(__version__.encode(constants.ENCODING))
+        for function in (compile_template, _variable):
+            digest.update(marshal.dumps(function.__code__))
+        digest.update(repr((TAG.pattern, FILTERS, constants.ENCODING))
+                      .encode(constants.ENCODING))
+        _compiler = digest.digest()
+    return _compiler
+
+
+def _stamp(path: str) -> tuple:
+    """Gets the mtime and size of path, or None if it's gone."""
+    try:
+        stat: object = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _user_dir() -> str:
+    """Gets the directory for the user's own templates."""
+    config: str = os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config, "ppi", "templates")
+
+
+def _cache_dir() -> str:
+    """Gets the directory for the compiled templates."""
+    cache: str = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache, "ppi", "templates")
+
+
+class TemplateLoader:
+    """Class for finding, compiling and caching templates."""
+
+    def __init__(self, search_path: list=None, cache_dir: str=None) -> None:
+        """
+        Initializes TemplateLoader.
+
+        Parameters:
+            search_path... Directories to search templates from, in order.
+                           Defaults to ~/.config/ppi/templates and then the
+                           built-in templates.
+            cache_dir..... Directory for the compiled templates. Defaults
+                           to ~/.cache/ppi/templates. An empty string
+                           disables the on-disk cache.
+        """
+        if search_path is None:
+            search_path = [_user_dir(), BUILTIN_DIR]
+        if cache_dir is None:
+            cache_dir = _cache_dir()
+        self.search_path: list = search_path
+        self.cache_dir: str = cache_dir
+        self._templates: dict = {}
+
+    def find(self, name: str) -> str:
+        """
+        Finds the path of a template.
+
+        Parameters:
+            name...... Name of the template, e.g. "main.py.tmpl".
+        """
+        for directory in self.search_path:
+            path: str = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+        raise TemplateError(f"template not found: '{name}'")
+
+    def _cache_path(self, path: str) -> str:
+        """Gets the path of the compiled template of path."""
+        key: str = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _load_cached(self, path: str, stat: object) -> object:
+        """Gets the cached code object of path, if it's still valid."""
+        try:
+            with open(self._cache_path(path), "rb") as f:
+                data: bytes = f.read()
+            header: tuple = HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if header != (importlib.util.MAGIC_NUMBER, _fingerprint(),
+                      stat.st_mtime_ns, stat.st_size):
+            return None
+        try:
+            return marshal.loads(data[HEADER.size:])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _store_cached(self, path: str, stat: object, code: object) -> None:
+        """Caches the code object of path; failing to do so is not an error."""
+        cache_path: str = self._cache_path(path)
+        temporary: str = f"{cache_path}.{os.getpid()}"
+        data: bytes = HEADER.pack(
+            importlib.util.MAGIC_NUMBER, _fingerprint(), stat.st_mtime_ns,
+            stat.st_size
+        ) + marshal.dumps(code)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, cache_path)
+        except OSError:
+            pass
+
+    def load(self, name: str) -> object:
+        """
+        Gets the render function of a template.
+
+        Templates are compiled only when they have changed since they
+        were cached, and loaded only once per process, except that the
+        templates that aren't built in are loaded again when they change.
+
+        Parameters:
+            name...... Name of the template, e.g. "main.py.tmpl".
+        """
+        loaded: tuple = self._templates.get(name)
+        if loaded is not None and (loaded[1] is None
+                                   or loaded[1] == _stamp(loaded[0])):
+            return loaded[2]
+
+        path: str = self.find(name)
+        stat: object = os.stat(path)
+        code: object = None
+        if self.cache_dir:
+            code = self._load_cached(path, stat)
+        if code is None:
+            with open(path, "r", encoding=constants.ENCODING) as f:
+                code = compile_template(f.read(), path)
+            if self.cache_dir:
+                self._store_cached(path, stat, code)
+
+        namespace: dict = {}
+        exec(code, namespace)
+        builtin: bool = os.path.dirname(path) == BUILTIN_DIR
+        self._templates[name] = (
+            path, None if builtin else (stat.st_mtime_ns, stat.st_size),
+            namespace["render"]
+        )
+        return namespace["render"]
+
+    def render(self, name: str, context: dict) -> bytes:
+        """
+        Renders a template.
+
+        Parameters:
+            name...... Name of the template, e.g. "main.py.tmpl".
+            context... Values of the template's variables.
+        """
+        return self.load(name)(context, constants.ENCODING)
+
+
+# Loader used by the writers, created when it's first needed, and what it
+# was created for (see _loader_key()).
+_loader: object = None
+_key: tuple = None
+
+
+def _loader_key() -> tuple:
+    """
+    Gets what the default loader depends on: the user's template and cache
+    directories, which come from the environment, and the mtime of the
+    template directory, which changes when templates are added or removed.
+    A daemon serves requests with different environments, so the loader
+    is created again when any of them changes.
+    """
+    user_dir: str = _user_dir()
+    return user_dir, _cache_dir(), _stamp(user_dir)
+
+
+def render(name: str, context: dict) -> bytes:
+    """
+    Renders a template with the default TemplateLoader.
+
+    Parameters:
+        name...... Name of the template, e.g. "main.py.tmpl".
+        context... Values of the template's variables.
+    """
+    global _loader, _key
+    key: tuple = _loader_key()
+    if _loader is None or key != _key:
+        _loader = TemplateLoader()
+        _key = key
+    return _loader.render(name, context)
@@ -1,9 +1,8 @@
 """Help and info texts etc."""
 
 import abc
-import colorama
 import sys
-from ppi import constants
+from ppi import messages
 
 
 class Text(abc.ABC):
@@ -33,22 +32,7 @@ class HelpText(Text):
             program... Program's name which some fields need in the text output.
             language.. Language in which to display text.
         """
-        if language == constants.LANG_CODES["FINNISH"]:
-            print(file=stream)
-            print("Valitsimet:", file=stream)
-            print("-a,  --annotate... Generoi lähdetiedostot tyyppiviittauksilla.", file=stream)
-            print("-q,  --quiet...... Älä tulosta mitään stdout:iin.", file=stream)
-            print("-i,  --git-init... Alusta projekti git-repona.", file=stream)
-            print("-h,  --help....... Tulosta tämä viesti.", file=stream)
-            print(f"-V,  --version.... Tulosta {program} versio.", file=stream)
-        else:
-            print(file=stream)
-            print("Options:", file=stream)
-            print("-a,  --annotate... Generate source files with type hints.", file=stream)
-            print("-q,  --quiet...... Don't print anything to stdout.", file=stream)
-            print("-i,  --git-init... Initialize project as git-repo.", file=stream)
-            print("-h,  --help....... Print this message.", file=stream)
-            print(f"-V,  --version.... Print {program} version.", file=stream)
+        print(messages.get(language, "help", program=program), file=stream)
 
 
 class DescriptionText(Text):
@@ -69,14 +53,9 @@ class DescriptionText(Text):
             program... Program's name to display in the description text.
             language.. Language in which to display text.
         """
-        msg: str
-        if language == constants.LANG_CODES["FINNISH"]:
-            msg = f"{program} {self.version}, python projektien alustaja."
-            print(msg, file=stream)
-
-        else:
-            msg = f"{program} {self.version}, python project initializer."
-            print(msg, file=stream)
+        msg: str = messages.get(language, "description", program=program,
+                                version=self.version)
+        print(msg, file=stream)
 
 
 class UsageText(Text):
@@ -93,10 +72,7 @@ class UsageText(Text):
             program... Program's name to display in the usage text.
             language.. Language in which to display text.
         """
-        if language == constants.LANG_CODES["FINNISH"]:
-            print(f"Käyttö: {program} [valitsimet] <nimi>", file=stream)
-        else:
-            print(f"Usage: {program} [options] <name>", file=stream)
+        print(messages.get(language, "usage", program=program), file=stream)
 
 
 class SuccessText(Text):
@@ -114,20 +90,82 @@ class SuccessText(Text):
             program... Program's name to display in the success text.
             language.. Language in which to display text.
         """
-        colorama.init(autoreset=True)
+        import colorama  # Imported here, as it's only needed for this text
 
-        if language == constants.LANG_CODES["FINNISH"]:
-            print("".join([
-                colorama.Fore.YELLOW,
-                colorama.Style.BRIGHT,
-                f"{program}: \"{self.project}\" luotu! ✨✨"
-            ]), file=stream)
+        colorama.init(autoreset=True)
 
-        else:
-            print("".join([
-                colorama.Fore.YELLOW,
-                colorama.Style.BRIGHT,
-                f"{program}: \"{self.project}\" created! ✨✨"
-            ]), file=stream)
+        print("".join([
+            colorama.Fore.YELLOW,
+            colorama.Style.BRIGHT,
+            messages.get(language, "success", program=program,
+                         project=self.project)
+        ]), file=stream)
 
         colorama.deinit()
+
+
+class KeptText(Text):
+    """
+    Kept text producer for telling which files --update left as they were,
+    in various languages.
+    """
+
+    def __init__(self, paths: list) -> None:
+        """Kept text dependent values."""
+        self.paths: list = paths
+
+    def display(self, program: str, language: str, stream: object) -> None:
+        """
+        Displays a line for each file that was kept because it was edited.
+
+        Parameters:
+            program... Program's name to display in the text.
+            language.. Language in which to display text.
+        """
+        for path in self.paths:
+            print(messages.get(language, "kept", program=program, path=path),
+                  file=stream)
+
+
+class TraceText(Text):
+    """
+    Trace text producer for summing up where the time went, for -v and
+    --debug, in various languages.
+    """
+
+    def __init__(self, tracer: object, spans: bool=False) -> None:
+        """
+        Trace text dependent values.
+
+        Parameters:
+            tracer.... tracing.Tracer that recorded the spans.
+            spans..... Whether to display every span, and not just the
+                       totals of each category.
+        """
+        self.tracer: object = tracer
+        self.spans: bool = spans
+
+    def display(self, program: str, language: str, stream: object) -> None:
+        """
+        Displays the spans (with --debug), the totals of each category and
+        the total time.
+
+        Parameters:
+            program... Program's name to display in the text.
+            language.. Language in which to display text.
+        """
+        if self.spans:
+            for event in self.tracer.events:
+                details: str = " ".join(
+                    f"{key}={value}" for key, value in event["args"].items()
+                )
+                print(messages.get(language, "trace.span", program=program,
+                                   category=event["cat"], name=event["name"],
+                                   time=event["dur"] / 1000, details=details),
+                      file=stream)
+        for category, total in self.tracer.summary().items():
+            print(messages.get(language, "trace.category", program=program,
+                               category=category, **total), file=stream)
+        print(messages.get(language, "trace.total", program=program,
+                           time=(self.tracer.now() - self.tracer.start) / 1e6),
+              file=stream)
@@ -0,0 +1,250 @@
+"""Tracing of what ppi does and how long it takes, for --trace and -v."""
+
+import os
+import threading
+import time
+
+# The active recorder, or None when tracing is off. Code that runs for every
+# file checks this itself, so that when tracing is off, all it costs is
+# a comparison with None:
+#
+#     tracer: object = tracing.tracer
+#     start: int = tracer.now() if tracer is not None else 0
+#     ...
+#     if tracer is not None:
+#         tracer.complete("write", "file", start, path=path)
+#
+# Code that runs once per project uses span() instead. Anything with the
+# methods now(), complete() and span() of Tracer can record the spans
+# (see install()), e.g. metrics.Registry.
+tracer: object = None
+
+# Recorders that have been installed, in order.
+_recorders: list = []
+
+
+class Span:
+    """Context manager that records a span of a Tracer when it exits."""
+
+    def __init__(self, tracer_: object, name: str, category: str,
+                 args: dict) -> None:
+        """
+        Initializes Span.
+
+        Parameters:
+            tracer_... Tracer to record the span to.
+            name...... Name of the span, e.g. "write".
+            category.. Category of the span, e.g. "file".
+            args...... Details of the span, e.g. {"bytes": 10}. More can
+                       be added to self.args before the span exits.
+        """
+        self.tracer: object = tracer_
+        self.name: str = name
+        self.category: str = category
+        self.args: dict = args
+        self.start: int = 0
+
+    def __enter__(self) -> object:
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if exc_info[0] is not None:
+            self.args["error"] = str(exc_info[1])
+        self.tracer.complete(self.name, self.category, self.start,
+                             **self.args)
+
+
+class _NoSpan:
+    """Span that records nothing, for when tracing is off."""
+
+    args: dict = {}
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+NO_SPAN: object = _NoSpan()
+
+
+class Tracer:
+    """Class for recording spans as Chrome trace events."""
+
+    def __init__(self, start: int=None) -> None:
+        """
+        Initializes Tracer.
+
+        Parameters:
+            start..... Time (from time.perf_counter_ns()) that the trace
+                       starts at. Defaults to now.
+        """
+        self.start: int = time.perf_counter_ns() if start is None else start
+        self.pid: int = os.getpid()
+        self.events: list = []
+
+    now: object = staticmethod(time.perf_counter_ns)
+
+    def complete(self, name: str, category: str, start: int, end: int=None,
+                 **args: object) -> None:
+        """
+        Records a span that has ended.
+
+        Parameters:
+            name...... Name of the span, e.g. "write".
+            category.. Category of the span, e.g. "file".
+            start..... Time the span started at, from now().
+            end....... Time the span ended at. Defaults to now.
+            args...... Details of the span, e.g. path="setup.py".
+        """
+        if end is None:
+            end = time.perf_counter_ns()
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start - self.start) / 1000, "dur": (end - start) / 1000,
+            "pid": self.pid, "tid": threading.get_ident(), "args": args
+        })
+
+    def span(self, name: str, category: str, **args: object) -> Span:
+        """
+        Gets a context manager that records a span around its block.
+
+        Parameters:
+            name...... Name of the span, e.g. "git init".
+            category.. Category of the span, e.g. "git".
+            args...... Details of the span, e.g. path="demo".
+        """
+        return Span(self, name, category, args)
+
+    def trace(self) -> dict:
+        """Gets the trace in Chrome's trace event format, for json.dump()."""
+        metadata: dict = {"name": "process_name", "ph": "M", "pid": self.pid,
+                          "args": {"name": "ppi"}}
+        return {"traceEvents": [metadata, *self.events],
+                "displayTimeUnit": "ms"}
+
+    def summary(self) -> dict:
+        """
+        Sums up the spans by category.
+
+        Returns a dict that maps each category, in the order they were
+        first recorded, to the amount of spans, their total duration in
+        milliseconds and the total of their "bytes".
+        """
+        categories: dict = {}
+        for event in self.events:
+            total: dict = categories.setdefault(
+                event["cat"], {"count": 0, "time": 0.0, "bytes": 0}
+            )
+            total["count"] += 1
+            total["time"] += event["dur"] / 1000
+            total["bytes"] += event["args"].get("bytes", 0)
+        return categories
+
+
+class _Fanout:
+    """Recorder that passes the spans on to many recorders."""
+
+    def __init__(self, recorders: list) -> None:
+        """
+        Initializes _Fanout.
+
+        Parameters:
+            recorders. Recorders to pass the spans on to.
+        """
+        self.recorders: tuple = tuple(recorders)
+
+    now: object = staticmethod(time.perf_counter_ns)
+
+    def complete(self, name: str, category: str, start: int, end: int=None,
+                 **args: object) -> None:
+        """Records a span that has ended to every recorder."""
+        if end is None:
+            end = time.perf_counter_ns()
+        for recorder in self.recorders:
+            recorder.complete(name, category, start, end, **args)
+
+    def span(self, name: str, category: str, **args: object) -> Span:
+        """Gets a context manager that records a span around its block."""
+        return Span(self, name, category, args)
+
+
+def _update() -> None:
+    """Points tracer to the installed recorders."""
+    global tracer
+    if not _recorders:
+        tracer = None
+    elif len(_recorders) == 1:
+        tracer = _recorders[0]
+    else:
+        tracer = _Fanout(_recorders)
+
+
+def install(recorder: object) -> None:
+    """
+    Starts recording the spans to recorder, as well as to the recorders
+    that have been installed already.
+
+    Parameters:
+        recorder.. Object with the methods now(), complete() and span()
+                   of Tracer.
+    """
+    if recorder not in _recorders:
+        _recorders.append(recorder)
+        _update()
+
+
+def uninstall(recorder: object) -> None:
+    """
+    Stops recording the spans to recorder.
+
+    Parameters:
+        recorder.. A recorder given to install().
+    """
+    if recorder in _recorders:
+        _recorders.remove(recorder)
+        _update()
+
+
+def start(begin: int=None) -> Tracer:
+    """
+    Turns tracing on, and returns the Tracer that records the spans.
+
+    Parameters:
+        begin..... Time (from time.perf_counter_ns()) that the trace
+                   starts at. Defaults to now.
+    """
+    tracer_: object = Tracer(begin)
+    install(tracer_)
+    return tracer_
+
+
+def stop(recorder: object=None) -> None:
+    """
+    Turns tracing off.
+
+    Parameters:
+        recorder.. Recorder to stop recording to. Defaults to all of them.
+    """
+    if recorder is None:
+        _recorders.clear()
+        _update()
+    else:
+        uninstall(recorder)
+
+
+def span(name: str, category: str, **args: object) -> object:
+    """
+    Gets a context manager that records a span around its block, or one
+    that does nothing if tracing is off.
+
+    Parameters:
+        name...... Name of the span, e.g. "git init".
+        category.. Category of the span, e.g. "git".
+        args...... Details of the span, e.g. path="demo".
+    """
+    if tracer is None:
+        return NO_SPAN
+    return tracer.span(name, category, **args)
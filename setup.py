@@ -29,6 +29,7 @@ setup(
     ],
 
     packages=["ppi"],
+    package_data={"ppi": ["templates/*.tmpl", "locale/*.json"]},
     data_files=[("man/man1", ["docs/ppi.1"])],
     python_requires=">=3.8",  # This parameter requires setuptools >=24.2.0
     install_requires=["colorama"],
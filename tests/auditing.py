@@ -0,0 +1,37 @@
+"""Recording the audit events (see sys.addaudithook()) of the tests."""
+
+import contextlib
+import sys
+
+# Events to record and the list to record them to while recording() is
+# active, or None. Audit hooks can't be removed, so the one hook of the
+# whole test run is installed here, and does nothing else when idle.
+_events: frozenset = frozenset()
+_recorded: list = None
+
+
+def _hook(event: str, args: tuple) -> None:
+    """Records the event, if it's being recorded."""
+    if _recorded is not None and event in _events:
+        _recorded.append((event, args))
+
+
+sys.addaudithook(_hook)
+
+
+@contextlib.contextmanager
+def recording(events: frozenset) -> list:
+    """
+    Records the given audit events of the block, as (event, args) pairs,
+    into the list it gives.
+
+    Parameters:
+        events.... Names of the events to record, e.g. {"open"}.
+    """
+    global _events, _recorded
+    recorded: list = []
+    _events, _recorded = frozenset(events), recorded
+    try:
+        yield recorded
+    finally:
+        _events, _recorded = frozenset(), None
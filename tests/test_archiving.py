@@ -0,0 +1,133 @@
+import contextlib
+import io
+import os
+import tarfile
+import unittest
+import zipfile
+from ppi import archiving
+from ppi import parsing
+from ppi import scaffolding
+
+
+class UnseekableStream(io.RawIOBase):
+    """Write-only stream that can't be seeked or told, like a pipe."""
+
+    def __init__(self) -> None:
+        """Collect the written bytes into a buffer."""
+        self.data: bytearray = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+
+
+class ArchivingTestCase(unittest.TestCase):
+    """Tests for streaming projects into archives."""
+
+    def setUp(self) -> None:
+        """Render a project to archive."""
+        self.mapping: dict = scaffolding.generate("foo")
+        self.mapping["foo/script"] = b"#!/bin/sh\n"
+
+    def archive(self, fmt: str, stream: object=None) -> bytes:
+        """Archive the project and return the archive's bytes."""
+        if stream is None:
+            stream = io.BytesIO()
+        with archiving.Archive(stream, fmt, mtime=0) as archive:
+            archive.add("foo", self.mapping)
+        return bytes(stream.getvalue() if hasattr(stream, "getvalue")
+                     else stream.data)
+
+    def test_tar(self) -> None:
+        """Test that tar archives contain the project, owned by root."""
+        for fmt in ["tar", "tar.gz"]:
+            data: bytes = self.archive(fmt)
+            with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+                members: dict = {m.name: m for m in tar.getmembers()}
+                for path, content in self.mapping.items():
+                    self.assertEqual(tar.extractfile(f"foo/{path}").read(), content)
+            self.assertTrue(members["foo/docs"].isdir())
+            self.assertEqual(members["foo/docs"].mode, 0o755)
+            self.assertEqual(members["foo/pyproject.toml"].mode, 0o644)
+            self.assertEqual(members["foo/foo/script"].mode, 0o755)
+            self.assertEqual({(m.uid, m.gid, m.mtime) for m in members.values()},
+                             {(0, 0, 0)})
+
+    def test_zip(self) -> None:
+        """Test that zip archives contain the project with permissions."""
+        data: bytes = self.archive("zip")
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIn("foo/docs/", archive.namelist())
+            for path, content in self.mapping.items():
+                self.assertEqual(archive.read(f"foo/{path}"), content)
+            self.assertEqual(archive.getinfo("foo/pyproject.toml").external_attr >> 16,
+                             0o100644)
+            self.assertEqual(archive.getinfo("foo/docs/").external_attr >> 16,
+                             0o40755)
+
+    def test_reproducible(self) -> None:
+        """Test that the same project always produces the same bytes."""
+        for fmt in archiving.FORMATS:
+            self.assertEqual(self.archive(fmt), self.archive(fmt))
+
+    def test_unseekable(self) -> None:
+        """Test that archives can be streamed to unseekable streams."""
+        for fmt in ["tar", "tar.gz"]:
+            self.assertEqual(self.archive(fmt, UnseekableStream()),
+                             self.archive(fmt))
+        # Zip entries get data descriptors when the stream can't be seeked,
+        # so the bytes differ, but the contents must not.
+        data: bytes = self.archive("zip", UnseekableStream())
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            for path, content in self.mapping.items():
+                self.assertEqual(archive.read(f"foo/{path}"), content)
+
+    def test_invalid(self) -> None:
+        """Test that invalid formats and prefixes are rejected."""
+        self.assertRaises(ValueError, archiving.Archive, io.BytesIO(), "rar")
+        with archiving.Archive(io.BytesIO(), "tar") as archive:
+            for prefix in ["", ".", "..", "../foo", "foo/../.."]:
+                self.assertRaises(ValueError, archive.add, prefix, {})
+
+    def test_guess_format(self) -> None:
+        """Test that formats are guessed from the file extensions."""
+        self.assertEqual(archiving.guess_format("foo.tgz"), "tar.gz")
+        self.assertEqual(archiving.guess_format("foo.tar.gz"), "tar.gz")
+        self.assertEqual(archiving.guess_format("foo.tar"), "tar")
+        self.assertEqual(archiving.guess_format("foo.zip"), "zip")
+        self.assertEqual(archiving.guess_format("foo.rar"), "")
+
+    def test_source_date_epoch(self) -> None:
+        """Test that SOURCE_DATE_EPOCH sets the timestamps."""
+        old: object = os.environ.get("SOURCE_DATE_EPOCH")
+        try:
+            os.environ["SOURCE_DATE_EPOCH"] = "1600000000"
+            self.assertEqual(archiving.source_date_epoch(), 1600000000)
+            del os.environ["SOURCE_DATE_EPOCH"]
+            self.assertEqual(archiving.source_date_epoch(),
+                             archiving.DEFAULT_MTIME)
+        finally:
+            if old is not None:
+                os.environ["SOURCE_DATE_EPOCH"] = old
+
+    def test_parse_archive_options(self) -> None:
+        """Test that --archive and -o are parsed and validated."""
+        parser: object = parsing.ArgParser(
+            ["ppi", "--archive", "zip", "-o", "foo.zip", "foo"], "ppi",
+            "en_US.UTF-8"
+        )
+        parser.parse_args()
+        self.assertEqual((parser.archive, parser.output), ("zip", "foo.zip"))
+        self.assertEqual(parser.project, "foo")
+        parser = parsing.ArgParser(["ppi", "--archive=rar", "foo"], "ppi",
+                                   "en_US.UTF-8")
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, parser.parse_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+from ppi import batch
+from ppi import parsing
+
+
+class BatchTestCase(unittest.TestCase):
+    """Tests for creating projects from a manifest."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory to create the projects in."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.defaults: dict = {"annotate": False, "git_init": False,
+                               "target": self.tmp.name}
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def test_read_jsonl(self) -> None:
+        """Test that JSONL manifests are read line by line."""
+        stream: object = io.StringIO('{"name": "a"}\n\nnot json\n[1]\n')
+        specs: list = list(batch.read_specs(stream))
+        self.assertEqual(specs[0], (1, {"name": "a"}))
+        self.assertIsInstance(specs[1][1], batch.SpecError)
+        self.assertIsInstance(specs[2][1], batch.SpecError)
+
+    def test_read_csv(self) -> None:
+        """Test that CSV manifests are detected and read."""
+        stream: object = io.StringIO("name,annotate\na,yes\nb,\n")
+        spec: dict = batch.normalize(
+            list(batch.read_specs(stream))[0][1],
+            self.defaults
+        )
+        self.assertEqual(spec["name"], "a")
+        self.assertTrue(spec["annotate"])
+
+    def test_normalize_defaults(self) -> None:
+        """Test that empty values fall back to the defaults."""
+        spec: dict = batch.normalize({"name": "b", "annotate": ""},
+                                     {"annotate": True})
+        self.assertTrue(spec["annotate"])
+        self.assertEqual(spec["target"], ".")
+
+    def test_normalize_invalid(self) -> None:
+        """Test that invalid specs are rejected."""
+        for spec in ({}, {"name": "a/b"}, {"name": "a", "color": "red"}):
+            with self.assertRaises(batch.SpecError):
+                batch.normalize(spec, self.defaults)
+
+    def test_run(self) -> None:
+        """Test that every spec gets a record, in order."""
+        specs: list = [
+            (1, {"name": "first"}),
+            (2, {"name": ""}),
+            (3, {"name": "second", "annotate": True}),
+        ]
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                records: list = list(batch.run(specs, self.defaults, jobs))
+                statuses: list = [record["status"] for record in records]
+                self.assertEqual(statuses, ["ok", "error", "ok"])
+                self.assertTrue(os.path.isfile(
+                    os.path.join(self.tmp.name, "second", "second", "main.py")
+                ))
+
+    def test_parse_batch_options(self) -> None:
+        """Test that --batch and --jobs take values."""
+        parser: object = parsing.ArgParser(
+            ["ppi", "--batch", "-", "--jobs=3", "-a"], "ppi", "en_US.UTF-8"
+        )
+        parser.parse_args()
+        self.assertEqual(parser.batch, "-")
+        self.assertEqual(parser.jobs, 3)
+        self.assertTrue(parser.annotate)
+        self.assertEqual(parser.project, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
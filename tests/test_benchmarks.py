@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from benchmarks import suite
+
+
+class BenchmarkSuiteTestCase(unittest.TestCase):
+    """Tests for comparing benchmark results with a baseline."""
+
+    def test_compare(self) -> None:
+        """Test that only results slower than the threshold regress."""
+        baseline: dict = {"a": 100.0, "b": 100.0, "c": 100.0}
+        results: dict = {"a": 124.0, "b": 126.0, "c": 50.0, "new": 1e9}
+        self.assertEqual(suite.compare(results, baseline, 0.25), ["b"])
+        self.assertEqual(suite.compare(results, baseline, 0.0), ["a", "b"])
+
+    def test_main(self) -> None:
+        """Test that a baseline is recorded, and that regressions fail."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, "baseline.json")
+            argv: list = ["--baseline", path, "--threshold", "0.5"]
+            statuses: list = []
+            for result in (100.0, 140.0, 160.0):
+                with mock.patch.object(suite, "run",
+                                       return_value={"scaffold": result}), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    statuses.append(suite.main(argv))
+            self.assertEqual(statuses, [0, 0, 1])
+            self.assertEqual(suite.load_baseline(path), {"scaffold": 100.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import collections
+import os
+import tempfile
+import unittest
+from ppi import filesystem
+from ppi import scaffolding
+from tests import auditing
+
+
+def count_events(function: object, *args: object) -> collections.Counter:
+    """Call function and count the audit events it caused."""
+    with auditing.recording({"open", "os.mkdir", "os.rename"}) as events:
+        function(*args)
+    return collections.Counter(event for event, _ in events)
+
+
+class FileSystemTestCase(unittest.TestCase):
+    """Tests for the syscall-minimized filesystem backend."""
+
+    def setUp(self) -> None:
+        """Render a project and create a directory to write it to."""
+        self.mapping: dict = scaffolding.generate("demo")
+        self.directories: set = {
+            os.path.dirname(path) for path in self.mapping
+        } - {""}
+        self.tmp: object = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def test_write_tree(self) -> None:
+        """Test that every file is written once, relative to the root."""
+        results: dict = filesystem.write_tree(self.tmp.name, self.mapping)
+        self.assertEqual(set(results), set(self.mapping) | self.directories)
+        self.assertTrue(all(error is None for error in results.values()))
+        for path, content in self.mapping.items():
+            with open(os.path.join(self.tmp.name, path), "rb") as f:
+                self.assertEqual(f.read(), content)
+
+        results = filesystem.write_tree(self.tmp.name, {"README.md": b""})
+        self.assertIsInstance(results["README.md"], FileExistsError)
+
+    @unittest.skipUnless(os.open in os.supports_dir_fd, "needs dir_fd")
+    def test_write_tree_syscalls(self) -> None:
+        """Test that the root is opened once and each directory made once."""
+        events: collections.Counter = count_events(
+            filesystem.write_tree, self.tmp.name, self.mapping
+        )
+        self.assertEqual(events["open"], 1 + len(self.mapping))
+        self.assertEqual(events["os.mkdir"], len(self.directories))
+
+    @unittest.skipUnless(os.open in os.supports_dir_fd, "needs dir_fd")
+    def test_materialize_syscalls(self) -> None:
+        """Test the syscalls of dropping a whole project to the disk."""
+        root: str = os.path.join(self.tmp.name, "demo")
+        events: collections.Counter = count_events(
+            scaffolding.materialize, self.mapping, root
+        )
+        # One mkdir for the parent (os.makedirs), one for the staging
+        # directory, one per directory of the project, and one rename.
+        self.assertEqual(events, collections.Counter({
+            "open": 1 + len(self.mapping),
+            "os.mkdir": 2 + len(self.directories),
+            "os.rename": 1
+        }))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import collections
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from ppi import main
+from ppi import scaffolding
+from tests import auditing
+
+# Maximum amount of each audited event per scenario, e.g. opens per project.
+# Events that a scenario lacks are not allowed at all. To accept a change in
+# the amounts, run the tests with PPI_UPDATE_BUDGET=1 and commit the file.
+BUDGET: str = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "io_budget.json")
+
+# Audit events (see sys.addaudithook()) that touch the file system or start
+# processes.
+AUDITED: frozenset = frozenset({
+    "open", "os.mkdir", "os.rename", "os.remove", "os.rmdir", "os.link",
+    "os.symlink", "os.chmod", "os.listdir", "os.scandir", "os.truncate",
+    "os.utime", "shutil.copyfile", "subprocess.Popen", "os.posix_spawn",
+    "os.fork", "os.exec", "os.system",
+})
+
+# Command lines of the main() scenarios, run in an empty directory.
+COMMANDS: dict = {
+    "main -q demo": ["-q", "demo"],
+    "main -q --git-init demo": ["-q", "--git-init", "demo"],
+    "main -q --initial-commit demo": ["-q", "--initial-commit", "demo"],
+    "main -q --git-init --system-git demo": [
+        "-q", "--git-init", "--system-git", "demo"
+    ],
+}
+
+# Author and dates of the initial commit, so that its objects, and thereby
+# the directories they go to, are the same on every run.
+GIT_ENV: dict = {
+    "GIT_AUTHOR_NAME": "ppi", "GIT_AUTHOR_EMAIL": "ppi@example.com",
+    "GIT_COMMITTER_NAME": "ppi", "GIT_COMMITTER_EMAIL": "ppi@example.com",
+    "SOURCE_DATE_EPOCH": "0",
+}
+
+@contextlib.contextmanager
+def counting() -> dict:
+    """Counts the audited events of the block into the dict it gives."""
+    counts: dict = {}
+    with auditing.recording(AUDITED) as events:
+        yield counts
+    counts.update(collections.Counter(event for event, _ in events))
+
+
+@contextlib.contextmanager
+def directory() -> str:
+    """Changes to an empty temporary directory for the block."""
+    cwd: str = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
+
+
+def run(args: list) -> None:
+    """Runs main() with args, quietly and without exiting."""
+    argv: list = ["ppi", *args]
+    with contextlib.redirect_stdout(io.StringIO()), \
+            contextlib.suppress(SystemExit), \
+            mock.patch.dict(os.environ, GIT_ENV):
+        main.main(len(argv), argv)
+
+
+class IOBudgetTestCase(unittest.TestCase):
+    """Tests for keeping the I/O and processes per project within budget."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Load the budget, and start collecting what was used."""
+        with open(BUDGET, "r", encoding="utf-8") as f:
+            cls.budget: dict = json.load(f)
+        cls.used: dict = {}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Store what was used as the new budget, if asked to."""
+        if os.getenv("PPI_UPDATE_BUDGET"):
+            with open(BUDGET, "w", encoding="utf-8") as f:
+                json.dump({**cls.budget, **cls.used},
+                          f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    def check(self, scenario: str, counts: dict) -> None:
+        """Test that counts of scenario are within its budget."""
+        self.used[scenario] = counts
+        budget: dict = self.budget.get(scenario, {})
+        over: dict = {
+            event: f"{count} > {budget.get(event, 0)}"
+            for event, count in counts.items()
+            if count > budget.get(event, 0)
+        }
+        self.assertFalse(over, f"{scenario} is over the budget of "
+                               f"{os.path.basename(BUDGET)}: {over}")
+
+    def test_main(self) -> None:
+        """Test the events of creating a project with main()."""
+        for scenario, args in COMMANDS.items():
+            if "--system-git" in args and shutil.which("git") is None:
+                continue
+            with self.subTest(scenario=scenario):
+                # The first run imports the modules and caches the catalog
+                # and templates, which happens only once per process.
+                with directory():
+                    run(args)
+                with directory(), counting() as counts:
+                    run(args)
+                self.check(scenario, counts)
+
+    def test_writers(self) -> None:
+        """Test the events of Writer.write()."""
+        for writer in scaffolding.create_writers().values():
+            scenario: str = f"write {type(writer).__name__}"
+            with self.subTest(scenario=scenario), directory():
+                os.mkdir("demo")
+                writer.write("demo/file")  # Warm up
+                with counting() as counts:
+                    writer.write("demo/file")
+                self.check(scenario, counts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import os
 import unittest
 from ppi import constants
+from ppi import messages
 
 
 class LangcodesTestCase(unittest.TestCase):
@@ -10,6 +12,13 @@ class LangcodesTestCase(unittest.TestCase):
         for key, value in constants.LANG_CODES.items():
             self.assertTrue(value.endswith(".UTF-8"), f"{value}: invalid suffix.")
 
+    def test_catalogs(self) -> None:
+        """Test that every language code has a message catalog."""
+        for key, value in constants.LANG_CODES.items():
+            path: str = os.path.join(messages.CATALOG_DIR,
+                                     f"{messages.normalize(value)}.json")
+            self.assertTrue(os.path.isfile(path), f"{key}: no catalog.")
+
 
 if __name__ == "__main__":
     unittest.main()
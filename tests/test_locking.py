@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import unittest
+from ppi import locking
+from ppi import scaffolding
+from tests import auditing
+
+
+class LockingTestCase(unittest.TestCase):
+    """Tests for lock files and updating projects."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory to create the projects in."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.root: str = os.path.join(self.tmp.name, "demo")
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def scaffold(self, **kwargs: object) -> list:
+        """Create or update the project, and return the kept files."""
+        return scaffolding.scaffold("demo", scaffolding.create_writers(),
+                                    directory=self.tmp.name, **kwargs)
+
+    def mtimes(self) -> dict:
+        """Get the mtimes of the project's files."""
+        return {
+            path: os.stat(os.path.join(self.root, path)).st_mtime_ns
+            for path in scaffolding.generate("demo", lock=True)
+        }
+
+    def edit(self, path: str) -> None:
+        """Append a line to a file of the project."""
+        with open(os.path.join(self.root, path), "a") as f:
+            f.write("# edited\n")
+
+    def opened(self, kept: list=None) -> list:
+        """Update the project, and return the files it opened in it."""
+        with auditing.recording({"open"}) as events:
+            self.assertEqual(self.scaffold(update=True), kept or [])
+        return [
+            os.path.relpath(args[0], self.root) for _, args in events
+            if isinstance(args[0], str) and args[0].startswith(self.root)
+        ]
+
+    def test_lock(self) -> None:
+        """Test that the lock records the hash and size of every file."""
+        mapping: dict = scaffolding.generate("demo", lock=True, git=True)
+        lock: dict = json.loads(mapping[locking.LOCK_NAME])
+        self.assertEqual(set(lock["files"]), {
+            path for path in scaffolding.generate("demo")
+        })
+        self.assertEqual(lock["files"]["pyproject.toml"], {
+            "sha256": locking.digest(mapping["pyproject.toml"]),
+            "size": len(mapping["pyproject.toml"])
+        })
+
+    def test_update_unchanged(self) -> None:
+        """Test that updating an unchanged project writes nothing."""
+        self.scaffold()
+        self.scaffold(update=True)  # Rewrites the lock, which was racy
+        mtimes: dict = self.mtimes()
+        self.assertEqual(self.scaffold(update=True), [])
+        self.assertEqual(self.mtimes(), mtimes)
+
+    def test_update_opens(self) -> None:
+        """Test that unchanged files of the right size aren't opened."""
+        self.scaffold()
+        self.scaffold(update=True)
+        self.assertEqual(self.opened(), [locking.LOCK_NAME])
+        self.edit("README.md")
+        self.assertEqual(self.opened(["README.md"]),
+                         [locking.LOCK_NAME, "README.md"])
+
+    def test_update_changed(self) -> None:
+        """Test that only changed files that haven't been edited are written."""
+        self.scaffold(setup_py=True)
+        self.edit("demo/main.py")
+        os.remove(os.path.join(self.root, "README.md"))
+        before: dict = {
+            path: os.stat(os.path.join(self.root, path)).st_mtime_ns
+            for path in ("setup.py", "Makefile")
+        }
+        self.assertEqual(self.scaffold(update=True, annotate=True,
+                                       setup_py=True),
+                         ["demo/main.py"])
+
+        with open(os.path.join(self.root, "setup.py"), "rb") as f:
+            self.assertIn(b"-> str", f.read())
+        with open(os.path.join(self.root, "demo", "main.py"), "rb") as f:
+            self.assertTrue(f.read().endswith(b"# edited\n"))
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "README.md")))
+        self.assertGreater(os.stat(os.path.join(self.root, "setup.py")).st_mtime_ns,
+                           before["setup.py"])
+        self.assertEqual(os.stat(os.path.join(self.root, "Makefile")).st_mtime_ns,
+                         before["Makefile"])
+
+    def test_update_without_lock(self) -> None:
+        """Test that files that ppi didn't write are never overwritten."""
+        os.makedirs(self.root)
+        with open(os.path.join(self.root, "README.md"), "w") as f:
+            f.write("mine\n")
+        self.assertEqual(self.scaffold(update=True), ["README.md"])
+        with open(os.path.join(self.root, "README.md")) as f:
+            self.assertEqual(f.read(), "mine\n")
+        self.assertTrue(os.path.isfile(os.path.join(self.root,
+                                                    "pyproject.toml")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from ppi import main
+from ppi import manpage
+from ppi import scaffolding
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE: str = """\
+% DEMO(1) demo 1.0 | User Commands
+% Jane Doe
+% May 2024
+
+# NAME
+demo -- do things
+
+# SYNOPSIS
+**demo** \\[*–q*\\] \\<*name*\\>\\
+**demo** **––***option*=*value*
+
+# OPTIONS
+**–q**, **––quiet**
+: Don't print
+anything.
+
+    Not even errors, with `-q`.
+
+.hidden text
+"""
+
+
+class ManPageTestCase(unittest.TestCase):
+    """Tests for converting man-pages from Markdown to roff."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the pages."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def run_main(self, *args: str) -> int:
+        """Run ppi with args, returning the exit status."""
+        argv: list = ["ppi", *args]
+        with contextlib.redirect_stderr(io.StringIO()):
+            try:
+                main.main(len(argv), argv)
+            except SystemExit as exit_:
+                return exit_.code
+        return 0
+
+    def test_render(self) -> None:
+        """Test that every supported construct is rendered as pandoc would."""
+        lines: list = manpage.render(PAGE).splitlines()
+        self.assertEqual(lines[1], '.TH "DEMO" "1" "May 2024" "demo 1.0" '
+                                   '"User Commands"')
+        self.assertEqual(lines[2:5], [".SH NAME", ".PP",
+                                      "demo \\[u2013] do things"])
+        self.assertEqual(lines[7:10], [
+            "\\f[B]demo\\f[R] [\\f[I]\\[u2013]q\\f[R]] <\\f[I]name\\f[R]>",
+            ".br",
+            "\\f[B]demo\\f[R] \\f[B]\\[u2013]\\[u2013]\\f[R]\\f[I]option\\f[R]"
+            "=\\f[I]value\\f[R]"
+        ])
+        self.assertEqual(lines[10:18], [
+            ".SH OPTIONS", ".TP",
+            "\\f[B]\\[u2013]q\\f[R], \\f[B]\\[u2013]\\[u2013]quiet\\f[R]",
+            "Don't print", "anything.",
+            ".IP", "Not even errors, with \\f[CR]\\-q\\f[R].",
+            ".PP"
+        ])
+        self.assertEqual(lines[18], "\\&.hidden text")
+        self.assertEqual(lines[-2:], [".SH AUTHORS", "Jane Doe."])
+
+    def test_nested_fonts(self) -> None:
+        """Test that fonts return to the one around them."""
+        self.assertEqual(manpage._inline("**a *b* c**"),
+                         "\\f[B]a \\f[BI]b\\f[B] c\\f[R]")
+        self.assertEqual(manpage._inline("2 * 3 * 4"), "2 * 3 * 4")
+
+    def test_generated_page(self) -> None:
+        """Test that the man-page of a new project is rendered completely."""
+        mapping: dict = scaffolding.generate("demo")
+        roff: str = manpage.render(mapping["docs/demo.1.md"].decode())
+        self.assertIn('.TH "DEMO" "1"', roff)
+        self.assertIn("\\f[B]short\\-option\\f[R], "
+                      "\\f[B]long\\-option\\f[R]\n", roff)
+        self.assertNotIn("**", roff)
+
+    def test_man_project(self) -> None:
+        """Test that a project called man isn't taken for --man."""
+        cwd: str = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            self.assertEqual(self.run_main("man", "-q"), 0)
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.tmp.name, "man", "docs", "man.1.md")
+        ))
+
+    def test_main(self) -> None:
+        """Test that ppi --man converts many pages next to themselves."""
+        pages: list = [os.path.join(self.tmp.name, f"page{n}.1.md")
+                       for n in range(3)]
+        for page in pages:
+            with open(page, "w", encoding="utf-8") as f:
+                f.write(PAGE)
+        self.assertEqual(self.run_main("--man", *pages), 0)
+        for page in pages:
+            with open(page[:-3], "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), manpage.render(PAGE))
+
+        output: str = os.path.join(self.tmp.name, "out.1")
+        self.assertEqual(self.run_main("--man", pages[0], "-o", output), 0)
+        self.assertTrue(os.path.exists(output))
+
+        # Failing pages don't stop the others
+        os.remove(pages[0][:-3])
+        missing: str = os.path.join(self.tmp.name, "missing.md")
+        self.assertEqual(self.run_main("--man", missing, pages[0]), 1)
+        self.assertTrue(os.path.exists(pages[0][:-3]))
+        self.assertEqual(self.run_main("--man", "page.txt"), 1)
+        self.assertEqual(self.run_main("--man", *pages[:2], "-o", output), 1)
+        self.assertEqual(self.run_main("--man", "--bogus", pages[0]), 1)
+
+    @unittest.skipIf(shutil.which("make") is None, "make not found")
+    def test_makefile(self) -> None:
+        """Test that make man of a new project converts the page with ppi."""
+        scaffolding.scaffold("demo", scaffolding.create_writers(),
+                             directory=self.tmp.name)
+        root: str = os.path.join(self.tmp.name, "demo")
+        subprocess.run(
+            ["make", "man", f"MANPAGE={sys.executable} -m ppi.main --man"],
+            cwd=root, check=True, stdout=subprocess.DEVNULL,
+            env=dict(os.environ, PYTHONPATH=ROOT)
+        )
+        with open(os.path.join(root, "docs", "demo.1"), "r",
+                  encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith('.\\" Automatically'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import string
+import tempfile
+import unittest
+import unittest.mock
+from ppi import messages
+
+
+class MessagesTestCase(unittest.TestCase):
+    """Tests for the message catalogs."""
+
+    def setUp(self) -> None:
+        """Create temporary directories for catalogs and compiled ones."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.catalog_dir: str = os.path.join(self.tmp.name, "locale")
+        self.cache_dir: str = os.path.join(self.tmp.name, "cache")
+        os.makedirs(self.catalog_dir)
+        self.write("en", {"hello": "Hello, {name}!", "bye": ["Bye,", "{name}"]})
+        self.write("fi", {"hello": "Hei, {name}!"})
+
+    def tearDown(self) -> None:
+        """Remove the temporary directories."""
+        self.tmp.cleanup()
+
+    def write(self, language: str, catalog: dict) -> None:
+        """Write a catalog in the temporary directory."""
+        path: str = os.path.join(self.catalog_dir, f"{language}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f)
+
+    def loader(self) -> object:
+        """Create a loader for the temporary catalogs."""
+        return messages.CatalogLoader(self.catalog_dir, self.cache_dir)
+
+    def test_normalize(self) -> None:
+        """Test that locales in their different forms give the language."""
+        for locale, language in (("fi_FI.UTF-8", "fi"), ("fi_FI.utf8", "fi"),
+                                 ("fi_FI@euro", "fi"), ("FI", "fi"),
+                                 ("pt-BR", "pt"), ("C", ""), ("POSIX", ""),
+                                 ("C.UTF-8", ""), ("", ""), (None, "")):
+            with self.subTest(locale=locale):
+                self.assertEqual(messages.normalize(locale), language)
+
+    def test_locale(self) -> None:
+        """Test that LC_ALL overrides LC_MESSAGES, which overrides LANG."""
+        environ: dict = {"LANG": "fi_FI.UTF-8"}
+        self.assertEqual(messages.locale(environ), "fi_FI.UTF-8")
+        environ["LC_MESSAGES"] = "sv_SE.UTF-8"
+        self.assertEqual(messages.locale(environ), "sv_SE.UTF-8")
+        environ["LC_ALL"] = "C"
+        self.assertEqual(messages.locale(environ), "C")
+        environ["LC_ALL"] = ""
+        self.assertEqual(messages.locale(environ), "sv_SE.UTF-8")
+        self.assertEqual(messages.locale({}), "")
+
+    def test_get(self) -> None:
+        """Test that messages fall back to the default language."""
+        loader: object = self.loader()
+        self.assertEqual(loader.get("fi_FI.utf8", "hello", name="x"), "Hei, x!")
+        self.assertEqual(loader.get("fi_FI.utf8", "bye", name="x"), "Bye,\nx")
+        self.assertEqual(loader.get("sv_SE.UTF-8", "hello", name="x"),
+                         "Hello, x!")
+        self.assertEqual(loader.get(None, "hello", name="x"), "Hello, x!")
+        self.assertEqual(loader.language("../en"), "en")
+
+    def test_cache(self) -> None:
+        """Test that compiled catalogs are cached and invalidated."""
+        self.loader().load("fi")
+        self.assertTrue(os.path.isfile(os.path.join(self.cache_dir, "fi.bin")))
+        with unittest.mock.patch.object(messages, "compile_catalog") as compile_:
+            self.assertEqual(self.loader().load("fi"),
+                             {"hello": "Hei, {name}!"})
+            compile_.assert_not_called()
+
+        self.write("fi", {"hello": "Moi, {name}!"})
+        self.assertEqual(self.loader().get("fi", "hello", name="x"), "Moi, x!")
+
+    def test_only_active_catalog(self) -> None:
+        """Test that only the catalog of the user's language is loaded."""
+        loader: object = self.loader()
+        loader.get("fi_FI.UTF-8", "hello", name="x")
+        self.assertEqual(set(loader._catalogs), {"fi"})
+
+    def test_invalid(self) -> None:
+        """Test that invalid catalogs are rejected."""
+        for source in ("[]", "{", '{"a": 1}', '{"a": ["b", 2]}'):
+            with self.subTest(source=source):
+                self.assertRaises(messages.CatalogError,
+                                  messages.compile_catalog, source)
+
+    def test_builtin_catalogs(self) -> None:
+        """Test that the catalogs have only the default one's messages."""
+        loader: object = messages.CatalogLoader(cache_dir="")
+        default: dict = loader.load(messages.DEFAULT_LANGUAGE)
+        for name in sorted(os.listdir(messages.CATALOG_DIR)):
+            language: str = name[:-len(".json")]
+            with self.subTest(language=language):
+                for key, message in loader.load(language).items():
+                    self.assertIn(key, default)
+                    self.assertEqual(
+                        {field for _, field, _, _ in
+                         string.Formatter().parse(message) if field},
+                        {field for _, field, _, _ in
+                         string.Formatter().parse(default[key]) if field},
+                        f"{language}: fields of '{key}' differ"
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
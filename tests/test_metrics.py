@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from ppi import metrics
+from ppi import scaffolding
+from ppi import tracing
+
+
+class MetricsTestCase(unittest.TestCase):
+    """Tests for the metrics registry."""
+
+    def setUp(self) -> None:
+        """Create a registry, and a temporary directory for the projects."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.registry: object = metrics.Registry()
+
+    def tearDown(self) -> None:
+        """Turn tracing off and remove the temporary directory."""
+        tracing.stop()
+        self.tmp.cleanup()
+
+    def scaffold(self, name: str="demo", **kwargs: object) -> None:
+        """Create a project in the temporary directory."""
+        scaffolding.scaffold(name, scaffolding.create_writers(),
+                             directory=self.tmp.name, **kwargs)
+
+    def samples(self, name: str) -> dict:
+        """Get the samples of a metric by the value of their first label."""
+        return {
+            next(iter(sample["labels"].values()), ""): sample
+            for sample in self.registry.snapshot()[name]["samples"]
+        }
+
+    def test_unsubscribed(self) -> None:
+        """Test that nothing is collected while nobody is subscribed."""
+        self.scaffold()
+        self.assertIsNone(tracing.tracer)
+        self.assertEqual(self.samples("ppi_files_written_total"), {})
+
+    def test_subscribe(self) -> None:
+        """Test that subscribers get every span, until they unsubscribe."""
+        spans: list = []
+        subscriber: object = self.registry.subscribe(
+            lambda *span: spans.append(span)
+        )
+        self.scaffold(git=True)
+        self.registry.unsubscribe(subscriber)
+        self.assertIsNone(tracing.tracer)
+        self.scaffold("other")
+
+        mapping: dict = scaffolding.generate("demo", git=True, lock=True)
+        writes: list = [span for span in spans if span[0] == "write"]
+        self.assertEqual(len(writes), len([
+            path for path in mapping if not path.endswith("/")
+        ]))
+        name, category, seconds, args = writes[0]
+        self.assertEqual((name, category), ("write", "file"))
+        self.assertGreaterEqual(seconds, 0)
+        self.assertEqual(args["writer"], "ReadMeWriter")
+
+        files: dict = self.samples("ppi_files_written_total")
+        self.assertEqual(files["PyProjectWriter"]["value"], 1)
+        self.assertEqual(files["repository"]["value"], 2)
+        self.assertEqual(self.samples("ppi_bytes_written_total")
+                         ["PyProjectWriter"]["value"], len(mapping["pyproject.toml"]))
+        self.assertEqual(self.samples("ppi_scaffold_seconds")[""]["count"], 1)
+        self.assertIn("git skeleton", self.samples("ppi_git_seconds"))
+
+    def test_threads_and_tracing(self) -> None:
+        """Test that the metrics and a trace can be recorded together."""
+        self.registry.start()
+        tracer: object = tracing.start()
+        self.scaffold(width=4)
+        tracing.stop(tracer)
+        self.scaffold("other")
+        self.registry.stop()
+        self.assertEqual(
+            self.samples("ppi_scaffold_seconds")[""]["count"], 2
+        )
+        self.assertEqual(
+            len([event for event in tracer.events if event["name"] == "scaffold"]),
+            1
+        )
+        self.assertEqual(
+            self.samples("ppi_write_seconds")["MainWriter"]["count"], 2
+        )
+
+    def test_errors(self) -> None:
+        """Test that failed steps are counted."""
+        self.registry.start()
+        os.makedirs(os.path.join(self.tmp.name, "demo", ".git"))
+        with self.assertRaises(ValueError):
+            self.scaffold(commit=True)
+        with self.assertRaises(OSError):
+            with tracing.span("git init", "git"):
+                raise OSError("no git")
+        self.assertEqual(self.samples("ppi_errors_total")["git init"]["value"],
+                         1)
+
+    def test_prometheus(self) -> None:
+        """Test the Prometheus text format."""
+        histogram: object = metrics.Histogram("h_seconds", "H.", ("writer",),
+                                              buckets=(0.1, 1.0))
+        histogram.observe(0.05, ('a"b',))
+        histogram.observe(0.5, ('a"b',))
+        self.assertEqual(histogram.text(), [
+            'h_seconds_bucket{writer="a\\"b",le="0.1"} 1',
+            'h_seconds_bucket{writer="a\\"b",le="1.0"} 2',
+            'h_seconds_bucket{writer="a\\"b",le="+Inf"} 2',
+            'h_seconds_sum{writer="a\\"b"} 0.55',
+            'h_seconds_count{writer="a\\"b"} 2',
+        ])
+
+        self.registry.start()
+        self.scaffold()
+        text: str = self.registry.prometheus()
+        self.assertIn("# TYPE ppi_write_seconds histogram\n", text)
+        self.assertIn('ppi_files_written_total{writer="MainWriter"} 1\n', text)
+        self.assertIn("ppi_directories_created_total 2\n", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
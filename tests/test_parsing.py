@@ -1,4 +1,7 @@
+import contextlib
+import io
 import unittest
+from ppi import main
 from ppi import parsing
 
 
@@ -39,6 +42,94 @@ class ParsingTestCase(unittest.TestCase):
         self.assertEqual(self.argparser.program, self.program)
         self.assertEqual(self.argparser.language, self.language)
 
+    def test_dedupe(self) -> None:
+        """Test that --dedupe takes its mode only as --dedupe=mode."""
+        for argv, dedupe in ((["ppi", "--dedupe", "demo"], "reflink"),
+                             (["ppi", "--dedupe=hardlink", "demo"], "hardlink")):
+            with self.subTest(argv=argv):
+                argparser: object = parsing.ArgParser(argv, self.program,
+                                                      self.language)
+                argparser.parse_args()
+                self.assertEqual(argparser.dedupe, dedupe)
+                self.assertEqual(argparser.project, "demo")
+
+    def parse(self, *args: str) -> object:
+        """Parse args (without exiting on errors) and return the parser."""
+        argparser: object = parsing.ArgParser(["ppi", *args], self.program,
+                                              self.language)
+        argparser._sort_args()
+        return argparser
+
+    def test_flags(self) -> None:
+        """Test that flags are set by their short, long and grouped forms."""
+        argparser: object = self.parse("-qi", "--annotate", "--update",
+                                       "--setup-py", "--perf", "--large-repo",
+                                       "demo")
+        self.assertTrue(argparser.quiet)
+        self.assertTrue(argparser.git)
+        self.assertTrue(argparser.annotate)
+        self.assertTrue(argparser.update)
+        self.assertTrue(argparser.setup_py)
+        self.assertTrue(argparser.perf)
+        self.assertTrue(argparser.large_repo)
+        self.assertFalse(argparser.help)
+        self.assertEqual(argparser.project, "demo")
+
+    def test_values(self) -> None:
+        """Test the "--option value" and "--option=value" forms."""
+        for args in (("--threads", "4", "-o", "out.tar"),
+                     ("--threads=4", "-oout.tar"),
+                     ("--threads=4", "-qo=out.tar")):
+            with self.subTest(args=args):
+                argparser: object = self.parse(*args, "demo")
+                self.assertEqual(argparser.threads, 4)
+                self.assertEqual(argparser.output, "out.tar")
+                self.assertEqual(argparser.project, "demo")
+
+    def test_end_of_options(self) -> None:
+        """Test that everything after "--" is positional."""
+        argparser: object = self.parse("-q", "--", "-i", "--help")
+        self.assertTrue(argparser.quiet)
+        self.assertFalse(argparser.git)
+        self.assertEqual(argparser.project, "-i")
+        self.assertEqual(argparser.arguments["extra"], ["--help"])
+
+    def test_nothing_to_do(self) -> None:
+        """Test that arguments without anything to do print the usage."""
+        for args in (["--"], ["-q"], ["--durability", "each"]):
+            argv: list = ["ppi", *args]
+            with self.subTest(args=args), \
+                    contextlib.redirect_stderr(io.StringIO()) as stderr, \
+                    contextlib.redirect_stdout(io.StringIO()) as stdout:
+                with self.assertRaises(SystemExit) as exit_:
+                    main.main(len(argv), argv)
+                self.assertEqual(exit_.exception.code, 1)
+                self.assertIn("Usage:", stderr.getvalue())
+                self.assertEqual(stdout.getvalue(), "")
+
+    def test_errors(self) -> None:
+        """Test that invalid, extra and incomplete arguments are recorded."""
+        argparser: object = self.parse("-", "--", "demo", "extra")
+        self.assertEqual(argparser.arguments["invalid"], ["-"])
+        self.assertEqual(argparser.arguments["extra"], ["extra"])
+        argparser = self.parse(
+            "---bad", "--help=yes", "-qx", "--jobs=0", "--durability", "x",
+            "--batch"
+        )
+        self.assertEqual(argparser.arguments["invalid"], [
+            "---bad", "--help=yes", "-x", "--jobs=0", "--durability=x"
+        ])
+        self.assertEqual(argparser.arguments["missing"], ["--batch"])
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertRaises(SystemExit, argparser.parse_args)
+        self.assertIn("--batch", stderr.getvalue())
+
+    def test_many_arguments(self) -> None:
+        """Test that long argument lists are parsed in a single pass."""
+        argparser: object = self.parse(*[f"name{i}" for i in range(100000)])
+        self.assertEqual(argparser.project, "name0")
+        self.assertEqual(len(argparser.arguments["extra"]), 99999)
+
     @unittest.skip("test incomplete")
     def test_arg_sorting(self) -> None:
         """Test that args are sorted correctly."""
@@ -0,0 +1,198 @@
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import unittest
+import unittest.mock
+import zlib
+from ppi import archiving
+from ppi import constants
+from ppi import repository
+from ppi import scaffolding
+
+
+class RepositoryTestCase(unittest.TestCase):
+    """Tests for creating git-repos without running git."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory to create the projects in."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def git(self, root: str, *args: str) -> str:
+        """Run git in root and return its output."""
+        return subprocess.run(
+            ["git", "-C", root, *args], check=True, capture_output=True,
+            text=True
+        ).stdout
+
+    def test_skeleton(self) -> None:
+        """Test that HEAD points to the initial branch."""
+        mapping: dict = repository.skeleton("trunk")
+        self.assertEqual(mapping[".git/HEAD"], b"ref: refs/heads/trunk\n")
+        self.assertIn(b"bare = false", mapping[".git/config"])
+        self.assertIn(".git/refs/heads/", mapping)
+        self.assertIn(".git/objects/pack/", mapping)
+
+    def test_invalid_branch(self) -> None:
+        """Test that branch names that git doesn't allow are rejected."""
+        for branch in ("", "-x", "a..b", "a b", "a.lock", "a/", ".a", "a/.b",
+                       "a~1", "a:b", "@", "a@{b", "a//b"):
+            with self.subTest(branch=branch):
+                self.assertRaises(ValueError, repository.skeleton, branch)
+        for branch in ("main", "feature/x", "v1.0", "a-b_c"):
+            self.assertEqual(repository.check_branch(branch), branch)
+
+    def test_directories(self) -> None:
+        """Test that the empty directories are created and archived."""
+        mapping: dict = scaffolding.generate("demo", git=True)
+        for width in (1, 4):
+            root: str = os.path.join(self.tmp.name, f"demo{width}")
+            scaffolding.materialize(mapping, root, width)
+            self.assertEqual(os.listdir(os.path.join(root, ".git", "refs",
+                                                     "tags")), [])
+
+        stream: object = io.BytesIO()
+        with archiving.Archive(stream, "tar") as archive:
+            archive.add("demo", mapping)
+        with tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as tar:
+            self.assertTrue(tar.getmember("demo/.git/refs/heads").isdir())
+
+    @unittest.skipUnless(shutil.which("git"), "needs git")
+    def test_fsck(self) -> None:
+        """Test that git accepts the repository as a valid one."""
+        scaffolding.scaffold("demo", scaffolding.create_writers(), git=True,
+                             directory=self.tmp.name, branch="trunk")
+        root: str = os.path.join(self.tmp.name, "demo")
+        self.git(root, "fsck", "--strict")
+        self.assertEqual(self.git(root, "symbolic-ref", "HEAD"),
+                         "refs/heads/trunk\n")
+        self.assertIn("?? pyproject.toml", self.git(root, "status", "--short"))
+
+    @unittest.skipUnless(shutil.which("git"), "needs git")
+    def test_system_git(self) -> None:
+        """Test that git init can still be used instead."""
+        scaffolding.scaffold("demo", scaffolding.create_writers(), git=True,
+                             directory=self.tmp.name, system_git=True)
+        root: str = os.path.join(self.tmp.name, "demo")
+        self.git(root, "fsck", "--strict")
+        self.assertTrue(os.path.isdir(os.path.join(root, ".git", "hooks")))
+
+    @unittest.mock.patch.dict(os.environ, {
+        "GIT_AUTHOR_NAME": "Jane Doe", "GIT_AUTHOR_EMAIL": "jane@example.com",
+        "GIT_COMMITTER_NAME": "Jane Doe",
+        "GIT_COMMITTER_EMAIL": "jane@example.com",
+        "GIT_AUTHOR_DATE": "@1600000000 +0300", "SOURCE_DATE_EPOCH": "1600000000"
+    })
+    def test_initial_commit(self) -> None:
+        """Test that the commit is reproducible and commits every file."""
+        mapping: dict = scaffolding.generate("demo", commit=True)
+        self.assertEqual(mapping, scaffolding.generate("demo", commit=True))
+        head: str = mapping[".git/refs/heads/master"].decode().strip()
+        commit: bytes = zlib.decompress(
+            mapping[f".git/objects/{head[:2]}/{head[2:]}"]
+        )
+        self.assertTrue(commit.startswith(b"commit "))
+        self.assertIn(b"author Jane Doe <jane@example.com> 1600000000 +0300\n",
+                      commit)
+        self.assertIn(b"committer Jane Doe <jane@example.com> 1600000000 +0000\n",
+                      commit)
+        files: int = len(scaffolding.generate("demo"))
+        self.assertEqual(mapping[".git/index"][:12],
+                         b"DIRC" + bytes([0, 0, 0, 2, 0, 0, 0, files]))
+
+    @unittest.skipUnless(shutil.which("git"), "needs git")
+    def test_initial_commit_git(self) -> None:
+        """Test that git sees the commit, and a clean and up-to-date index."""
+        scaffolding.scaffold("demo", scaffolding.create_writers(),
+                             directory=self.tmp.name, commit=True)
+        root: str = os.path.join(self.tmp.name, "demo")
+        with open(os.path.join(root, ".git", "index"), "rb") as f:
+            index: bytes = f.read()
+        self.git(root, "fsck", "--strict")
+        self.assertEqual(self.git(root, "status", "--porcelain"), "")
+        self.assertIn("demo/main.py", self.git(root, "ls-tree", "-r", "HEAD"))
+        with open(os.path.join(root, ".git", "index"), "rb") as f:
+            self.assertEqual(f.read(), index, "git had to refresh the index")
+
+        # The commit can't be redone, or done with git init
+        self.assertRaises(ValueError, scaffolding.scaffold, "demo",
+                          scaffolding.create_writers(),
+                          directory=self.tmp.name, commit=True)
+        self.assertRaises(ValueError, scaffolding.scaffold, "other",
+                          scaffolding.create_writers(),
+                          directory=self.tmp.name, commit=True,
+                          system_git=True)
+
+    def test_update_index_durability(self) -> None:
+        """Test that the index is fsynced with the durability of the project."""
+        for durability in constants.DURABILITY:
+            with self.subTest(durability=durability), \
+                    unittest.mock.patch("ppi.filesystem.fsync_path") as path:
+                scaffolding.scaffold(durability, scaffolding.create_writers(),
+                                     directory=self.tmp.name, commit=True,
+                                     durability=durability)
+                git: str = os.path.join(self.tmp.name, durability, ".git")
+                self.assertEqual(unittest.mock.call(git) in path.call_args_list,
+                                 durability != "none")
+
+    @unittest.skipUnless(shutil.which("git"), "needs git")
+    def test_large_repo(self) -> None:
+        """Test that git reads the settings and the version 4 index."""
+        scaffolding.scaffold("demo", scaffolding.create_writers(),
+                             directory=self.tmp.name, commit=True,
+                             large_repo=True)
+        root: str = os.path.join(self.tmp.name, "demo")
+        with open(os.path.join(root, ".git", "index"), "rb") as f:
+            self.assertEqual(f.read(8), b"DIRC\0\0\0\4")
+        self.git(root, "fsck", "--strict")
+        self.assertEqual(self.git(root, "status", "--porcelain"), "")
+        self.assertEqual(self.git(root, "ls-files"),
+                         self.git(root, "ls-tree", "-r", "--name-only", "HEAD"))
+        for key, value in (("index.version", "4"), ("feature.manyFiles", "true"),
+                           ("core.untrackedCache", "true")):
+            self.assertEqual(self.git(root, "config", key), f"{value}\n")
+
+        scaffolding.scaffold("other", scaffolding.create_writers(), git=True,
+                             directory=self.tmp.name, system_git=True,
+                             large_repo=True)
+        root = os.path.join(self.tmp.name, "other")
+        self.assertEqual(self.git(root, "config", "index.version"), "4\n")
+        self.assertEqual(self.git(root, "config", "core.bare"), "false\n")
+
+    def test_render_index_v4(self) -> None:
+        """Test that the paths of a version 4 index share their prefixes."""
+        oid: bytes = bytes(20)
+        files: list = [("demo/__init__.py", 0o100644, oid, 0),
+                       ("demo/main.py", 0o100644, oid, 0)]
+        index: bytes = repository.render_index(files, version=4)
+        entries: bytes = index[12:-20]
+        size: int = repository.INDEX_ENTRY.size
+        self.assertEqual(entries[size:size + 18], b"\0demo/__init__.py\0")
+        # 11 bytes of "__init__.py" are dropped and "main.py" is added
+        self.assertEqual(entries[2 * size + 18:], b"\x0bmain.py\0")
+        self.assertEqual(repository._varint(127), b"\x7f")
+        self.assertEqual(repository._varint(128), b"\x80\x00")
+        self.assertRaises(ValueError, repository.render_index, files,
+                          version=3)
+
+    @unittest.skipUnless(shutil.which("git"), "needs git")
+    def test_initial_commit_archive(self) -> None:
+        """Test that an archived commit is clean once extracted."""
+        stream: object = io.BytesIO()
+        with archiving.Archive(stream, "tar") as archive:
+            archive.add("demo", scaffolding.generate("demo", commit=True))
+        with tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as tar:
+            tar.extractall(self.tmp.name)
+        root: str = os.path.join(self.tmp.name, "demo")
+        self.git(root, "fsck", "--strict")
+        self.assertEqual(self.git(root, "status", "--porcelain"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from ppi import scaffolding
+
+
+class ScaffoldingTestCase(unittest.TestCase):
+    """Tests for rendering and writing whole projects."""
+
+    def test_generate(self) -> None:
+        """Test that projects are rendered in memory, in layout order."""
+        mapping: dict = scaffolding.generate("demo")
+        self.assertEqual(list(mapping), [
+            writer.output.format(project="demo")
+            for key, writer in scaffolding.create_writers().items()
+            if writer.output and key != "setup"
+            and key not in scaffolding.PERF_WRITERS
+        ])
+        self.assertTrue(all(isinstance(v, bytes) for v in mapping.values()))
+        self.assertIn(b'__program__ = "demo"', mapping["demo/main.py"])
+
+    def test_generate_pyproject(self) -> None:
+        """Test that pyproject.toml has static metadata, unless --setup-py."""
+        mapping: dict = scaffolding.generate("demo")
+        self.assertNotIn("setup.py", mapping)
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            self.assertIn(b'readme = "README.md"', mapping["pyproject.toml"])
+        else:
+            pyproject: dict = tomllib.loads(
+                mapping["pyproject.toml"].decode("utf-8")
+            )
+            self.assertEqual(pyproject["project"]["name"], "demo")
+            self.assertEqual(pyproject["project"]["readme"], "README.md")
+            self.assertEqual(pyproject["project"]["scripts"],
+                             {"demo": "demo.main:main"})
+            self.assertEqual(pyproject["tool"]["setuptools"]["packages"],
+                             ["demo"])
+
+            # A dotted name is a single script, not a nested table
+            dotted: dict = tomllib.loads(scaffolding.generate(
+                "my.pkg"
+            )["pyproject.toml"].decode("utf-8"))
+            self.assertEqual(dotted["project"]["scripts"],
+                             {"my.pkg": "my.pkg.main:main"})
+
+        mapping = scaffolding.generate("demo", setup_py=True)
+        self.assertNotIn("pyproject.toml", mapping)
+        self.assertIn(b'name="demo"', mapping["setup.py"])
+
+    def test_generate_perf(self) -> None:
+        """Test that the performance tooling is included only with perf."""
+        plain: dict = scaffolding.generate("demo")
+        mapping: dict = scaffolding.generate("demo", perf=True, annotate=True)
+        self.assertEqual(set(mapping) - set(plain), {
+            "benchmarks/__init__.py", "benchmarks/__main__.py",
+            "benchmarks/bench_main.py"
+        })
+        for target in (b"bench:", b"profile:", b"importtime:"):
+            self.assertIn(target, mapping["Makefile"])
+            self.assertNotIn(target, plain["Makefile"])
+        self.assertIn(b'"DEMO_STARTUP_TIME"', mapping["demo/main.py"])
+        self.assertNotIn(b"STARTUP_TIME", plain["demo/main.py"])
+        self.assertIn(b"*.pstats", mapping[".gitignore"])
+        self.assertIn(b"def bench(function: object",
+                      mapping["benchmarks/__init__.py"])
+        for path, content in mapping.items():
+            if path.endswith(".py"):
+                compile(content, path, "exec")
+
+    def test_generate_large_repo(self) -> None:
+        """Test that the caches are ignored with patterns anchored to the root."""
+        plain: dict = scaffolding.generate("demo", git=True)
+        mapping: dict = scaffolding.generate("demo", git=True, large_repo=True)
+        self.assertEqual(set(mapping), set(plain))
+        patterns: list = [
+            line for line in mapping[".gitignore"].decode().splitlines()
+            if line and not line.startswith("#")
+        ]
+        for pattern in ("/.venv/", "/.tox/", "/.mypy_cache/", "/build/",
+                        "*.egg-info/", "*.egg", "*__pycache__/"):
+            self.assertIn(pattern, patterns)
+        self.assertNotIn(b"/.tox/", plain[".gitignore"])
+        self.assertIn(b"[index]\n\tversion = 4\n", mapping[".git/config"])
+        self.assertNotIn(b"[index]", plain[".git/config"])
+
+    def test_generate_annotate(self) -> None:
+        """Test that type hints are rendered only when asked."""
+        files: dict = scaffolding.create_writers()
+        annotated: dict = scaffolding.generate("demo", annotate=True,
+                                               files=files)
+        plain: dict = scaffolding.generate("demo", files=files)
+        self.assertIn(b"def main() -> None:", annotated["demo/main.py"])
+        self.assertIn(b"def main():", plain["demo/main.py"])
+
+    def test_generate_invalid_name(self) -> None:
+        """Test that names that aren't a single path component are rejected."""
+        for name in ("", "a/b", ".."):
+            with self.assertRaises(ValueError):
+                scaffolding.generate(name)
+
+    def test_materialize(self) -> None:
+        """Test that rendered files are written under the given root."""
+        mapping: dict = scaffolding.generate("demo")
+        with tempfile.TemporaryDirectory() as tmp:
+            root: str = os.path.join(tmp, "out")
+            scaffolding.materialize(mapping, root)
+            for path, content in mapping.items():
+                with open(os.path.join(root, path), "rb") as f:
+                    self.assertEqual(f.read(), content)
+
+            with self.assertRaises(ValueError):
+                scaffolding.materialize({"../escape": b""}, root)
+
+    def test_materialize_errors(self) -> None:
+        """Test that errors are reported per file and nothing is published."""
+        mapping: dict = {"a/b": b"", "d": b"", "a/b/c": b"", "a/b/d": b""}
+        for width in (1, 4):
+            with self.subTest(width=width), \
+                    tempfile.TemporaryDirectory() as tmp:
+                root: str = os.path.join(tmp, "out")
+                with self.assertRaises(scaffolding.MaterializeError) as cm:
+                    scaffolding.materialize(mapping, root, width)
+                self.assertEqual(list(cm.exception.errors), ["a/b/c", "a/b/d"])
+                self.assertEqual(os.listdir(tmp), [])
+
+    def test_materialize_durability(self) -> None:
+        """Test publishing to new and existing roots with every durability."""
+        mapping: dict = scaffolding.generate("demo")
+        for durability in ("none", "batch", "each"):
+            with self.subTest(durability=durability), \
+                    tempfile.TemporaryDirectory() as tmp:
+                root: str = os.path.join(tmp, "demo")
+                scaffolding.materialize(mapping, root, durability=durability)
+                with open(os.path.join(root, "extra"), "w") as f:
+                    f.write("kept")
+                scaffolding.materialize(mapping, root, durability=durability)
+                self.assertEqual(os.listdir(tmp), ["demo"])
+                self.assertIn("extra", os.listdir(root))
+
+        with self.assertRaises(ValueError):
+            scaffolding.materialize(mapping, "demo", durability="always")
+
+if __name__ == "__main__":
+    unittest.main()
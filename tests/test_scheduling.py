@@ -0,0 +1,58 @@
+import threading
+import unittest
+from ppi import scheduling
+
+
+class SchedulingTestCase(unittest.TestCase):
+    """Tests for running tasks in the order of their prerequisites."""
+
+    def build(self, width: int, log: list) -> object:
+        """Builds a small graph of tasks that log their names."""
+        lock: object = threading.Lock()
+
+        def task(name: str) -> object:
+            def run() -> None:
+                with lock:
+                    log.append(name)
+            return run
+
+        def fail() -> None:
+            raise OSError("failed")
+
+        scheduler: object = scheduling.Scheduler(width)
+        scheduler.add("root", task("root"))
+        scheduler.add("a", task("a"), requires=("root",))
+        scheduler.add("b", fail, requires=("root",))
+        scheduler.add("a/1", task("a/1"), requires=("a",))
+        scheduler.add("b/1", task("b/1"), requires=("b",))
+        scheduler.add("c", task("c"))
+        return scheduler
+
+    def test_run(self) -> None:
+        """Test that results are the same no matter the width."""
+        for width in (1, 3):
+            with self.subTest(width=width):
+                log: list = []
+                results: dict = self.build(width, log).run()
+                self.assertEqual(list(results),
+                                 ["root", "a", "b", "a/1", "b/1", "c"])
+                self.assertIsNone(results["a/1"])
+                self.assertIsInstance(results["b"], OSError)
+                self.assertIsInstance(results["b/1"],
+                                      scheduling.PrerequisiteError)
+                self.assertNotIn("b/1", log)
+                self.assertLess(log.index("root"), log.index("a"))
+                self.assertLess(log.index("a"), log.index("a/1"))
+
+    def test_invalid_tasks(self) -> None:
+        """Test that tasks must be added after their prerequisites."""
+        scheduler: object = scheduling.Scheduler()
+        scheduler.add("a", lambda: None)
+        with self.assertRaises(ValueError):
+            scheduler.add("a", lambda: None)
+        with self.assertRaises(ValueError):
+            scheduler.add("b", lambda: None, requires=("c",))
+
+
+if __name__ == "__main__":
+    unittest.main()
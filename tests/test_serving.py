@@ -0,0 +1,131 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from ppi import batch
+from ppi import client
+from ppi import serving
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX") and hasattr(os, "fork"),
+                     "needs Unix sockets and fork")
+class ServingTestCase(unittest.TestCase):
+    """Tests for the daemon and its client."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the socket and the projects."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.socket: str = os.path.join(self.tmp.name, "ppi.sock")
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def start(self, fork: bool=False) -> None:
+        """Start a daemon in a thread, and stop it at the end of the test."""
+        server: object = serving.make_server(self.socket, fork)
+        thread: object = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop() -> None:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+
+    def request(self, *args: str, stdin: str=None) -> dict:
+        """Run a command line on the daemon in the temporary directory."""
+        cwd: str = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            return client.request(self.socket, ["ppi", *args], stdin)
+        finally:
+            os.chdir(cwd)
+
+    def test_socket_mode(self) -> None:
+        """Test that only the daemon's user can connect to the socket."""
+        self.start()
+        self.assertEqual(os.stat(self.socket).st_mode & 0o777, 0o600)
+
+    def test_requests(self) -> None:
+        """Test that requests behave like running ppi directly."""
+        for fork in (False, True):
+            with self.subTest(fork=fork):
+                self.start(fork)
+                cwd: str = os.getcwd()
+
+                response: dict = self.request("-V")
+                self.assertEqual(response["status"], 0)
+                self.assertIn("ppi", response["stdout"])
+
+                response = self.request("--nope")
+                self.assertEqual(response["status"], 1)
+                self.assertIn("--nope", response["stderr"])
+
+                response = self.request("-q", f"demo{int(fork)}")
+                self.assertEqual(response, {"status": 0, "stdout": "",
+                                            "stderr": ""})
+                self.assertTrue(os.path.isfile(os.path.join(
+                    self.tmp.name, f"demo{int(fork)}", "pyproject.toml"
+                )))
+                self.assertEqual(os.getcwd(), cwd)
+                self.doCleanups()
+
+    def test_stdin(self) -> None:
+        """Test that manifests can be sent over stdin."""
+        self.start()
+        response: dict = self.request("--batch", "-", stdin='{"name": "a"}\n')
+        self.assertEqual(response["status"], 0)
+        self.assertIn('"status": "ok"', response["stdout"])
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, "a")))
+
+    def test_user_templates(self) -> None:
+        """Test that the client's own templates are used, as they are now."""
+        self.start()
+        config: str = os.path.join(self.tmp.name, "config")
+        readme: str = os.path.join(config, "ppi", "templates", "README.md.tmpl")
+        with mock.patch.dict(os.environ, {"XDG_CONFIG_HOME": config}):
+            self.assertEqual(self.request("-q", "plain")["status"], 0)
+            os.makedirs(os.path.dirname(readme))
+            for number, text in enumerate(("# {{ project }}\n",
+                                           "# {{ project }}!\n")):
+                with open(readme, "w", encoding="utf-8") as f:
+                    f.write(text)
+                self.assertEqual(self.request("-q", f"demo{number}")["status"],
+                                 0)
+        for name, text in (("plain", None), ("demo0", "# demo0\n"),
+                           ("demo1", "# demo1!\n")):
+            with open(os.path.join(self.tmp.name, name, "README.md"), "r",
+                      encoding="utf-8") as f:
+                content: str = f.read()
+            if text is None:
+                self.assertNotEqual(content, "# plain\n")
+            else:
+                self.assertEqual(content, text)
+
+    def test_fresh_writers(self) -> None:
+        """Test that the writers of a request aren't left from earlier."""
+        self.start()
+        batch._init_worker()
+        batch._files["manpage"].month = "Never"
+        self.addCleanup(batch._files.clear)
+        response: dict = self.request("--batch", "-", stdin='{"name": "a"}\n')
+        self.assertEqual(response["status"], 0)
+        with open(os.path.join(self.tmp.name, "a", "docs", "a.1.md"), "r",
+                  encoding="utf-8") as f:
+            self.assertNotIn("Never", f.read())
+
+    def test_stale_socket(self) -> None:
+        """Test that a stale socket is replaced, but a live one is not."""
+        self.start()
+        self.assertRaises(OSError, serving.make_server, self.socket)
+        self.doCleanups()
+        self.start()
+        self.assertEqual(self.request("-V")["status"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
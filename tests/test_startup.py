@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Time budget (in microseconds) for importing everything that "ppi -V" and
+# "ppi -h" need, as measured by "python -X importtime". Timing depends on
+# the machine and on whether bytecode can be cached, so it's only checked
+# with PPI_TIMING_TESTS=1; test_deferred_imports checks the same thing
+# deterministically.
+IMPORT_BUDGET: int = 20000
+
+# Modules that must not be imported just for printing the help/version.
+DEFERRED: set = {
+    "colorama", "datetime", "subprocess", "concurrent.futures",
+    "ppi.archiving", "ppi.batch", "ppi.client", "ppi.scaffolding",
+    "ppi.locking", "ppi.manpage", "ppi.metrics", "ppi.repository",
+    "ppi.serving", "ppi.store", "ppi.templating", "ppi.tracing",
+    "ppi.writers", "socketserver",
+}
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importtime(*args: str) -> dict:
+    """
+    Runs ppi with args in a fresh interpreter under -X importtime.
+
+    Returns a dict that maps each imported module to its cumulative
+    import time in microseconds.
+    """
+    code: str = (
+        "import sys\n"
+        "from ppi.main import main\n"
+        f"main({len(args) + 1}, ['ppi', *{list(args)!r}])\n"
+    )
+    env: dict = dict(os.environ, PYTHONPATH=ROOT)
+    process: object = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env
+    )
+    modules: dict = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class StartupTestCase(unittest.TestCase):
+    """Tests for keeping the startup of ppi fast."""
+
+    def test_deferred_imports(self) -> None:
+        """Test that -V and -h import only what they need."""
+        for option in ("-V", "-h"):
+            with self.subTest(option=option):
+                modules: dict = importtime(option)
+                self.assertIn("ppi.main", modules)
+                self.assertFalse(DEFERRED & set(modules),
+                                 f"{DEFERRED & set(modules)} imported")
+
+    def test_compiled_catalogs(self) -> None:
+        """Test that -h loads the compiled catalog instead of the JSON one."""
+        importtime("-h")  # Make sure the catalog is compiled.
+        modules: dict = importtime("-h")
+        self.assertIn("ppi.messages", modules)
+        self.assertNotIn("json", modules)
+
+    def test_library_imports(self) -> None:
+        """Test that the library modules don't import the command line."""
+        code: str = (
+            "import sys\n"
+            "from ppi import batch, locking, scaffolding\n"
+            "print('ppi.main' in sys.modules)\n"
+        )
+        process: object = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=ROOT), check=True
+        )
+        self.assertEqual(process.stdout, "False\n")
+
+    @unittest.skipUnless(os.getenv("PPI_TIMING_TESTS"),
+                         "set PPI_TIMING_TESTS=1 to check the timing")
+    def test_import_budget(self) -> None:
+        """Test that importing ppi.main for -V stays within the budget."""
+        importtime("-V")  # Make sure the bytecode is cached.
+        modules: dict = importtime("-V")
+        self.assertLess(modules["ppi.main"], IMPORT_BUDGET,
+                        "importing ppi.main exceeds the startup budget")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import errno
+import os
+import tempfile
+import unittest
+import unittest.mock
+from ppi import scaffolding
+from ppi import store
+
+
+class StoreTestCase(unittest.TestCase):
+    """Tests for deduplicating files through the content-addressed store."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the store and the projects."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.store_dir: str = os.path.join(self.tmp.name, "store")
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def path(self, *parts: str) -> str:
+        """Get a path in the temporary directory."""
+        return os.path.join(self.tmp.name, *parts)
+
+    def read(self, *parts: str) -> bytes:
+        """Read a file in the temporary directory."""
+        with open(self.path(*parts), "rb") as f:
+            return f.read()
+
+    def test_blob(self) -> None:
+        """Test that contents are stored once, read-only, under their hash."""
+        blobs: object = store.Store(self.store_dir)
+        path: str = blobs.blob(b"content")
+        self.assertEqual(store.Store(self.store_dir).blob(b"content"), path)
+        self.assertEqual(os.listdir(os.path.dirname(path)),
+                         [os.path.basename(path)])
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o444)
+        self.assertEqual(os.stat(blobs.blob(b"#!/bin/sh\n")).st_mode & 0o777,
+                         0o555)
+
+    def test_hardlink(self) -> None:
+        """Test that projects share the inodes of identical files."""
+        with unittest.mock.patch.dict(os.environ,
+                                      {"XDG_CACHE_HOME": self.tmp.name}):
+            for name in ("a", "b"):
+                scaffolding.scaffold(name, scaffolding.create_writers(),
+                                     directory=self.tmp.name,
+                                     dedupe="hardlink")
+        a: object = os.stat(self.path("a", ".gitignore"))
+        b: object = os.stat(self.path("b", ".gitignore"))
+        self.assertEqual(a.st_ino, b.st_ino)
+        self.assertEqual(a.st_mode & 0o222, 0)
+        self.assertTrue(os.path.isdir(self.path("ppi", "store")))
+
+        # Files that differ between the projects are stored separately
+        self.assertNotEqual(os.stat(self.path("a", "pyproject.toml")).st_ino,
+                            os.stat(self.path("b", "pyproject.toml")).st_ino)
+
+    def test_copy(self) -> None:
+        """Test that every fallback creates independent, identical files."""
+        for clone, copy_range in ((True, True), (False, True), (False, False)):
+            with self.subTest(clone=clone, copy_range=copy_range):
+                blobs: object = store.Store(self.store_dir)
+                blobs._clone, blobs._copy_range = clone, copy_range
+                target: str = self.path(f"copy-{clone}-{copy_range}")
+                blobs.create(target, b"content" * 1000)
+                self.assertEqual(self.read(target), b"content" * 1000)
+                self.assertNotEqual(os.stat(target).st_ino,
+                                    os.stat(blobs.blob(b"content" * 1000)).st_ino)
+                self.assertEqual(os.stat(target).st_mode & 0o200, 0o200)
+
+    def test_hardlink_fallback(self) -> None:
+        """Test that files are copied if they can't be linked to the store."""
+        blobs: object = store.Store(self.store_dir, "hardlink")
+        error: OSError = OSError(errno.EXDEV, "cross-device link")
+        with unittest.mock.patch("os.link", side_effect=error) as link:
+            blobs.create(self.path("first"), b"first")
+            blobs.create(self.path("second"), b"second")
+        self.assertEqual(link.call_count, 1)
+        self.assertEqual(self.read("second"), b"second")
+
+    def test_invalid_mode(self) -> None:
+        """Test that unknown modes are rejected."""
+        self.assertRaises(ValueError, store.Store, self.store_dir, "symlink")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from ppi import templating
+
+
+class TemplatingTestCase(unittest.TestCase):
+    """Tests for compiling, caching and finding templates."""
+
+    def setUp(self) -> None:
+        """Create directories for templates and the cache."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+        self.user: str = os.path.join(self.tmp.name, "user")
+        self.cache: str = os.path.join(self.tmp.name, "cache")
+        os.mkdir(self.user)
+
+    def tearDown(self) -> None:
+        """Remove the temporary directories."""
+        self.tmp.cleanup()
+
+    def render(self, source: str, context: dict) -> bytes:
+        """Compiles and renders source."""
+        namespace: dict = {}
+        exec(templating.compile_template(source), namespace)
+        return namespace["render"](context, "utf-8")
+
+    def test_variables(self) -> None:
+        """Test that variables and filters are substituted."""
+        self.assertEqual(
+            self.render("{{ name }}-{{ name|upper }}\n", {"name": "ä"}),
+            "ä-Ä\n".encode("utf-8")
+        )
+
+    def test_conditionals(self) -> None:
+        """Test inline and whole-line conditionals."""
+        source: str = (
+            "def f(){% if annotate %} -> None{% endif %}:\n"
+            "{% if not annotate %}\n"
+            "    # plain\n"
+            "{% else %}\n"
+            "    # annotated\n"
+            "{% endif %}\n"
+            "    pass\n"
+        )
+        self.assertEqual(self.render(source, {"annotate": False}),
+                         b"def f():\n    # plain\n    pass\n")
+        self.assertEqual(self.render(source, {"annotate": True}),
+                         b"def f() -> None:\n    # annotated\n    pass\n")
+
+    def test_invalid(self) -> None:
+        """Test that broken templates are rejected."""
+        for source in ("{% if a %}", "{% endif %}", "{{ a b }}",
+                       "{{ a|reverse }}", "{% for a %}"):
+            with self.assertRaises(templating.TemplateError):
+                templating.compile_template(source)
+
+    def test_user_templates_first(self) -> None:
+        """Test that user's templates override the built-in ones."""
+        loader: object = templating.TemplateLoader(
+            [self.user, templating.BUILTIN_DIR], ""
+        )
+        self.assertTrue(loader.find("main.py.tmpl").startswith(
+            templating.BUILTIN_DIR
+        ))
+        with open(os.path.join(self.user, "main.py.tmpl"), "w") as f:
+            f.write("# {{ project }}\n")
+        self.assertEqual(loader.render("main.py.tmpl", {"project": "x"}),
+                         b"# x\n")
+
+    def test_cache(self) -> None:
+        """Test that compiled templates are cached and invalidated."""
+        path: str = os.path.join(self.user, "t.tmpl")
+        with open(path, "w") as f:
+            f.write("one {{ x }}\n")
+
+        templating.TemplateLoader([self.user], self.cache).load("t.tmpl")
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+
+        # A cached template is used without compiling it again
+        compile_: object = templating.compile_template
+        templating.compile_template = None
+        try:
+            loader: object = templating.TemplateLoader([self.user], self.cache)
+            self.assertEqual(loader.render("t.tmpl", {"x": 1}), b"one 1\n")
+        finally:
+            templating.compile_template = compile_
+
+        with open(path, "w") as f:
+            f.write("two {{ x }}!\n")
+        loader = templating.TemplateLoader([self.user], self.cache)
+        self.assertEqual(loader.render("t.tmpl", {"x": 2}), b"two 2!\n")
+
+    def test_cache_other_compiler(self) -> None:
+        """Test that templates cached by another compiler are compiled again."""
+        with open(os.path.join(self.user, "t.tmpl"), "w") as f:
+            f.write("{{ x }}\n")
+        templating.TemplateLoader([self.user], self.cache).load("t.tmpl")
+
+        compiled: list = []
+        compile_: object = templating.compile_template
+
+        def counting(source: str, filename: str) -> object:
+            compiled.append(filename)
+            return compile_(source, filename)
+
+        fingerprint: bytes = templating._fingerprint()
+        templating.compile_template = counting
+        try:
+            templating.TemplateLoader([self.user], self.cache).load("t.tmpl")
+            self.assertEqual(compiled, [])
+            templating._compiler = bytes(20)  # As if ppi was upgraded
+            templating.TemplateLoader([self.user], self.cache).load("t.tmpl")
+            self.assertEqual(len(compiled), 1)
+        finally:
+            templating.compile_template = compile_
+            templating._compiler = fingerprint
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from ppi import main
+from ppi import scaffolding
+from ppi import tracing
+
+
+class TracingTestCase(unittest.TestCase):
+    """Tests for tracing with --trace, -v and --debug."""
+
+    def setUp(self) -> None:
+        """Create a temporary directory to create the projects in."""
+        self.tmp: object = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Turn tracing off and remove the temporary directory."""
+        tracing.stop()
+        self.tmp.cleanup()
+
+    def test_off(self) -> None:
+        """Test that nothing is recorded when tracing is off."""
+        self.assertIs(tracing.span("scaffold", "project"), tracing.NO_SPAN)
+        scaffolding.scaffold("demo", scaffolding.create_writers(),
+                             directory=self.tmp.name)
+        self.assertIsNone(tracing.tracer)
+
+    def test_spans(self) -> None:
+        """Test that every file and directory gets a span, in both builds."""
+        mapping: dict = scaffolding.generate("demo", git=True, lock=True)
+        for width in (1, 4):
+            with self.subTest(width=width):
+                tracer: object = tracing.start()
+                scaffolding.scaffold("demo", scaffolding.create_writers(),
+                                     git=True, width=width,
+                                     directory=os.path.join(self.tmp.name,
+                                                            str(width)))
+                tracing.stop()
+                written: dict = {
+                    event["args"]["path"]: event["args"]["bytes"]
+                    for event in tracer.events if event["name"] == "write"
+                }
+                self.assertEqual(len(written), len([
+                    path for path in mapping if not path.endswith("/")
+                ]))
+                self.assertEqual(written["pyproject.toml"], len(mapping["pyproject.toml"]))
+                names: set = {event["name"] for event in tracer.events}
+                self.assertLessEqual({"render", "mkdir", "git skeleton",
+                                      "publish", "scaffold"}, names)
+                self.assertEqual(tracer.summary()["render"]["count"], 9)
+
+    def test_error(self) -> None:
+        """Test that spans record the errors of their blocks."""
+        tracer: object = tracing.start()
+        with self.assertRaises(OSError):
+            with tracing.span("git init", "git"):
+                raise OSError("no git")
+        self.assertEqual(tracer.events[0]["args"], {"error": "no git"})
+
+    def test_main(self) -> None:
+        """Test that --trace writes a Chrome trace and -v sums it up."""
+        trace: str = os.path.join(self.tmp.name, "trace.json")
+        cwd: str = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            with contextlib.redirect_stderr(io.StringIO()) as stderr, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                argv: list = ["ppi", "demo", "-v", "--trace", trace]
+                with self.assertRaises(SystemExit) as context:
+                    main.main(len(argv), argv)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(context.exception.code, 0)
+        self.assertIsNone(tracing.tracer)
+        with open(trace) as f:
+            events: list = json.load(f)["traceEvents"]
+        self.assertEqual(events[0]["ph"], "M")
+        self.assertEqual(events[1]["name"], "parse")
+        self.assertTrue(all(event["ph"] == "X" for event in events[1:]))
+        self.assertIn("file: ", stderr.getvalue())
+        self.assertIn("in total", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from ppi import scaffolding
+
+
+class WritersTestCase(unittest.TestCase):
+    """Tests for the file writers."""
+
+    def test_write_matches_render(self) -> None:
+        """Test that written files have exactly the rendered contents."""
+        files: dict = scaffolding.create_writers()
+        del files["directory"]
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd: str = os.getcwd()
+            os.chdir(tmp)
+            try:
+                os.mkdir("demo")
+                for writer in files.values():
+                    writer.write("demo/file")
+                    with open("demo/file", "rb") as f:
+                        self.assertEqual(f.read(), writer.render("demo"))
+            finally:
+                os.chdir(cwd)
+
+    @unittest.skipIf(shutil.which("make") is None, "make not found")
+    def test_makefile_targets(self) -> None:
+        """Test that the Makefile remakes only targets that are out of date."""
+        with tempfile.TemporaryDirectory() as tmp:
+            scaffolding.scaffold("demo", scaffolding.create_writers(),
+                                 directory=tmp)
+            root: str = os.path.join(tmp, "demo")
+
+            def up_to_date(target: str) -> bool:
+                return subprocess.run(["make", "-q", target], cwd=root,
+                                      stdout=subprocess.DEVNULL).returncode == 0
+
+            self.assertFalse(up_to_date("man"))
+            self.assertFalse(up_to_date("dist"))
+            source: str = os.path.join(root, "docs", "demo.1.md")
+            later: float = os.stat(source).st_mtime + 10
+            open(os.path.join(root, "docs", "demo.1"), "w").close()
+            os.mkdir(os.path.join(root, "dist"))
+            for path in ("docs/demo.1", "dist"):
+                os.utime(os.path.join(root, path), (later, later))
+            self.assertTrue(up_to_date("man"))
+            self.assertTrue(up_to_date("dist"))
+            os.utime(source, (later + 10, later + 10))
+            self.assertFalse(up_to_date("man"))
+            self.assertFalse(up_to_date("dist"))
+
+
+if __name__ == "__main__":
+    unittest.main()